@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark breached-password lookups: set vs. Bloom filter vs. exact index.
+
+Builds a blocklist index and a Bloom filter for a synthetic list and
+prints the mean lookup latency of passwords that are not in the list (the
+common case on a signup endpoint) and of passwords that are.
+
+Usage:
+    python benchmarks/bench_bloom.py [--size N] [--fp-rate P]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from passgen.blocklist import Blocklist, build_blocklist
+from passgen.bloom import BloomFilter, FilteredBlocklist, build_bloom_filter
+
+
+def latency(container, probes) -> float:
+    """Return the mean membership-test latency in nanoseconds."""
+    timer = timeit.Timer("for p in probes: p in c", globals={"probes": probes, "c": container})
+    return min(timer.repeat(repeat=5, number=1)) / len(probes) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000000, help="passwords in the list")
+    parser.add_argument("--fp-rate", type=float, default=0.01, help="Bloom false-positive rate")
+    parser.add_argument("--probes", type=int, default=100000, help="lookups per measurement")
+    args = parser.parse_args()
+    
+    words = ["leaked-password-%d" % i for i in range(args.size)]
+    misses = ["fresh-password-%d" % i for i in range(args.probes)]
+    hits = words[:args.probes]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = os.path.join(tmp, "list.idx")
+        bloom_path = os.path.join(tmp, "list.bloom")
+        build_blocklist(words, index_path)
+        with Blocklist(index_path) as blocklist:
+            bits = build_bloom_filter(blocklist, bloom_path, fp_rate=args.fp_rate)
+        
+        print(f"{args.size:,} passwords, Bloom filter {bits // 8:,} bytes at fp rate {args.fp_rate}")
+        print(f"{'structure':>20}  {'miss ns':>10}  {'hit ns':>10}")
+        
+        lowered = set(words)
+        print(f"{'python set':>20}  {latency(lowered, misses):>10.0f}  {latency(lowered, hits):>10.0f}")
+        with Blocklist(index_path) as blocklist, BloomFilter(bloom_path) as bloom:
+            filtered = FilteredBlocklist(bloom, blocklist)
+            for name, container in [
+                ("bloom filter", bloom),
+                ("exact index", blocklist),
+                ("bloom + index", filtered),
+            ]:
+                print(f"{name:>20}  {latency(container, misses):>10.0f}  {latency(container, hits):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for calculate_entropy() per-call latency.
+
+Measures the cost of a single call from a shallow call stack and from deep
+call stacks, to show that the latency does not depend on the caller's stack.
+
+Usage:
+    python benchmarks/bench_entropy.py [--calls N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from passgen import calculate_entropy
+
+PASSWORDS = ["password", "Password123", "aB3$xY7*cD9!eF", "Correct-Horse-Battery-Staple-99!"]
+
+
+def _at_depth(depth, func):
+    """Call func with depth extra frames on the stack."""
+    if depth == 0:
+        return func()
+    return _at_depth(depth - 1, func)
+
+
+def measure(depth: int, calls: int) -> float:
+    """
+    Return the mean latency of calculate_entropy() in nanoseconds.
+    
+    Args:
+        depth (int): The number of extra frames on the stack.
+        calls (int): The number of calls per password.
+    
+    Returns:
+        float: Mean per-call latency in nanoseconds.
+    """
+    def run():
+        timer = timeit.Timer(
+            "for p in passwords: calculate_entropy(p)",
+            globals={"passwords": PASSWORDS, "calculate_entropy": calculate_entropy},
+        )
+        return min(timer.repeat(repeat=5, number=calls))
+    
+    best = _at_depth(depth, run)
+    return best / (calls * len(PASSWORDS)) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000, help="calls per password")
+    args = parser.parse_args()
+    
+    print(f"{'stack depth':>12}  {'ns/call':>10}")
+    for depth in (0, 50, 200, 500):
+        print(f"{depth:>12}  {measure(depth, args.calls):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark Markov model loading and password sampling.
+
+Trains a model from a word list (by default the words built into the
+pattern estimator), then times opening the model file and sampling
+passwords with their exact entropy.
+
+Usage:
+    python benchmarks/bench_markov.py [--wordlist FILE] [--order 3] [--passwords N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from passgen.estimator import RANKED_WORDS
+from passgen.markov import MarkovModel, train_markov
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--wordlist", help="newline-delimited word list to train on")
+    parser.add_argument("--order", type=int, default=3, help="n-gram order (2-4)")
+    parser.add_argument("--passwords", type=int, default=200000, help="passwords to sample")
+    parser.add_argument("--length", type=int, default=12, help="password length")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model.bin")
+        start = time.perf_counter()
+        letters = train_markov(args.wordlist or RANKED_WORDS, path, order=args.order)
+        print(f"trained on {letters:,} letters in {time.perf_counter() - start:.2f} s "
+              f"({os.path.getsize(path):,} bytes)")
+        
+        start = time.perf_counter()
+        model = MarkovModel(path)
+        print(f"opened model in {(time.perf_counter() - start) * 1e3:.2f} ms")
+        
+        start = time.perf_counter()
+        total = 0.0
+        for _ in range(args.passwords):
+            total += model.sample(args.length)[1]
+        elapsed = time.perf_counter() - start
+        print(f"{args.passwords / elapsed:,.0f} passwords/s, "
+              f"mean entropy {total / args.passwords:.1f} bits")
+        model.close()
+
+
+if __name__ == "__main__":
+    main()
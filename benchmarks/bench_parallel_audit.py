@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark the scaling of parallel password list auditing.
+
+Writes a temporary password list, audits it with an increasing number of
+worker processes and prints throughput and speedup relative to one worker.
+
+Usage:
+    python benchmarks/bench_parallel_audit.py [--lines N] [--max-workers N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from passgen import generate_many
+from passgen.audit import audit_file
+
+
+def write_list(path: str, lines: int) -> None:
+    """Write a password list with a mix of lengths and character sets."""
+    with open(path, "w", encoding="utf-8") as out:
+        remaining = lines
+        while remaining > 0:
+            batch = min(remaining, 100000)
+            out.write("\n".join(generate_many(batch // 2, length=10)) + "\n")
+            out.write("\n".join(generate_many(batch - batch // 2, length=16, symbols=False)) + "\n")
+            remaining -= batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=2000000, help="passwords in the list")
+    parser.add_argument(
+        "--max-workers", type=int, default=os.cpu_count() or 1, help="largest pool to try"
+    )
+    args = parser.parse_args()
+    
+    counts = [1]
+    while counts[-1] * 2 <= args.max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != args.max_workers:
+        counts.append(args.max_workers)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "passwords.txt")
+        write_list(path, args.lines)
+        
+        print(f"{'workers':>8}  {'seconds':>8}  {'lines/s':>12}  {'speedup':>8}")
+        base = None
+        for workers in counts:
+            start = time.perf_counter()
+            audit_file(path, workers=workers)
+            elapsed = time.perf_counter() - start
+            base = base or elapsed
+            print(f"{workers:>8}  {elapsed:>8.2f}  {args.lines / elapsed:>12,.0f}  {base / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
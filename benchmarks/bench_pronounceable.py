@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark generate_pronounceable() against the previous implementation.
+
+The previous implementation (kept below for comparison) built passwords by
+string concatenation, one rng.choice() per letter, and converted the whole
+password to a list and back for every digit, symbol and capitalization.
+
+Usage:
+    python benchmarks/bench_pronounceable.py [--calls N] [--length L]
+"""
+
+import argparse
+import os
+import string
+import sys
+import time
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from passgen.pronounceable import (
+    COMMON_SYLLABLES,
+    CONSONANTS,
+    SYLLABLE_PATTERNS,
+    VOWELS,
+    generate_pronounceable,
+)
+from passgen.random_source import default_source
+
+
+def legacy_pronounceable(length, include_digits, include_symbols, capitalize, rng):
+    """The previous generate_pronounceable(), minus argument validation."""
+    def syllable():
+        if rng.random() < 0.7:
+            return rng.choice(COMMON_SYLLABLES)
+        result = ""
+        for char_type in rng.choice(SYLLABLE_PATTERNS):
+            result += rng.choice(CONSONANTS if char_type == "C" else VOWELS)
+        return result
+    
+    def replace(password, chars):
+        pos = rng.randint(0, len(password) - 1)
+        as_list = list(password)
+        as_list[pos] = rng.choice(chars)
+        return ''.join(as_list)
+    
+    password = ""
+    while len(password) < length:
+        password += syllable()
+    password = password[:length]
+    if include_digits:
+        for _ in range(min(max(1, length // 8), 3)):
+            password = replace(password, string.digits)
+    if include_symbols:
+        for _ in range(min(max(1, length // 12), 2)):
+            password = replace(password, "!@#$%^&*()-_=+[]{}|;:,.<>/?")
+    if capitalize:
+        chars = list(password)
+        letters = [i for i, c in enumerate(chars) if c.isalpha()]
+        if letters:
+            for pos in rng.sample(letters, max(1, int(len(letters) * 0.3))):
+                chars[pos] = chars[pos].upper()
+            password = ''.join(chars)
+    return password
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1000000, help="calls per measurement")
+    parser.add_argument("--length", type=int, default=12, help="password length")
+    args = parser.parse_args()
+    
+    rng = default_source()
+    print(f"{'options':>22}  {'legacy/s':>10}  {'current/s':>10}  {'speedup':>8}")
+    for options in [(False, False, False), (True, True, True)]:
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            legacy_pronounceable(args.length, *options, rng)
+        legacy = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            generate_pronounceable(args.length, *options, rng=rng)
+        current = time.perf_counter() - start
+        
+        label = "plain" if not any(options) else "digits+symbols+caps"
+        print(f"{label:>22}  {args.calls / legacy:>10,.0f}  {args.calls / current:>10,.0f}  {legacy / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent password generation at 1, 8 and 64 threads.
+
+Every thread calls the module-level passgen.generate(), which uses the
+thread's own default Generator. Throughput is limited by the GIL, so the
+interesting number is how little it drops as threads are added: there is
+no shared buffer or lock to contend on.
+
+Usage:
+    python benchmarks/bench_threads.py [--passwords N] [--threads 1 8 64]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from passgen import generate
+
+
+def run(threads: int, passwords: int) -> float:
+    """
+    Generate passwords across threads and return the elapsed seconds.
+    
+    Args:
+        threads (int): The number of threads.
+        passwords (int): The total number of passwords.
+    
+    Returns:
+        float: Wall-clock seconds from the first thread start to the last join.
+    """
+    per_thread = passwords // threads
+    barrier = threading.Barrier(threads + 1)
+    
+    def worker():
+        barrier.wait()
+        for _ in range(per_thread):
+            generate(length=16)
+    
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--passwords", type=int, default=640000, help="total passwords per run")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 64], help="thread counts")
+    args = parser.parse_args()
+    
+    print(f"{'threads':>8}  {'seconds':>8}  {'passwords/s':>12}")
+    for threads in args.threads:
+        elapsed = run(threads, args.passwords)
+        total = args.passwords // threads * threads
+        print(f"{threads:>8}  {elapsed:>8.2f}  {total / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark token generation at 64, 1K and 64K characters.
+
+Each encoding is compared with the per-character approach of joining
+secrets.choice() calls, which is what callers had to write before tokens
+could exceed the 64-character password limit.
+
+Usage:
+    python benchmarks/bench_tokens.py [--repeat N] [--lengths 64 1024 65536]
+"""
+
+import argparse
+import os
+import secrets
+import sys
+import time
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from passgen import generate_token
+from passgen.token import ENCODINGS
+
+
+def best_of(func, repeat: int) -> float:
+    """
+    Return the fastest of several timed calls, in seconds.
+    
+    Args:
+        func: A callable taking no arguments.
+        repeat (int): The number of timed calls.
+    
+    Returns:
+        float: The minimum wall-clock time of a single call.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="timed calls per measurement")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[64, 1024, 65536], help="token lengths")
+    args = parser.parse_args()
+    
+    print(f"{'encoding':>10}  {'length':>7}  {'token us':>10}  {'join us':>10}  {'speedup':>8}")
+    for encoding, alphabet in sorted(ENCODINGS.items()):
+        for length in args.lengths:
+            fast = best_of(lambda: generate_token(length, encoding=encoding), args.repeat)
+            slow = best_of(lambda: "".join(secrets.choice(alphabet) for _ in range(length)), args.repeat)
+            print(f"{encoding:>10}  {length:>7}  {fast * 1e6:>10.1f}  {slow * 1e6:>10.1f}  {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the generator, pronounceable and strength paths.
+
+Runs every benchmark case with timeit (best of several repeats), writes the
+results as JSON and compares them with a stored baseline. The command
+exits with status 1 if any case is slower than the baseline by more than
+the threshold, so it can gate upgrades. Only the standard library is used.
+
+Usage:
+    python benchmarks/suite.py                     # run, compare with baseline.json
+    python benchmarks/suite.py --output out.json   # also write the results
+    python benchmarks/suite.py --save-baseline     # replace the baseline
+    python benchmarks/suite.py --threshold 0.10 --filter generate
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+import timeit
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import passgen
+from passgen import (
+    calculate_entropy,
+    check_strength,
+    check_strength_many,
+    generate,
+    generate_many,
+    generate_pronounceable,
+    get_policy,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 5
+
+# A realistic mix: common and breached-style passwords, words with
+# substitutions, keyboard walks, dates, random passwords and passphrases
+PASSWORD_MIX = [
+    "password", "123456", "qwerty", "letmein", "iloveyou", "admin",
+    "Password1", "Summer2023!", "P@ssw0rd", "monkey123", "dragon",
+    "qwertyuiop", "1qaz2wsx", "asdfghjkl;", "zxcvbnm,./",
+    "john1985", "03/14/1990", "mary.smith1979", "Liverpool09",
+    "Tr0ub4dor&3", "correcthorsebatterystaple", "Correct-Horse-Battery-Staple-99!",
+    "aB3$xY7*cD9!eF", "k8#Qv!2mZ@p5", "G7^tL0p(Wq3&xN9s", "x" * 40,
+    "pässwörd", "密码123456", "abcabcabcabc", "aaaaaaaa",
+]
+
+
+class Case(NamedTuple):
+    """A benchmark case: a callable doing `items` operations per call."""
+    name: str
+    func: Callable[[], object]
+    items: int = 1
+
+
+def _cases() -> List[Case]:
+    """Return every benchmark case of the suite."""
+    cases = []
+    for length in (8, 16, 64):
+        cases.append(Case("generate/len%d" % length, lambda n=length: generate(length=n)))
+    cases += [
+        Case("generate/no-symbols", lambda: generate(length=16, symbols=False)),
+        Case("generate/digits-only", lambda: generate(length=16, uppercase=False,
+                                                      lowercase=False, symbols=False)),
+        Case("generate/exclude-ambiguous", lambda: generate(length=16, exclude_ambiguous=True)),
+    ]
+    constrained = get_policy(min_uppercase=2, min_lowercase=2, min_digits=2,
+                             min_symbols=2, max_repeats=2)
+    cases += [
+        Case("generate/constrained", lambda: generate(length=16, policy=constrained)),
+        Case("generate/detailed", lambda: generate(length=16, detailed=True)),
+        Case("generate_many/1000x16", lambda: generate_many(1000, length=16), 1000),
+    ]
+    for length in (12, 32):
+        cases.append(Case("pronounceable/len%d" % length,
+                          lambda n=length: generate_pronounceable(length=n)))
+        cases.append(Case("pronounceable/len%d-all-modifiers" % length,
+                          lambda n=length: generate_pronounceable(
+                              length=n, include_digits=True, include_symbols=True,
+                              capitalize=True)))
+    
+    mix = PASSWORD_MIX
+    size = len(mix)
+    batch = mix * (10000 // size)
+    cases += [
+        Case("entropy/charset", lambda: [calculate_entropy(p) for p in mix], size),
+        Case("entropy/pattern", lambda: [calculate_entropy(p, engine="pattern") for p in mix], size),
+        Case("strength/charset", lambda: [check_strength(p) for p in mix], size),
+        Case("strength/pattern", lambda: [check_strength(p, engine="pattern") for p in mix], size),
+        Case("strength_many/python", lambda: check_strength_many(batch, use_numpy=False), len(batch)),
+    ]
+    return cases
+
+
+def measure(case: Case, repeat: int, min_time: float) -> float:
+    """
+    Return the best time per operation of a case, in nanoseconds.
+    
+    Args:
+        case (Case): The case to run.
+        repeat (int): The number of timed repeats; the fastest is kept.
+        min_time (float): The minimum duration of one repeat, in seconds.
+    
+    Returns:
+        float: Nanoseconds per operation.
+    """
+    timer = timeit.Timer(case.func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    best = min([elapsed] + timer.repeat(repeat=repeat - 1, number=number))
+    return best / (number * case.items) * 1e9
+
+
+def run(pattern: Optional[str], repeat: int, min_time: float) -> Dict[str, float]:
+    """
+    Run the suite and return nanoseconds per operation by case name.
+    
+    Args:
+        pattern (str, optional): Only run cases whose name matches this
+            regular expression.
+        repeat (int): Timed repeats per case.
+        min_time (float): Minimum duration of one repeat, in seconds.
+    
+    Returns:
+        Dict[str, float]: The results.
+    """
+    results = {}
+    for case in _cases():
+        if pattern and not re.search(pattern, case.name):
+            continue
+        results[case.name] = measure(case, repeat, min_time)
+        print(f"{case.name:<36} {results[case.name]:>12,.0f} ns/op", file=sys.stderr)
+    return results
+
+
+def compare(
+    results: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float
+) -> List[str]:
+    """
+    Compare results with a baseline and print a report.
+    
+    Args:
+        results (Dict[str, float]): Nanoseconds per operation by case name.
+        baseline (Dict[str, float]): The baseline results.
+        threshold (float): The allowed slowdown, as a fraction (0.25 allows
+            a case to take up to 25% longer than its baseline).
+    
+    Returns:
+        List[str]: The names of the cases that regressed.
+    """
+    regressions = []
+    print(f"{'case':<36} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<36} {'-':>12} {current:>12,.0f} {'new':>8}")
+            continue
+        change = current / previous - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<36} {previous:>12,.0f} {current:>12,.0f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def _document(results: Dict[str, float]) -> dict:
+    """Wrap results with the environment they were measured in."""
+    return {
+        "passgen": passgen.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "unit": "ns/op",
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", metavar="FILE", help="write the results as JSON to FILE")
+    parser.add_argument("--baseline", metavar="FILE", default=DEFAULT_BASELINE,
+                        help="baseline JSON to compare with (default: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results to the baseline file instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (default: %(default)s)")
+    parser.add_argument("--filter", metavar="REGEX", help="only run matching cases")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="timed repeats per case (default: %(default)s)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="minimum seconds per repeat (default: %(default)s)")
+    args = parser.parse_args(argv)
+    
+    results = run(args.filter, args.repeat, args.min_time)
+    document = _document(results)
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(document, out, indent=2, sort_keys=True)
+            out.write("\n")
+    
+    if args.save_baseline:
+        with open(args.baseline, "w") as out:
+            json.dump(document, out, indent=2, sort_keys=True)
+            out.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    with open(args.baseline) as stream:
+        baseline = json.load(stream)
+    if baseline.get("python") != document["python"]:
+        print(f"Note: baseline measured on Python {baseline.get('python')}, "
+              f"now running {document['python']}")
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,60 @@
 passgen - Secure & Configurable Password Generator
 
 A pure Python library for generating secure, customizable passwords.
+
+Submodules are imported the first time one of their names is used, so
+"import passgen" itself is nearly free and passgen.generate() only loads
+what generation needs.
 """
 
-from .generator import generate
-from .pronounceable import generate_pronounceable
-from .strength import calculate_entropy, check_strength
+__version__ = "0.1.0"
+
+# The public names and the submodule that defines each of them
+_EXPORTS = {
+    "StrengthCache": "cache",
+    "Generator": "generator",
+    "default_generator": "generator",
+    "generate": "generator",
+    "generate_many": "generator",
+    "StrengthMeter": "meter",
+    "generate_passphrase": "passphrase",
+    "PasswordPolicy": "policy",
+    "get_policy": "policy",
+    "generate_pronounceable": "pronounceable",
+    "RandomSource": "random_source",
+    "SeededRandomSource": "random_source",
+    "SystemRandomSource": "random_source",
+    "GeneratedPassword": "result",
+    "calculate_entropy": "strength",
+    "calculate_entropy_many": "strength",
+    "check_strength": "strength",
+    "check_strength_many": "strength",
+    "generate_token": "token",
+}
+
+_SUBMODULES = frozenset({
+    "aio", "audit", "blocklist", "bloom", "cache", "cli", "estimator",
+    "generator", "markov", "meter", "metrics", "passphrase", "policy",
+    "pronounceable", "random_source", "result", "strength", "token",
+    "wordlist",
+})
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Import a public name's submodule on first use (PEP 562)."""
+    if name in _EXPORTS:
+        from importlib import import_module
+        value = getattr(import_module("." + _EXPORTS[name], __name__), name)
+        # Later lookups find the name directly, without calling __getattr__
+        globals()[name] = value
+        return value
+    if name in _SUBMODULES:
+        from importlib import import_module
+        return import_module("." + name, __name__)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
 
-__version__ = "0.1.0" 
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
@@ -0,0 +1,9 @@
+"""
+Allow running the passgen command line with ``python -m passgen``.
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
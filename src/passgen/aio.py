@@ -0,0 +1,217 @@
+"""
+Asyncio-friendly bulk generation and auditing.
+
+The coroutines here split large jobs into chunks that run in an executor,
+so the event loop is never blocked by generating or scoring a chunk. While
+results are handed to the caller, control is given back to the event loop
+at least once per time slice, and the next chunk is already being computed
+in the executor.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import (
+    Any, AsyncIterable, AsyncIterator, BinaryIO, Callable, Iterable, List,
+    Optional, Tuple, Union,
+)
+
+from .audit import AuditRecord, iter_blocks, split_lines
+from .generator import generate_many
+from .result import GeneratedPassword
+from .strength import _batch
+
+# Items per executor job
+DEFAULT_CHUNK_SIZE = 10000
+
+# Longest time (in seconds) spent handing out results before yielding to
+# the event loop
+DEFAULT_TIME_SLICE = 0.005
+
+
+def _score_lines(lines: List[str]) -> Tuple[List[float], List[str]]:
+    """Score a chunk of passwords; runs in the executor."""
+    return _batch(lines, None, labels=True)
+
+
+def _locked(lock: threading.Lock, func: Callable[[Any], Any], job: Any) -> Any:
+    """Run func on a job while holding lock; runs in the executor."""
+    with lock:
+        return func(job)
+
+
+async def _chunked(
+    source: Union[Iterable[str], AsyncIterable[str]], size: int
+) -> AsyncIterator[List[str]]:
+    """Group a sync or async iterable of passwords into lists."""
+    chunk = []
+    if hasattr(source, "__aiter__"):
+        async for item in source:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for item in source:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+                # Iterating a sync source may itself be slow; let others run
+                await asyncio.sleep(0)
+    if chunk:
+        yield chunk
+
+
+async def _stream_blocks(stream: BinaryIO) -> AsyncIterator[List[str]]:
+    """Read a binary stream in blocks of lines, off the event loop."""
+    loop = asyncio.get_running_loop()
+    blocks = iter_blocks(stream)
+    while True:
+        block = await loop.run_in_executor(None, next, blocks, None)
+        if block is None:
+            return
+        yield split_lines(block)
+
+
+async def _pipeline(
+    func: Callable[[Any], Any],
+    jobs: AsyncIterator[Any],
+    executor: Optional[Executor]
+) -> AsyncIterator[Any]:
+    """
+    Run func on each job in the executor, one job ahead of the consumer.
+    
+    Up to two jobs run at the same time, so func must be safe to call
+    concurrently.
+    
+    Yields:
+        The result of each job, in order.
+    """
+    loop = asyncio.get_running_loop()
+    pending = None
+    try:
+        async for job in jobs:
+            future = loop.run_in_executor(executor, func, job)
+            if pending is not None:
+                yield await pending
+            pending = future
+        if pending is not None:
+            result = await pending
+            pending = None
+            yield result
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def agenerate_many(
+    count: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    executor: Optional[Executor] = None,
+    time_slice: float = DEFAULT_TIME_SLICE,
+    **options
+) -> AsyncIterator[Union[str, GeneratedPassword]]:
+    """
+    Generate many passwords without blocking the event loop.
+    
+    Passwords are generated with generate_many() in chunks of chunk_size in
+    the executor and yielded one by one.
+    
+    Args:
+        count (int): The number of passwords to generate.
+        chunk_size (int, optional): Passwords generated per executor job.
+            Defaults to DEFAULT_CHUNK_SIZE.
+        executor (Executor, optional): Where to run the jobs. Defaults to
+            None (the event loop's default executor).
+        time_slice (float, optional): The longest time in seconds to hand out
+            passwords before yielding to the event loop.
+            Defaults to DEFAULT_TIME_SLICE.
+        **options: Any generate_many() options, such as length, symbols or
+            detailed. An explicit rng is only accepted with a thread
+            executor (or the default one); its jobs then run one at a time,
+            since a source is not thread-safe.
+    
+    Yields:
+        str or GeneratedPassword: The generated passwords.
+    
+    Raises:
+        ValueError: If count is negative, chunk_size is less than 1, the
+            generate_many() options are invalid, or rng is given with an
+            executor that is not a ThreadPoolExecutor.
+    """
+    if count < 0:
+        raise ValueError("Password count cannot be negative")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    rng = options.get("rng")
+    if rng is not None and executor is not None and not isinstance(executor, ThreadPoolExecutor):
+        # Every job would get its own copy of the source, and copies of a
+        # seeded source repeat each other's output
+        raise ValueError("An explicit rng requires a thread executor")
+    # Surface invalid options before any work is scheduled
+    generate_many(0, **options)
+    
+    async def jobs():
+        for start in range(0, count, chunk_size):
+            yield min(chunk_size, count - start)
+    
+    loop = asyncio.get_running_loop()
+    func = functools.partial(generate_many, **options)
+    if rng is not None:
+        func = functools.partial(_locked, threading.Lock(), func)
+    deadline = loop.time() + time_slice
+    async for passwords in _pipeline(func, jobs(), executor):
+        for password in passwords:
+            yield password
+            if loop.time() >= deadline:
+                await asyncio.sleep(0)
+                deadline = loop.time() + time_slice
+
+
+async def aaudit_stream(
+    source: Union[BinaryIO, Iterable[str], AsyncIterable[str]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    executor: Optional[Executor] = None,
+    time_slice: float = DEFAULT_TIME_SLICE
+) -> AsyncIterator[AuditRecord]:
+    """
+    Audit passwords without blocking the event loop.
+    
+    Args:
+        source (BinaryIO, Iterable[str] or AsyncIterable[str]): A binary
+            newline-delimited password stream (read in the default executor),
+            or the passwords themselves.
+        chunk_size (int, optional): Passwords scored per executor job when
+            source is an iterable. Defaults to DEFAULT_CHUNK_SIZE.
+        executor (Executor, optional): Where to score the chunks, such as a
+            ProcessPoolExecutor. Defaults to None (the event loop's default
+            executor).
+        time_slice (float, optional): The longest time in seconds to hand out
+            records before yielding to the event loop.
+            Defaults to DEFAULT_TIME_SLICE.
+    
+    Yields:
+        AuditRecord: The line number, strength and entropy of each password.
+    
+    Raises:
+        ValueError: If chunk_size is less than 1.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    if hasattr(source, "read"):
+        chunks = _stream_blocks(source)
+    else:
+        chunks = _chunked(source, chunk_size)
+    
+    loop = asyncio.get_running_loop()
+    line = 0
+    deadline = loop.time() + time_slice
+    async for entropies, strengths in _pipeline(_score_lines, chunks, executor):
+        for strength, entropy in zip(strengths, entropies):
+            line += 1
+            yield AuditRecord(line, strength, entropy)
+            if loop.time() >= deadline:
+                await asyncio.sleep(0)
+                deadline = loop.time() + time_slice
@@ -0,0 +1,368 @@
+"""
+Streaming password list auditing.
+
+Reads a newline-delimited password list in bounded-size blocks and scores
+every line with the batch strength functions, without ever holding the
+whole file in memory. Blocks can be scored in a pool of worker processes
+to use more than one CPU core.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+from .strength import _LABELS, _batch
+
+# Bytes of input read per chunk
+DEFAULT_CHUNK_BYTES = 1 << 20
+
+# Longest line kept, in bytes; the rest of a longer line is skipped
+MAX_LINE_BYTES = 1 << 16
+
+# Width (in bits) and number of the entropy histogram buckets; the last
+# bucket is open-ended
+ENTROPY_BUCKET_WIDTH = 10
+ENTROPY_BUCKETS = 16
+
+
+class AuditRecord(NamedTuple):
+    """
+    The result of auditing a single line.
+    
+    Attributes:
+        line (int): The 1-based line number in the input.
+        strength (str): "Weak", "Medium", or "Strong".
+        entropy (float): The entropy of the password in bits.
+    """
+    
+    line: int
+    strength: str
+    entropy: float
+
+
+class AuditSummary:
+    """
+    Aggregate statistics for an audited password list.
+    
+    Attributes:
+        total (int): The number of passwords audited.
+        counts (Dict[str, int]): The number of passwords per strength label.
+        histogram (List[int]): Password counts per entropy bucket. Bucket i
+            covers [i * ENTROPY_BUCKET_WIDTH, (i + 1) * ENTROPY_BUCKET_WIDTH)
+            bits; the last bucket also holds everything above it.
+        entropy_sum (float): The sum of all entropies.
+        entropy_min (float): The smallest entropy seen.
+        entropy_max (float): The largest entropy seen.
+    """
+    
+    def __init__(self):
+        self.total = 0
+        self.counts = {label: 0 for label in _LABELS}
+        self.histogram = [0] * ENTROPY_BUCKETS
+        self.entropy_sum = 0.0
+        self.entropy_min = float("inf")
+        self.entropy_max = 0.0
+    
+    @property
+    def entropy_mean(self) -> float:
+        """float: The mean entropy, or 0.0 if nothing was audited."""
+        return self.entropy_sum / self.total if self.total else 0.0
+    
+    def add(self, strengths: List[str], entropies: List[float]) -> None:
+        """
+        Add a batch of results to the summary.
+        
+        Args:
+            strengths (List[str]): The strength label of each password.
+            entropies (List[float]): The entropy of each password.
+        """
+        if not entropies:
+            return
+        counts = self.counts
+        for label in strengths:
+            counts[label] += 1
+        histogram = self.histogram
+        last = ENTROPY_BUCKETS - 1
+        for entropy in entropies:
+            bucket = int(entropy // ENTROPY_BUCKET_WIDTH)
+            histogram[bucket if bucket < last else last] += 1
+        self.total += len(entropies)
+        self.entropy_sum += sum(entropies)
+        self.entropy_min = min(self.entropy_min, min(entropies))
+        self.entropy_max = max(self.entropy_max, max(entropies))
+    
+    def merge(self, other: "AuditSummary") -> None:
+        """
+        Add the statistics of another summary to this one.
+        
+        Args:
+            other (AuditSummary): The summary to merge in.
+        """
+        if not other.total:
+            return
+        for label, count in other.counts.items():
+            self.counts[label] += count
+        for i, count in enumerate(other.histogram):
+            self.histogram[i] += count
+        self.total += other.total
+        self.entropy_sum += other.entropy_sum
+        self.entropy_min = min(self.entropy_min, other.entropy_min)
+        self.entropy_max = max(self.entropy_max, other.entropy_max)
+    
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Return the summary as a JSON-serializable dict.
+        
+        Returns:
+            Dict[str, object]: The summary statistics.
+        """
+        return {
+            "total": self.total,
+            "counts": dict(self.counts),
+            "entropy": {
+                "min": self.entropy_min if self.total else 0.0,
+                "max": self.entropy_max,
+                "mean": self.entropy_mean,
+            },
+            "histogram": {
+                "bucket_width": ENTROPY_BUCKET_WIDTH,
+                "counts": list(self.histogram),
+            },
+        }
+
+
+def iter_blocks(
+    stream: BinaryIO,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    max_line_bytes: int = MAX_LINE_BYTES
+) -> Iterator[bytes]:
+    """
+    Read a binary stream as blocks of whole lines.
+    
+    Each block is roughly chunk_bytes bytes, extended to the end of the
+    line it stops in. Every line longer than max_line_bytes is cut to its
+    first max_line_bytes bytes and the rest is skipped (the line still
+    counts as one line), wherever it falls in the block. A block therefore
+    never exceeds chunk_bytes plus max_line_bytes, whatever the input.
+    
+    Args:
+        stream (BinaryIO): The stream to read, opened in binary mode.
+        chunk_bytes (int, optional): The approximate number of bytes per
+            block. Defaults to DEFAULT_CHUNK_BYTES.
+        max_line_bytes (int, optional): The longest line kept, in bytes.
+            Defaults to MAX_LINE_BYTES.
+    
+    Yields:
+        bytes: The next block of complete lines.
+    """
+    while True:
+        block = stream.read(chunk_bytes)
+        if not block:
+            return
+        if not block.endswith(b"\n"):
+            # Complete the last line, up to max_line_bytes in all
+            start = block.rfind(b"\n") + 1
+            remaining = max_line_bytes - (len(block) - start)
+            if remaining > 0:
+                block += stream.readline(remaining)
+            else:
+                block = block[:start + max_line_bytes]
+            if not block.endswith(b"\n"):
+                # Too long (or the end of the stream): skip the rest of it
+                while True:
+                    rest = stream.readline(max_line_bytes)
+                    if not rest or rest.endswith(b"\n"):
+                        break
+        if len(block) > max_line_bytes:
+            # Long lines can also sit wholly inside the block
+            lines = block.split(b"\n")
+            if max(map(len, lines)) > max_line_bytes:
+                block = b"\n".join([line[:max_line_bytes] for line in lines])
+        yield block
+
+
+def split_lines(block: bytes) -> List[str]:
+    """
+    Decode a block of lines and split it into passwords.
+    
+    Lines are decoded as UTF-8 (invalid bytes are replaced) and stripped of
+    their "\\n" or "\\r\\n" terminator.
+    
+    Args:
+        block (bytes): A block produced by iter_blocks().
+    
+    Returns:
+        List[str]: The lines in the block.
+    """
+    text = block.decode("utf-8", "replace")
+    lines = text.split("\n")
+    if text.endswith("\n"):
+        lines.pop()
+    if "\r" in text:
+        lines = [line[:-1] if line.endswith("\r") else line for line in lines]
+    return lines
+
+
+def _score_block(block: bytes) -> Tuple[List[float], List[str]]:
+    """Score every line in a block; runs in worker processes."""
+    return _batch(split_lines(block), None, labels=True)
+
+
+def _summarize_block(block: bytes) -> "AuditSummary":
+    """Summarize every line in a block; runs in worker processes."""
+    entropies, strengths = _score_block(block)
+    summary = AuditSummary()
+    summary.add(strengths, entropies)
+    return summary
+
+
+def _parallel_map(func, blocks: Iterable[bytes], workers: int, ordered: bool):
+    """
+    Apply func to blocks in a process pool with a bounded number in flight.
+    
+    Yields:
+        Tuple[int, object]: The index of each block and func's result, in
+        input order if ordered is True, otherwise as soon as each finishes.
+    """
+    max_pending = workers * 2
+    blocks = iter(blocks)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        index = 0
+        for block in blocks:
+            pending.append((index, pool.submit(func, block)))
+            index += 1
+            if len(pending) < max_pending:
+                continue
+            if ordered:
+                done_index, future = pending.popleft()
+                yield done_index, future.result()
+            else:
+                wait([f for _, f in pending], return_when=FIRST_COMPLETED)
+                for item in [item for item in pending if item[1].done()]:
+                    pending.remove(item)
+                    yield item[0], item[1].result()
+        while pending:
+            done_index, future = pending.popleft()
+            yield done_index, future.result()
+
+
+def iter_audit(
+    stream: BinaryIO,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    workers: int = 1,
+    ordered: bool = True
+) -> Iterator[AuditRecord]:
+    """
+    Audit every line of a binary stream, yielding one record per line.
+    
+    With workers > 1, blocks of lines are scored in a process pool. Records
+    are yielded in input order unless ordered is False, in which case each
+    block's records are yielded as soon as that block finishes; the line
+    numbers identify them either way.
+    
+    Args:
+        stream (BinaryIO): The password list, opened in binary mode.
+        chunk_bytes (int, optional): The approximate number of bytes read
+            per block. Defaults to DEFAULT_CHUNK_BYTES.
+        workers (int, optional): The number of worker processes.
+            Defaults to 1 (score in the calling process).
+        ordered (bool, optional): Keep records in input order when using
+            workers. Defaults to True.
+    
+    Yields:
+        AuditRecord: The line number, strength and entropy of each line.
+    
+    Raises:
+        ValueError: If workers is less than 1.
+    """
+    if workers < 1:
+        raise ValueError("Number of workers must be at least 1")
+    
+    if workers == 1:
+        line = 0
+        for block in iter_blocks(stream, chunk_bytes):
+            entropies, strengths = _score_block(block)
+            for strength, entropy in zip(strengths, entropies):
+                line += 1
+                yield AuditRecord(line, strength, entropy)
+        return
+    
+    # Record the first line number of every block as it is read, so
+    # unordered results can still be numbered
+    starts = {}
+    
+    def numbered_blocks():
+        line = 1
+        for index, block in enumerate(iter_blocks(stream, chunk_bytes)):
+            starts[index] = line
+            line += block.count(b"\n") + (not block.endswith(b"\n"))
+            yield block
+    
+    for index, (entropies, strengths) in _parallel_map(
+        _score_block, numbered_blocks(), workers, ordered
+    ):
+        line = starts.pop(index)
+        for strength, entropy in zip(strengths, entropies):
+            yield AuditRecord(line, strength, entropy)
+            line += 1
+
+
+def audit_stream(
+    stream: BinaryIO, chunk_bytes: int = DEFAULT_CHUNK_BYTES, workers: int = 1
+) -> AuditSummary:
+    """
+    Audit every line of a binary stream and summarize the results.
+    
+    Args:
+        stream (BinaryIO): The password list, opened in binary mode.
+        chunk_bytes (int, optional): The approximate number of bytes read
+            per block. Defaults to DEFAULT_CHUNK_BYTES.
+        workers (int, optional): The number of worker processes.
+            Defaults to 1 (score in the calling process).
+    
+    Returns:
+        AuditSummary: Strength counts and the entropy distribution.
+    
+    Raises:
+        ValueError: If workers is less than 1.
+    """
+    if workers < 1:
+        raise ValueError("Number of workers must be at least 1")
+    
+    summary = AuditSummary()
+    if workers == 1:
+        for block in iter_blocks(stream, chunk_bytes):
+            summary.merge(_summarize_block(block))
+        return summary
+    
+    blocks = iter_blocks(stream, chunk_bytes)
+    for _, partial in _parallel_map(_summarize_block, blocks, workers, ordered=False):
+        summary.merge(partial)
+    return summary
+
+
+def audit_file(
+    path: Union[str, os.PathLike],
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    workers: int = 1
+) -> AuditSummary:
+    """
+    Audit a newline-delimited password file with bounded memory.
+    
+    Args:
+        path (str or PathLike): The password list to audit.
+        chunk_bytes (int, optional): The approximate number of bytes read
+            per block. Defaults to DEFAULT_CHUNK_BYTES.
+        workers (int, optional): The number of worker processes.
+            Defaults to 1 (score in the calling process).
+    
+    Returns:
+        AuditSummary: Strength counts and the entropy distribution.
+    
+    Raises:
+        ValueError: If workers is less than 1.
+    """
+    with open(path, "rb") as stream:
+        return audit_stream(stream, chunk_bytes, workers)
@@ -0,0 +1,208 @@
+"""
+Compact on-disk blocklists of breached or common passwords.
+
+A blocklist index stores one 8-byte fingerprint per password, sorted, so a
+lookup is a binary search over a memory-mapped file: opening an index does
+no parsing and lookups never load the list into the Python heap.
+
+Index file layout (all integers little-endian):
+
+    offset 0   8 bytes   magic b"PGBLIST1"
+    offset 8   8 bytes   number of fingerprints (uint64)
+    offset 16  8*n bytes sorted, unique big-endian fingerprints
+"""
+
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from typing import Iterable, Iterator, List, Union
+
+from .wordlist import read_wordlist
+
+MAGIC = b"PGBLIST1"
+HEADER_SIZE = 16
+FINGERPRINT_SIZE = 8
+
+# Fingerprints sorted in memory per run when building an index
+DEFAULT_RUN_SIZE = 4000000
+
+
+def fingerprint(password: str) -> bytes:
+    """
+    Return the 8-byte fingerprint of a password.
+    
+    Passwords are compared case-insensitively, like the built-in common
+    password check, so the fingerprint is taken of the lowercased password.
+    
+    Args:
+        password (str): The password to fingerprint.
+    
+    Returns:
+        bytes: An 8-byte digest that sorts like a big-endian integer.
+    """
+    return hashlib.blake2b(
+        password.lower().encode("utf-8", "surrogatepass"), digest_size=FINGERPRINT_SIZE
+    ).digest()
+
+
+def _write_run(fingerprints: List[bytes], directory: str) -> str:
+    """Sort a run of fingerprints and write it to a temporary file."""
+    fingerprints.sort()
+    fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(fd, "wb") as out:
+        out.write(b"".join(fingerprints))
+    return path
+
+
+def _read_run(path: str) -> Iterator[bytes]:
+    """Yield the fingerprints of a sorted run file."""
+    with open(path, "rb") as stream:
+        while True:
+            block = stream.read(FINGERPRINT_SIZE * 8192)
+            if not block:
+                return
+            for i in range(0, len(block), FINGERPRINT_SIZE):
+                yield block[i:i + FINGERPRINT_SIZE]
+
+
+def build_blocklist(
+    wordlist: Union[str, os.PathLike, Iterable[str]],
+    index_path: Union[str, os.PathLike],
+    run_size: int = DEFAULT_RUN_SIZE
+) -> int:
+    """
+    Build a blocklist index from a wordlist.
+    
+    Fingerprints are sorted in runs of run_size and merged from temporary
+    files, so lists far larger than memory can be indexed.
+    
+    Args:
+        wordlist (str, PathLike or Iterable[str]): A newline-delimited UTF-8
+            wordlist file, or the passwords themselves.
+        index_path (str or PathLike): Where to write the index.
+        run_size (int, optional): The number of fingerprints sorted in memory
+            at a time. Defaults to DEFAULT_RUN_SIZE.
+    
+    Returns:
+        int: The number of unique fingerprints in the index.
+    """
+    if isinstance(wordlist, (str, os.PathLike)):
+        wordlist = read_wordlist(wordlist)
+    
+    directory = os.path.dirname(os.path.abspath(index_path))
+    runs = []
+    try:
+        batch = []
+        for password in wordlist:
+            batch.append(fingerprint(password))
+            if len(batch) >= run_size:
+                runs.append(_write_run(batch, directory))
+                batch = []
+        if batch or not runs:
+            runs.append(_write_run(batch, directory))
+        
+        count = 0
+        with open(index_path, "wb") as out:
+            out.write(MAGIC + struct.pack("<Q", 0))
+            previous = None
+            pending = []
+            for item in heapq.merge(*[_read_run(run) for run in runs]):
+                if item != previous:
+                    pending.append(item)
+                    previous = item
+                    if len(pending) >= 8192:
+                        out.write(b"".join(pending))
+                        count += len(pending)
+                        pending = []
+            out.write(b"".join(pending))
+            count += len(pending)
+            out.seek(len(MAGIC))
+            out.write(struct.pack("<Q", count))
+    finally:
+        for run in runs:
+            os.remove(run)
+    
+    return count
+
+
+class Blocklist:
+    """
+    A memory-mapped blocklist index built by build_blocklist().
+    
+    Supports ``password in blocklist`` with an O(log n) binary search over
+    the mapped fingerprints. Can be used as a context manager.
+    
+    Args:
+        path (str or PathLike): The index file to open.
+    
+    Raises:
+        ValueError: If the file is not a valid blocklist index.
+    """
+    
+    def __init__(self, path: Union[str, os.PathLike]):
+        with open(path, "rb") as stream:
+            header = stream.read(HEADER_SIZE)
+            if len(header) != HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+                raise ValueError("Not a passgen blocklist index: %s" % (path,))
+            (self._count,) = struct.unpack("<Q", header[len(MAGIC):])
+            size = os.fstat(stream.fileno()).st_size
+            if size != HEADER_SIZE + self._count * FINGERPRINT_SIZE:
+                raise ValueError("Truncated blocklist index: %s" % (path,))
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __contains__(self, password: object) -> bool:
+        if not isinstance(password, str):
+            return False
+        return self.contains_fingerprint(fingerprint(password))
+    
+    def contains_fingerprint(self, digest: bytes) -> bool:
+        """
+        Check whether a fingerprint is in the index.
+        
+        Args:
+            digest (bytes): A fingerprint produced by fingerprint().
+        
+        Returns:
+            bool: True if the fingerprint is present.
+        """
+        data = self._map
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            offset = HEADER_SIZE + mid * FINGERPRINT_SIZE
+            item = data[offset:offset + FINGERPRINT_SIZE]
+            if item < digest:
+                lo = mid + 1
+            elif item > digest:
+                hi = mid
+            else:
+                return True
+        return False
+    
+    def iter_fingerprints(self) -> Iterator[bytes]:
+        """
+        Iterate over the fingerprints in the index, in sorted order.
+        
+        Yields:
+            bytes: Each 8-byte fingerprint.
+        """
+        data = self._map
+        end = HEADER_SIZE + self._count * FINGERPRINT_SIZE
+        for offset in range(HEADER_SIZE, end, FINGERPRINT_SIZE):
+            yield data[offset:offset + FINGERPRINT_SIZE]
+    
+    def close(self) -> None:
+        """Unmap the index file."""
+        self._map.close()
+    
+    def __enter__(self) -> "Blocklist":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
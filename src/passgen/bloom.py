@@ -0,0 +1,230 @@
+"""
+Bloom filter front-end for password blocklists.
+
+A Bloom filter answers "definitely not in the list" without touching the
+exact blocklist index, and only a possible hit falls through to it. The
+filter is a small file of bits that is memory-mapped when opened.
+
+Filter file layout (all integers little-endian):
+
+    offset 0   8 bytes   magic b"PGBLOOM1"
+    offset 8   8 bytes   number of bits m (uint64)
+    offset 16  8 bytes   number of hash functions k (uint64)
+    offset 24  8 bytes   number of items added (uint64)
+    offset 32  m/8 bytes the bit array, least significant bit first
+"""
+
+import math
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, Union
+
+from .blocklist import Blocklist, fingerprint
+from .wordlist import read_wordlist
+
+MAGIC = b"PGBLOOM1"
+HEADER_SIZE = 32
+
+# Default false-positive rate of a new filter
+DEFAULT_FP_RATE = 0.01
+
+# Largest filter whose positions are derived from 32-bit hashes
+_MAX_SMALL_BITS = 1 << 32
+_MASK64 = (1 << 64) - 1
+
+
+def filter_parameters(capacity: int, fp_rate: float):
+    """
+    Return the bit and hash-function counts for a Bloom filter.
+    
+    Args:
+        capacity (int): The number of items the filter will hold.
+        fp_rate (float): The target false-positive rate, between 0 and 1.
+    
+    Returns:
+        Tuple[int, int]: The number of bits (a multiple of 8) and hash functions.
+    
+    Raises:
+        ValueError: If fp_rate is not between 0 and 1.
+    """
+    if not 0 < fp_rate < 1:
+        raise ValueError("False-positive rate must be between 0 and 1")
+    capacity = max(capacity, 1)
+    bits = math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)
+    bits = max(64, (bits + 7) // 8 * 8)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+def _mix64(value: int) -> int:
+    """Scramble a 64-bit integer (the splitmix64 finalizer)."""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def _positions(digest: bytes, bits: int, hashes: int) -> Iterator[int]:
+    """
+    Yield the bit positions of a fingerprint (double hashing).
+    
+    Filters of up to 2**32 bits take h1 and h2 from the two 32-bit halves
+    of the fingerprint. Those would only reach the first 2**32 bits of a
+    larger filter with the first position, so larger filters use the
+    whole fingerprint as h1 and a 64-bit mix of it as h2.
+    """
+    value = int.from_bytes(digest, "big")
+    if bits <= _MAX_SMALL_BITS:
+        h1 = value & 0xFFFFFFFF
+        h2 = (value >> 32) | 1
+    else:
+        h1 = value
+        h2 = _mix64(value) | 1
+    for i in range(hashes):
+        yield (h1 + i * h2) % bits
+
+
+def build_bloom_filter(
+    source: Union[str, os.PathLike, Blocklist, Iterable[str]],
+    path: Union[str, os.PathLike],
+    fp_rate: float = DEFAULT_FP_RATE
+) -> int:
+    """
+    Build a Bloom filter file for a set of passwords.
+    
+    Args:
+        source (str, PathLike, Blocklist or Iterable[str]): A newline-delimited
+            UTF-8 wordlist file, an open Blocklist index, or the passwords
+            themselves.
+        path (str or PathLike): Where to write the filter.
+        fp_rate (float, optional): The target false-positive rate.
+            Defaults to DEFAULT_FP_RATE.
+    
+    Returns:
+        int: The number of bits in the filter.
+    
+    Raises:
+        ValueError: If fp_rate is not between 0 and 1.
+    """
+    if isinstance(source, Blocklist):
+        count = len(source)
+        digests = source.iter_fingerprints()
+    elif isinstance(source, (str, os.PathLike)):
+        count = sum(1 for _ in read_wordlist(source))
+        digests = (fingerprint(word) for word in read_wordlist(source))
+    else:
+        digests = [fingerprint(word) for word in source]
+        count = len(digests)
+    
+    bits, hashes = filter_parameters(count, fp_rate)
+    array = bytearray(bits // 8)
+    added = 0
+    for digest in digests:
+        for pos in _positions(digest, bits, hashes):
+            array[pos >> 3] |= 1 << (pos & 7)
+        added += 1
+    
+    with open(path, "wb") as out:
+        out.write(MAGIC + struct.pack("<QQQ", bits, hashes, added))
+        out.write(array)
+    
+    return bits
+
+
+class BloomFilter:
+    """
+    A memory-mapped Bloom filter built by build_bloom_filter().
+    
+    ``password in bloom`` is False only if the password was definitely not
+    added; True means it probably was. Can be used as a context manager.
+    
+    Args:
+        path (str or PathLike): The filter file to open.
+    
+    Raises:
+        ValueError: If the file is not a valid Bloom filter.
+    """
+    
+    def __init__(self, path: Union[str, os.PathLike]):
+        with open(path, "rb") as stream:
+            header = stream.read(HEADER_SIZE)
+            if len(header) != HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+                raise ValueError("Not a passgen Bloom filter: %s" % (path,))
+            self.bits, self.hashes, self.count = struct.unpack("<QQQ", header[len(MAGIC):])
+            size = os.fstat(stream.fileno()).st_size
+            if size != HEADER_SIZE + self.bits // 8:
+                raise ValueError("Truncated Bloom filter: %s" % (path,))
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def __contains__(self, password: object) -> bool:
+        if not isinstance(password, str):
+            return False
+        return self.contains_fingerprint(fingerprint(password))
+    
+    def contains_fingerprint(self, digest: bytes) -> bool:
+        """
+        Check whether a fingerprint may have been added to the filter.
+        
+        Args:
+            digest (bytes): A fingerprint produced by blocklist.fingerprint().
+        
+        Returns:
+            bool: False if the fingerprint was definitely not added.
+        """
+        data = self._map
+        # The same positions that build_bloom_filter() set
+        for index in _positions(digest, self.bits, self.hashes):
+            if not data[HEADER_SIZE + (index >> 3)] >> (index & 7) & 1:
+                return False
+        return True
+    
+    def close(self) -> None:
+        """Unmap the filter file."""
+        self._map.close()
+    
+    def __enter__(self) -> "BloomFilter":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FilteredBlocklist:
+    """
+    A blocklist fronted by a Bloom filter.
+    
+    Each lookup fingerprints the password once, checks the filter, and only
+    searches the exact blocklist when the filter reports a possible hit.
+    Can be passed anywhere a blocklist is accepted, such as check_strength().
+    
+    Args:
+        bloom (BloomFilter): The filter built from the same passwords.
+        blocklist (Blocklist): The exact index.
+    """
+    
+    def __init__(self, bloom: BloomFilter, blocklist: Blocklist):
+        self.bloom = bloom
+        self.blocklist = blocklist
+    
+    def __len__(self) -> int:
+        return len(self.blocklist)
+    
+    def __contains__(self, password: object) -> bool:
+        if not isinstance(password, str):
+            return False
+        digest = fingerprint(password)
+        return (
+            self.bloom.contains_fingerprint(digest)
+            and self.blocklist.contains_fingerprint(digest)
+        )
+    
+    def close(self) -> None:
+        """Close the filter and the blocklist."""
+        self.bloom.close()
+        self.blocklist.close()
+    
+    def __enter__(self) -> "FilteredBlocklist":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,297 @@
+"""
+A memoizing cache for repeated strength checks.
+
+Forms that score a candidate password on every keystroke or resubmission
+see the same passwords over and over. StrengthCache answers repeats from a
+bounded cache without ever storing a password: entries are keyed on a
+keyed BLAKE2b digest (a MAC under a random key drawn for each cache), so
+the keys cannot be matched against candidate passwords without the key,
+and the digests are useless outside the process. The cached values are
+not protected, though: the strength labels and entropies say something
+about the passwords checked (an entropy bounds a password's length and
+character classes, for example), so anyone who can read the process's
+memory learns that much.
+
+Lookups take no lock. A hit only reads the shared table and sets the
+entry's "referenced" flag, and hit/miss counts are kept per thread (and
+folded into the totals when a thread ends).
+Inserts and evictions take a lock. Eviction uses the CLOCK (second
+chance) approximation of LRU: the oldest entry is dropped unless it was
+used since it was last examined, in which case it moves to the back.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Container, NamedTuple, Optional, Set, Tuple
+
+from . import strength
+from .strength import CharacterProfile
+
+# Default number of cached results
+DEFAULT_MAXSIZE = 4096
+
+# Size of the cache keys, in bytes
+DIGEST_SIZE = 16
+
+# Entry fields: the cached result, its expiry time (None if it never
+# expires) and whether it was used since eviction last looked at it
+_VALUE, _EXPIRES, _REFERENCED = range(3)
+
+
+class CacheStats(NamedTuple):
+    """
+    Usage statistics of a StrengthCache.
+    
+    Attributes:
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to compute the result.
+        size (int): The number of cached results.
+        maxsize (int): The maximum number of cached results.
+    """
+    
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+    
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _Counters:
+    """One thread's hit and miss counts for a cache."""
+    
+    __slots__ = ("hits", "misses")
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+
+class _ThreadExit:
+    """
+    Queues a thread's counters when the thread ends.
+    
+    Kept in the thread's local storage, so it is garbage collected when the
+    thread ends. deque.append() is atomic, so no lock is taken here: the
+    finalizer may run while another thread, or this one, holds the cache's
+    lock.
+    """
+    
+    __slots__ = ("queue", "counters")
+    
+    def __init__(self, queue: "deque[_Counters]", counters: _Counters):
+        self.queue = queue
+        self.counters = counters
+    
+    def __del__(self):
+        self.queue.append(self.counters)
+
+
+class StrengthCache:
+    """
+    A bounded, thread-safe cache in front of check_strength() and
+    calculate_entropy().
+    
+    The methods take the same arguments and return the same results as the
+    module-level functions. Calls with a blocklist are not cached, since the
+    result depends on a container that may change.
+    
+    Args:
+        maxsize (int, optional): The maximum number of cached results.
+            Defaults to DEFAULT_MAXSIZE.
+        ttl (float, optional): Seconds after which a cached result expires.
+            Defaults to None (results never expire).
+        clock (Callable[[], float], optional): The time source for ttl.
+            Defaults to time.monotonic.
+    
+    Raises:
+        ValueError: If maxsize is less than 1 or ttl is not positive.
+    """
+    
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Cache TTL must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._key = os.urandom(32)
+        self._entries: "OrderedDict[bytes, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # The counters of live threads, the counters of threads that have
+        # ended but are not yet folded into their counts, the counts of
+        # threads that have ended, and the totals at the last clear()
+        self._counters: Set[_Counters] = set()
+        self._ended: "deque[_Counters]" = deque()
+        self._retired = (0, 0)
+        self._cleared = (0, 0)
+    
+    def _digest(self, kind: bytes, password: str) -> bytes:
+        """Return the cache key of a password for one kind of result."""
+        # kind never contains a NUL byte, so the message is unambiguous
+        return hashlib.blake2b(
+            kind + b"\0" + password.encode("utf-8", "surrogatepass"),
+            digest_size=DIGEST_SIZE, key=self._key
+        ).digest()
+    
+    def _thread_counters(self) -> _Counters:
+        """Return the calling thread's counters."""
+        try:
+            return self._local.counters
+        except AttributeError:
+            counters = _Counters()
+            with self._lock:
+                self._retire_ended()
+                self._counters.add(counters)
+            self._local.counters = counters
+            self._local.exit = _ThreadExit(self._ended, counters)
+            return counters
+    
+    def _retire_ended(self) -> None:
+        """Fold the counters of threads that have ended into the totals. Lock held."""
+        ended = self._ended
+        hits, misses = self._retired
+        while ended:
+            counters = ended.popleft()
+            hits += counters.hits
+            misses += counters.misses
+            self._counters.discard(counters)
+        self._retired = (hits, misses)
+    
+    def _lookup(self, digest: bytes):
+        """Return the cached entry for a digest, or None; counts the lookup."""
+        entry = self._entries.get(digest)
+        if entry is not None and (entry[_EXPIRES] is None or entry[_EXPIRES] > self._clock()):
+            entry[_REFERENCED] = True
+            self._thread_counters().hits += 1
+            return entry
+        self._thread_counters().misses += 1
+        return None
+    
+    def _store(self, digest: bytes, value) -> None:
+        """Cache a result, evicting old entries to stay within maxsize."""
+        expires = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            entries = self._entries
+            if digest not in entries:
+                while len(entries) >= self.maxsize:
+                    self._evict()
+            entries[digest] = [value, expires, False]
+    
+    def _evict(self) -> None:
+        """Drop one entry, giving recently used ones a second chance. Lock held."""
+        entries = self._entries
+        now = self._clock() if self.ttl is not None else None
+        while True:
+            digest = next(iter(entries))
+            entry = entries[digest]
+            if entry[_REFERENCED] and (now is None or entry[_EXPIRES] > now):
+                entry[_REFERENCED] = False
+                entries.move_to_end(digest)
+            else:
+                del entries[digest]
+                return
+    
+    def check_strength(
+        self,
+        password: str,
+        profile: Optional[CharacterProfile] = None,
+        blocklist: Optional[Container[str]] = None,
+        engine: str = "charset"
+    ) -> str:
+        """
+        Check the strength of a password, using the cache.
+        
+        See passgen.check_strength() for the arguments.
+        
+        Returns:
+            str: "Weak", "Medium", or "Strong".
+        
+        Raises:
+            ValueError: If engine is not a known engine name.
+        """
+        if blocklist is not None:
+            return strength.check_strength(password, profile, blocklist, engine)
+        if engine not in strength.ENGINES:
+            raise ValueError("Unknown entropy engine: %r" % (engine,))
+        
+        digest = self._digest(b"strength:" + engine.encode("ascii"), password)
+        entry = self._lookup(digest)
+        if entry is not None:
+            return entry[_VALUE]
+        value = strength.check_strength(password, profile, None, engine)
+        self._store(digest, value)
+        return value
+    
+    def calculate_entropy(
+        self,
+        password: str,
+        profile: Optional[CharacterProfile] = None,
+        engine: str = "charset"
+    ) -> float:
+        """
+        Calculate the entropy (in bits) of a password, using the cache.
+        
+        See passgen.calculate_entropy() for the arguments.
+        
+        Returns:
+            float: The entropy in bits.
+        
+        Raises:
+            ValueError: If engine is not a known engine name.
+        """
+        if engine not in strength.ENGINES:
+            raise ValueError("Unknown entropy engine: %r" % (engine,))
+        
+        digest = self._digest(b"entropy:" + engine.encode("ascii"), password)
+        entry = self._lookup(digest)
+        if entry is not None:
+            return entry[_VALUE]
+        value = strength.calculate_entropy(password, profile, engine)
+        self._store(digest, value)
+        return value
+    
+    def clear(self) -> None:
+        """Drop every cached result and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._cleared = self._totals()
+    
+    def _totals(self) -> Tuple[int, int]:
+        """Sum the hit and miss counts of every thread. Lock held."""
+        self._retire_ended()
+        hits, misses = self._retired
+        for counters in self._counters:
+            hits += counters.hits
+            misses += counters.misses
+        return hits, misses
+    
+    def stats(self) -> CacheStats:
+        """
+        Return the cache's usage statistics since it was created or cleared.
+        
+        Returns:
+            CacheStats: The hit and miss counts and the current and maximum size.
+        """
+        with self._lock:
+            hits, misses = self._totals()
+            cleared_hits, cleared_misses = self._cleared
+            size = len(self._entries)
+        return CacheStats(hits - cleared_hits, misses - cleared_misses, size, self.maxsize)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,419 @@
+"""
+Command-line interface for the passgen library.
+
+Usage:
+    passgen generate [-n N] [-l LENGTH] [--no-symbols ...] [--format FORMAT]
+    passgen pronounceable [-n N] [-l LENGTH] [--digits] [--symbols] [--capitalize]
+    passgen strength [PASSWORD ...] [-f FILE] [--engine ENGINE] [--format FORMAT]
+    passgen audit FILE [--per-line] [--json] [--workers N] [--unordered]
+    passgen --metrics FILE COMMAND ...
+
+(or ``python -m passgen ...``). The library modules a command needs are
+imported when it runs, so starting the command stays cheap.
+"""
+
+import argparse
+import os
+import sys
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
+
+# Number of output lines buffered before each write to stdout
+_WRITE_BATCH = 4096
+
+# Number of passwords generated per generate_many() call in bulk output
+_GENERATE_BATCH = 65536
+
+FORMATS = ("plain", "jsonl", "csv")
+
+
+def _open_input(path: str):
+    """Open path for binary reading, or return stdin for "-"."""
+    if path == "-":
+        return sys.stdin.buffer
+    return open(path, "rb")
+
+
+def _positive_int(value: str) -> int:
+    """Parse a command-line integer that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return number
+
+
+def _format_columns(fields: Sequence[str], columns: Sequence[list], fmt: str, first: bool) -> str:
+    """
+    Format a batch of output, given column by column, as one block of text.
+    
+    Float columns are written with two decimals. Columns are converted with
+    map() rather than row by row, which keeps bulk output cheap.
+    
+    Args:
+        fields (Sequence[str]): The column names.
+        columns (Sequence[list]): The values of each column.
+        fmt (str): "plain" (tab-separated), "jsonl" or "csv".
+        first (bool): Whether this is the first block, which carries the CSV
+            header.
+    
+    Returns:
+        str: The formatted lines, each ending with a newline.
+    """
+    if not columns[0]:
+        return ""
+    floats = [type(column[0]) is float for column in columns]
+    columns = [
+        list(map("%.2f".__mod__, column)) if is_float else column
+        for column, is_float in zip(columns, floats)
+    ]
+    
+    if fmt == "plain":
+        if len(columns) == 1:
+            return "\n".join(columns[0]) + "\n"
+        return "\n".join(map("\t".join, zip(*columns))) + "\n"
+    
+    if fmt == "jsonl":
+        # Fill a template rather than json.dumps() a dict per row; strings
+        # are escaped exactly as json.dumps() would
+        from json.encoder import encode_basestring_ascii as escape
+        template = "{" + ", ".join("%s: %%s" % escape(field) for field in fields) + "}"
+        columns = [
+            column if is_float else list(map(escape, column))
+            for column, is_float in zip(columns, floats)
+        ]
+        return "\n".join(map(template.__mod__, zip(*columns))) + "\n"
+    
+    import csv
+    import io
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if first:
+        writer.writerow(fields)
+    writer.writerows(zip(*columns))
+    return buffer.getvalue()
+
+
+def _write_columns(fields: Sequence[str], batches: Iterable[Sequence[list]], fmt: str) -> None:
+    """Write batches of columns to stdout, one write per batch."""
+    out = sys.stdout
+    first = True
+    for columns in batches:
+        out.write(_format_columns(fields, columns, fmt, first))
+        first = False
+    out.flush()
+
+
+def _generated_columns(
+    count: int,
+    make_batch: Callable[[int], list],
+    detailed: bool
+) -> Iterator[Sequence[list]]:
+    """
+    Yield columns of generated passwords, _GENERATE_BATCH at a time.
+    
+    Args:
+        count (int): The total number of passwords.
+        make_batch (Callable[[int], list]): Generates a list of n passwords,
+            as GeneratedPassword objects if detailed is True.
+        detailed (bool): Whether to add an entropy column.
+    """
+    remaining = count
+    while remaining > 0:
+        size = min(remaining, _GENERATE_BATCH)
+        batch = make_batch(size)
+        if detailed:
+            yield [item.password for item in batch], [item.entropy for item in batch]
+        else:
+            yield (batch,)
+        remaining -= size
+
+
+def _cmd_generate(args: argparse.Namespace) -> int:
+    """Run the generate subcommand."""
+    from .generator import default_generator
+    from .policy import get_policy
+    
+    policy = get_policy(
+        not args.no_uppercase, not args.no_lowercase, not args.no_digits,
+        not args.no_symbols, args.exclude_ambiguous,
+        args.min_uppercase, args.min_lowercase, args.min_digits, args.min_symbols,
+        args.max_repeats, args.forbidden,
+    )
+    generator = default_generator()
+    detailed = args.format != "plain"
+    # Validate the options before any output is written
+    generator.generate(args.length, policy=policy)
+    
+    def make_batch(n):
+        return generator.generate_many(n, args.length, policy=policy, detailed=detailed)
+    
+    _write_columns(("password", "entropy"), _generated_columns(args.count, make_batch, detailed), args.format)
+    return 0
+
+
+def _cmd_pronounceable(args: argparse.Namespace) -> int:
+    """Run the pronounceable subcommand."""
+    from .generator import default_generator
+    
+    generator = default_generator()
+    detailed = args.format != "plain"
+    options = (args.length, args.digits, args.symbols, args.capitalize)
+    generator.generate_pronounceable(*options)
+    
+    def make_batch(n):
+        generate = generator.generate_pronounceable
+        return [generate(*options, detailed=detailed) for _ in range(n)]
+    
+    _write_columns(("password", "entropy"), _generated_columns(args.count, make_batch, detailed), args.format)
+    return 0
+
+
+def _read_passwords(paths: List[str]) -> Iterator[List[str]]:
+    """Yield the lines of the given files (or stdin) in batches."""
+    from .audit import iter_blocks, split_lines
+    
+    for path in paths:
+        stream = _open_input(path)
+        try:
+            for block in iter_blocks(stream):
+                lines = split_lines(block)
+                for i in range(0, len(lines), _WRITE_BATCH):
+                    yield lines[i:i + _WRITE_BATCH]
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+
+def _cmd_strength(args: argparse.Namespace) -> int:
+    """Run the strength subcommand."""
+    if args.passwords:
+        batches: Iterable[List[str]] = [args.passwords]
+    else:
+        batches = _read_passwords(args.file or ["-"])
+    
+    if args.engine == "charset":
+        from .strength import _batch
+        
+        def score(passwords):
+            entropies, strengths = _batch(passwords, None, True)
+            return strengths, entropies, passwords
+    else:
+        from .strength import calculate_entropy, check_strength
+        
+        def score(passwords):
+            return (
+                [check_strength(password, engine=args.engine) for password in passwords],
+                [float(calculate_entropy(password, engine=args.engine)) for password in passwords],
+                passwords,
+            )
+    
+    _write_columns(("strength", "entropy", "password"), map(score, batches), args.format)
+    return 0
+
+
+def _cmd_audit(args: argparse.Namespace) -> int:
+    """Run the audit subcommand."""
+    from .audit import audit_stream, iter_audit
+    if args.json:
+        import json
+    
+    stream = _open_input(args.file)
+    out = sys.stdout
+    try:
+        if args.per_line:
+            lines = []
+            records = iter_audit(
+                stream, workers=args.workers, ordered=not args.unordered
+            )
+            for record in records:
+                if args.json:
+                    lines.append(json.dumps(record._asdict()))
+                else:
+                    lines.append("%d\t%s\t%.2f" % record)
+                if len(lines) >= _WRITE_BATCH:
+                    out.write("\n".join(lines) + "\n")
+                    lines = []
+            if lines:
+                out.write("\n".join(lines) + "\n")
+            return 0
+        
+        summary = audit_stream(stream, workers=args.workers)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+    
+    if args.json:
+        out.write(json.dumps(summary.to_dict()) + "\n")
+        return 0
+    
+    out.write("Passwords: %d\n" % summary.total)
+    for label, count in summary.counts.items():
+        out.write("%-8s %d\n" % (label + ":", count))
+    out.write("Entropy:  min %.2f, mean %.2f, max %.2f bits\n" % (
+        summary.entropy_min if summary.total else 0.0,
+        summary.entropy_mean,
+        summary.entropy_max,
+    ))
+    data = summary.to_dict()["histogram"]
+    width = data["bucket_width"]
+    last = len(data["counts"]) - 1
+    for i, count in enumerate(data["counts"]):
+        if count:
+            upper = "+" if i == last else "-%d" % ((i + 1) * width)
+            out.write("  %3d%-5s %d\n" % (i * width, upper, count))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser for the passgen command.
+    
+    Returns:
+        argparse.ArgumentParser: The configured parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="passgen", description="Secure & Configurable Password Generator"
+    )
+    parser.add_argument(
+        "--metrics", metavar="FILE",
+        help='record call metrics and write them in Prometheus text format to '
+             'FILE, or "-" for stderr, when the command finishes'
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.required = True
+    
+    def add_bulk_options(command, default_length):
+        command.add_argument(
+            "-n", "--count", type=_positive_int, default=1, metavar="N",
+            help="number of passwords to generate (default: 1)"
+        )
+        command.add_argument(
+            "-l", "--length", type=int, default=default_length,
+            help="password length, 4-64 (default: %d)" % default_length
+        )
+        command.add_argument(
+            "--format", choices=FORMATS, default="plain",
+            help="output format; jsonl and csv include the entropy (default: plain)"
+        )
+    
+    generate = commands.add_parser("generate", help="generate random passwords")
+    add_bulk_options(generate, 12)
+    for name in ("uppercase", "lowercase", "digits", "symbols"):
+        generate.add_argument(
+            "--no-" + name, action="store_true", help="leave out %s" % name
+        )
+    generate.add_argument(
+        "--exclude-ambiguous", action="store_true",
+        help="leave out look-alike characters such as 0, O, 1 and l"
+    )
+    for name in ("uppercase", "lowercase", "digits", "symbols"):
+        generate.add_argument(
+            "--min-" + name, type=int, default=0, metavar="N",
+            help="require at least N %s" % name
+        )
+    generate.add_argument(
+        "--max-repeats", type=_positive_int, default=None, metavar="N",
+        help="allow runs of at most N identical characters"
+    )
+    generate.add_argument(
+        "--forbidden", default="", metavar="CHARS", help="never use these characters"
+    )
+    generate.set_defaults(func=_cmd_generate)
+    
+    pronounceable = commands.add_parser(
+        "pronounceable", help="generate pronounceable passwords"
+    )
+    add_bulk_options(pronounceable, 12)
+    pronounceable.add_argument("--digits", action="store_true", help="include digits")
+    pronounceable.add_argument("--symbols", action="store_true", help="include symbols")
+    pronounceable.add_argument(
+        "--capitalize", action="store_true", help="capitalize some letters"
+    )
+    pronounceable.set_defaults(func=_cmd_pronounceable)
+    
+    strength = commands.add_parser(
+        "strength", help="check the strength of passwords"
+    )
+    strength.add_argument(
+        "passwords", nargs="*", metavar="PASSWORD",
+        help="passwords to check (default: one per line from stdin or --file)"
+    )
+    strength.add_argument(
+        "-f", "--file", action="append", metavar="FILE",
+        help='read passwords from FILE, or "-" for stdin; may be repeated'
+    )
+    strength.add_argument(
+        "--engine", choices=("charset", "pattern"), default="charset",
+        help="entropy engine (default: charset)"
+    )
+    strength.add_argument(
+        "--format", choices=FORMATS, default="plain",
+        help="output format for the strength, entropy and password of each "
+             "line (default: plain, tab-separated)"
+    )
+    strength.set_defaults(func=_cmd_strength)
+    
+    audit = commands.add_parser(
+        "audit", help="audit a newline-delimited password list"
+    )
+    audit.add_argument("file", help='password list to audit, or "-" for stdin')
+    audit.add_argument(
+        "--per-line", action="store_true",
+        help="print the strength and entropy of every line instead of a summary"
+    )
+    audit.add_argument("--json", action="store_true", help="write JSON output")
+    audit.add_argument(
+        "--workers", type=_positive_int, default=1, metavar="N",
+        help="number of worker processes (default: 1)"
+    )
+    audit.add_argument(
+        "--unordered", action="store_true",
+        help="with --per-line and --workers, print blocks as they finish"
+    )
+    audit.set_defaults(func=_cmd_audit)
+    
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the passgen command line.
+    
+    Args:
+        argv (List[str], optional): The arguments, excluding the program name.
+            Defaults to sys.argv[1:].
+    
+    Returns:
+        int: The process exit code.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.metrics is None:
+        return _run(parser, args)
+    
+    from . import metrics
+    
+    metrics.enable()
+    try:
+        return _run(parser, args)
+    finally:
+        metrics.disable()
+        if args.metrics == "-":
+            sys.stderr.write(metrics.to_prometheus())
+        else:
+            with open(args.metrics, "w") as out:
+                out.write(metrics.to_prometheus())
+
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    """Run the selected subcommand, turning expected errors into exit codes."""
+    try:
+        return args.func(args)
+    except ValueError as exc:
+        sys.stderr.write("%s: error: %s\n" % (parser.prog, exc))
+        return 2
+    except BrokenPipeError:
+        # The reader went away (e.g. "| head"); stop quietly, and point
+        # stdout at devnull so the interpreter's final flush cannot fail
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
@@ -0,0 +1,665 @@
+"""
+Pattern-aware password strength estimation.
+
+Instead of assuming every character was drawn at random, this estimator
+looks for the patterns attackers try first: dictionary words (including
+l33t substitutions and capitalization), keyboard walks, repeats,
+sequences and dates. It then finds the decomposition of the password into
+such patterns, plus brute-forced gaps, that needs the fewest guesses, using
+the dynamic-programming scoring of the zxcvbn estimator.
+
+Matchers are backed by a trie over the ranked dictionary and a keyboard
+adjacency table, both built once when the module is imported.
+"""
+
+import math
+import re
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .strength import COMMON_PASSWORDS
+
+# Ranked dictionary: most common first. The rank of a word is the number of
+# guesses an attacker working down the list needs to reach it.
+RANKED_WORDS = (
+    "123456", "password", "12345678", "qwerty", "123456789", "12345", "1234",
+    "111111", "1234567", "dragon", "123123", "baseball", "abc123", "football",
+    "monkey", "letmein", "696969", "shadow", "master", "666666", "qwertyuiop",
+    "123321", "mustang", "1234567890", "michael", "654321", "superman",
+    "1qaz2wsx", "7777777", "121212", "000000", "qazwsx", "123qwe", "killer",
+    "trustno1", "jordan", "jennifer", "zxcvbnm", "asdfgh", "hunter", "buster",
+    "soccer", "harley", "batman", "andrew", "tigger", "sunshine", "iloveyou",
+    "charlie", "robert", "thomas", "hockey", "ranger", "daniel", "starwars",
+    "112233", "george", "computer", "michelle", "jessica", "pepper", "1111",
+    "zxcvbn", "555555", "11111111", "131313", "freedom", "777777", "pass",
+    "maggie", "159753", "aaaaaa", "ginger", "princess", "joshua", "cheese",
+    "amanda", "summer", "love", "ashley", "nicole", "chelsea", "biteme",
+    "matthew", "access", "yankees", "987654321", "dallas", "austin", "thunder",
+    "taylor", "matrix", "welcome", "admin", "login", "secret", "ninja",
+    "jesus", "whatever", "passw0rd", "qwerty123", "hello", "football1",
+    "charlie1", "donald", "flower", "lovely", "sunshine1", "monkey1",
+    "shadow1", "master1", "princess1", "letmein1", "dragon1", "welcome1",
+    "password1", "admin123", "root", "toor", "guest", "test", "changeme",
+    "default", "user", "secret1", "orange", "banana", "apple", "purple",
+    "silver", "golden", "diamond", "tiger", "lion", "eagle", "horse",
+    "correct", "battery", "staple", "house", "money", "family", "friend",
+    "friends", "happy", "heaven", "angel", "angels", "forever", "soccer1",
+    "winter", "spring", "autumn", "january", "february", "march", "april",
+    "june", "july", "august", "september", "october", "november", "december",
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday",
+    "sunday", "red", "blue", "green", "black", "white", "yellow", "pink",
+    "cat", "dog", "fish", "bird", "bear", "wolf", "fox", "star", "moon", "sun",
+    "fire", "water", "earth", "wind", "ice", "snow", "rain", "storm", "light",
+    "dark", "night", "day", "time", "life", "world", "peace", "power", "magic",
+    "king", "queen", "prince", "knight", "game", "games", "player", "music",
+    "rock", "metal", "lover", "baby", "sweet", "sugar", "honey", "cookie",
+    "pizza", "coffee", "beer", "party", "school", "college", "office", "work",
+    "phone", "email", "internet", "google", "facebook", "samsung", "microsoft",
+    "windows", "linux", "server", "database", "system",
+)
+
+# Common l33t substitutions, from the substituted character to the letters
+# it may stand for
+L33T_TABLE = {
+    "4": "a", "@": "a", "8": "b", "(": "c", "{": "c", "[": "c", "<": "c",
+    "3": "e", "6": "g", "9": "g", "1": "il", "!": "i", "|": "il", "7": "lt",
+    "0": "o", "$": "s", "5": "s", "+": "t", "%": "x", "2": "z",
+}
+
+# QWERTY layout rows as (unshifted, shifted) key pairs, with the horizontal
+# offset of each row's first key
+KEYBOARD_ROWS = (
+    (0.0, ["`~", "1!", "2@", "3#", "4$", "5%", "6^", "7&", "8*", "9(", "0)", "-_", "=+"]),
+    (1.5, ["qQ", "wW", "eE", "rR", "tT", "yY", "uU", "iI", "oO", "pP", "[{", "]}", "\\|"]),
+    (1.75, ["aA", "sS", "dD", "fF", "gG", "hH", "jJ", "kK", "lL", ";:", "'\""]),
+    (2.25, ["zZ", "xX", "cC", "vV", "bB", "nN", "mM", ",<", ".>", "/?"]),
+)
+
+# Scoring constants, as in zxcvbn
+BRUTEFORCE_CARDINALITY = 10
+MIN_GUESSES_BEFORE_GROWING_SEQUENCE = 10000
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+MIN_YEAR_SPACE = 20
+
+SEQUENCE_MAX_DELTA = 5
+DATE_MIN_YEAR = 1000
+DATE_MAX_YEAR = 2050
+
+
+class Match(NamedTuple):
+    """
+    A pattern found in a password.
+    
+    Attributes:
+        pattern (str): "dictionary", "spatial", "repeat", "sequence",
+            "date", or "bruteforce".
+        i (int): The index of the first character of the match.
+        j (int): The index of the last character of the match.
+        token (str): The matched part of the password.
+        guesses (int): The number of guesses needed to find the token.
+    """
+    
+    pattern: str
+    i: int
+    j: int
+    token: str
+    guesses: int
+
+
+class Estimate(NamedTuple):
+    """
+    The result of estimate().
+    
+    Attributes:
+        guesses (int): The estimated number of guesses to crack the password.
+        entropy (float): log2(guesses), in bits.
+        sequence (Tuple[Match, ...]): The cheapest decomposition found.
+    """
+    
+    guesses: int
+    entropy: float
+    sequence: Tuple[Match, ...]
+
+
+def _build_trie(words: Iterable[str]) -> Dict[str, object]:
+    """Build a nested-dict trie mapping each word to its 1-based rank."""
+    trie = {}
+    for rank, word in enumerate(words, start=1):
+        node = trie
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        # Keep the best rank of duplicated words
+        node.setdefault("", rank)
+    return trie
+
+
+def _build_adjacency() -> Tuple[Dict[str, Tuple[int, bool]], List[frozenset]]:
+    """
+    Build the keyboard key index and neighbour table.
+    
+    Returns:
+        Tuple: A map from each character to (key index, shifted), and the
+        set of neighbouring key indices of every key.
+    """
+    keys = {}
+    positions = []
+    for row, (offset, row_keys) in enumerate(KEYBOARD_ROWS):
+        for column, pair in enumerate(row_keys):
+            index = len(positions)
+            positions.append((row, offset + column))
+            keys[pair[0]] = (index, False)
+            keys[pair[1]] = (index, True)
+    
+    neighbours = []
+    for row, x in positions:
+        neighbours.append(frozenset(
+            other for other, (other_row, other_x) in enumerate(positions)
+            if (other_row == row and abs(other_x - x) == 1)
+            or (abs(other_row - row) == 1 and abs(other_x - x) < 1)
+        ))
+    return keys, neighbours
+
+
+_DEFAULT_WORDS = RANKED_WORDS + tuple(sorted(COMMON_PASSWORDS - set(RANKED_WORDS)))
+_TRIE = _build_trie(_DEFAULT_WORDS)
+_KEYS, _NEIGHBOURS = _build_adjacency()
+_KEYBOARD_STARTS = len(_NEIGHBOURS)
+_KEYBOARD_DEGREE = sum(len(n) for n in _NEIGHBOURS) / len(_NEIGHBOURS)
+
+_DATE_WITH_SEPARATOR = re.compile(r"^(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})$")
+_DATE_SEPARATOR = re.compile(r"\d[\s/\\_.-]")
+_DIGIT_RUN = re.compile(r"\d{4,}")
+_YEAR = re.compile(r"19\d\d|20\d\d")
+_START_UPPER = re.compile(r"^[A-Z][^A-Z]+$")
+_END_UPPER = re.compile(r"^[^A-Z]+[A-Z]$")
+_ALL_UPPER = re.compile(r"^[^a-z]+$")
+_REPEAT_GREEDY = re.compile(r"(.+)\1+", re.DOTALL)
+_REPEAT_LAZY = re.compile(r"(.+?)\1+", re.DOTALL)
+_REPEAT_LAZY_ANCHORED = re.compile(r"^(.+?)\1+$", re.DOTALL)
+
+
+def _choose(n: int, k: int) -> int:
+    """Return the binomial coefficient C(n, k)."""
+    if k < 0 or k > n:
+        return 0
+    return math.factorial(n) // (math.factorial(k) * math.factorial(n - k))
+
+
+def _uppercase_variations(token: str) -> int:
+    """Return the number of capitalizations an attacker would try for token."""
+    if token.lower() == token:
+        return 1
+    # Capitalized, trailing capital and all-caps words are tried first
+    for pattern in (_START_UPPER, _END_UPPER, _ALL_UPPER):
+        if pattern.match(token):
+            return 2
+    upper = sum(1 for c in token if c.isupper())
+    lower = sum(1 for c in token if c.islower())
+    return sum(_choose(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+
+def _l33t_variations(token: str, subs: Dict[str, str]) -> int:
+    """Return the number of l33t spellings an attacker would try for token."""
+    variations = 1
+    lowered = token.lower()
+    for subbed, letter in subs.items():
+        s = lowered.count(subbed)
+        u = lowered.count(letter)
+        if s == 0 or u == 0:
+            variations *= 2
+        else:
+            variations *= sum(_choose(u + s, i) for i in range(1, min(u, s) + 1))
+    return variations
+
+
+def _dictionary_matches(password: str, trie: Dict[str, object]) -> List[Match]:
+    """Find dictionary words, allowing l33t substitutions."""
+    matches = []
+    lowered = password.lower()
+    n = len(password)
+    
+    for start in range(n):
+        # Depth-first walk of the trie; each stack entry is
+        # (node, next index, substitutions used so far)
+        stack = [(trie, start, ())]
+        while stack:
+            node, index, subs = stack.pop()
+            if "" in node and index > start:
+                token = password[start:index]
+                guesses = node[""] * _uppercase_variations(token)
+                if subs:
+                    guesses *= _l33t_variations(token, dict(subs))
+                matches.append(Match("dictionary", start, index - 1, token, guesses))
+            if index == n:
+                continue
+            char = lowered[index]
+            child = node.get(char)
+            if child is not None:
+                stack.append((child, index + 1, subs))
+            for letter in L33T_TABLE.get(char, ""):
+                child = node.get(letter)
+                if child is not None:
+                    stack.append((child, index + 1, subs + ((char, letter),)))
+    
+    return matches
+
+
+def _spatial_guesses(length: int, turns: int, shifted: int) -> int:
+    """Return the guesses needed for a keyboard walk."""
+    guesses = 0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += _choose(i - 1, j - 1) * _KEYBOARD_STARTS * _KEYBOARD_DEGREE ** j
+    guesses = int(guesses)
+    if shifted:
+        unshifted = length - shifted
+        if unshifted == 0:
+            guesses *= 2
+        else:
+            guesses *= sum(_choose(shifted + unshifted, i) for i in range(1, min(shifted, unshifted) + 1))
+    return guesses
+
+
+def _spatial_matches(password: str) -> List[Match]:
+    """Find runs of adjacent keys of length 3 or more."""
+    matches = []
+    n = len(password)
+    i = 0
+    while i < n - 2:
+        key = _KEYS.get(password[i])
+        if key is None:
+            i += 1
+            continue
+        j = i
+        turns = 0
+        shifted = int(key[1])
+        direction = None
+        while j + 1 < n:
+            following = _KEYS.get(password[j + 1])
+            current = _KEYS[password[j]][0]
+            if following is None or following[0] not in _NEIGHBOURS[current]:
+                break
+            step = following[0] - current
+            if step != direction:
+                turns += 1
+                direction = step
+            shifted += following[1]
+            j += 1
+        if j - i >= 2:
+            token = password[i:j + 1]
+            matches.append(Match("spatial", i, j, token, _spatial_guesses(len(token), turns, shifted)))
+            i = j + 1
+        else:
+            i += 1
+    return matches
+
+
+def _sequence_matches(password: str) -> List[Match]:
+    """Find runs of 3 or more characters with a constant small step."""
+    matches = []
+    n = len(password)
+    i = 0
+    while i < n - 2:
+        delta = ord(password[i + 1]) - ord(password[i])
+        j = i + 1
+        if 0 < abs(delta) <= SEQUENCE_MAX_DELTA:
+            while j + 1 < n and ord(password[j + 1]) - ord(password[j]) == delta:
+                j += 1
+        if j - i >= 2:
+            token = password[i:j + 1]
+            first = token[0]
+            if first in "aAzZ019":
+                base = 4
+            elif first.isdigit():
+                base = 10
+            else:
+                base = 26
+            if delta < 0:
+                base *= 2
+            matches.append(Match("sequence", i, j, token, base * len(token)))
+            i = j
+        else:
+            i += 1
+    return matches
+
+
+def _year_guesses(year: int, reference_year: int) -> int:
+    return max(abs(year - reference_year), MIN_YEAR_SPACE)
+
+
+def _two_digit_year(year: int) -> int:
+    if year > 99:
+        return year
+    return year + (1900 if year > 50 else 2000)
+
+
+def _valid_date(day: int, month: int, year: int) -> bool:
+    return 1 <= month <= 12 and 1 <= day <= 31 and DATE_MIN_YEAR <= year <= DATE_MAX_YEAR
+
+
+def _digit_date_splits(n: int) -> Tuple[Tuple[slice, slice, slice], ...]:
+    """List the (year, first, second) slices a run of n digits can split into."""
+    splits = []
+    for year_len in (4, 2):
+        if year_len >= n or not 2 <= n - year_len <= 4:
+            continue
+        for year_first in (True, False):
+            if year_first:
+                year, rest = slice(0, year_len), year_len
+            else:
+                year, rest = slice(n - year_len, n), 0
+            rest_len = n - year_len
+            for split in range(max(1, rest_len - 2), min(3, rest_len)):
+                splits.append((year, slice(rest, rest + split), slice(rest + split, rest + rest_len)))
+    return tuple(splits)
+
+
+_DIGIT_DATE_SPLITS = {n: _digit_date_splits(n) for n in range(4, 9)}
+
+
+def _date_from_digits(digits: str, reference_year: int) -> Optional[int]:
+    """Return the year of the likeliest date spelled by 4-8 digits, if any."""
+    best = None
+    for year_slice, first, second in _DIGIT_DATE_SPLITS[len(digits)]:
+        a, b = int(digits[first]), int(digits[second])
+        # A day and a month, in either order; the year is parsed only then
+        if not (1 <= a <= 31 and 1 <= b <= 31 and (a <= 12 or b <= 12)):
+            continue
+        year = _two_digit_year(int(digits[year_slice]))
+        if DATE_MIN_YEAR <= year <= DATE_MAX_YEAR:
+            if best is None or abs(year - reference_year) < abs(best - reference_year):
+                best = year
+    return best
+
+
+def _date_matches(password: str, reference_year: int, bound: Optional[int] = None) -> List[Match]:
+    """
+    Find recent years and dates, with or without separators.
+    
+    bound is the cost of a sequence already known to cover the password.
+    Unless it is the whole password, a date costs at least 2 * 10 * its
+    guesses + 10000 in a sequence (two matches or more, each at least
+    10), so dates that cannot beat bound are not searched for.
+    """
+    matches = [
+        Match("date", m.start(), m.end() - 1, m.group(), _year_guesses(int(m.group()), reference_year))
+        for m in _YEAR.finditer(password)
+    ]
+    max_guesses = None
+    if bound is not None:
+        max_guesses = (bound - MIN_GUESSES_BEFORE_GROWING_SEQUENCE) // (2 * MIN_SUBMATCH_GUESSES_SINGLE_CHAR)
+        if len(password) <= 10:
+            max_guesses = max(max_guesses, bound - 1)
+        if max_guesses < MIN_YEAR_SPACE * 365:
+            return matches
+    dates = []
+    # Digit runs often recur (repeated years, for example); parse each once
+    years = {}
+    for run in _DIGIT_RUN.finditer(password):
+        start, end = run.span()
+        for i in range(start, end - 3):
+            for j in range(i + 3, min(i + 8, end)):
+                token = password[i:j + 1]
+                if token not in years:
+                    years[token] = _date_from_digits(token, reference_year)
+                if years[token] is not None:
+                    dates.append(Match("date", i, j, token, _year_guesses(years[token], reference_year) * 365))
+    # Most passwords have no separator, and so no dates written with one
+    if _DATE_SEPARATOR.search(password) and (max_guesses is None or max_guesses >= MIN_YEAR_SPACE * 365 * 4):
+        n = len(password)
+        for i in range(n):
+            if not password[i].isdigit():
+                continue
+            for j in range(i + 4, min(i + 10, n)):
+                token = password[i:j + 1]
+                match = _DATE_WITH_SEPARATOR.match(token)
+                if not match:
+                    continue
+                first, _, middle, last = match.groups()
+                for day_month, year_text in ((first + "." + middle, last), (middle + "." + last, first)):
+                    if len(year_text) not in (2, 4):
+                        continue
+                    a, b = (int(x) for x in day_month.split("."))
+                    year = _two_digit_year(int(year_text))
+                    if _valid_date(a, b, year) or _valid_date(b, a, year):
+                        dates.append(Match("date", i, j, token, _year_guesses(year, reference_year) * 365 * 4))
+                        break
+        dates.sort(key=lambda match: (match.i, match.j))
+    # A date dearer than brute-forcing its span, or than max_guesses, can
+    # never win
+    matches.extend(
+        match for match in dates
+        if match.guesses <= BRUTEFORCE_CARDINALITY ** (match.j - match.i + 1)
+        and (max_guesses is None or match.guesses <= max_guesses)
+    )
+    return matches
+
+
+def _repeat_matches(
+    password: str, trie: Dict[str, object], reference_year: int, memo: Dict[str, int]
+) -> List[Match]:
+    """
+    Find repeated characters or substrings.
+    
+    The guesses for each repeated base are estimated recursively, once per
+    distinct base; memo maps the bases estimated so far to their guesses.
+    """
+    matches = []
+    index = 0
+    n = len(password)
+    while index < n:
+        greedy = _REPEAT_GREEDY.search(password, index)
+        if not greedy:
+            break
+        lazy = _REPEAT_LAZY.search(password, index)
+        if len(greedy.group()) > len(lazy.group()):
+            match = greedy
+            base = _REPEAT_LAZY_ANCHORED.match(match.group()).group(1)
+        else:
+            match = lazy
+            base = match.group(1)
+        token = match.group()
+        base_guesses = memo.get(base)
+        if base_guesses is None:
+            base_guesses = _estimate(base, trie, reference_year, memo).guesses
+            memo[base] = base_guesses
+        matches.append(Match(
+            "repeat", match.start(), match.end() - 1, token,
+            base_guesses * (len(token) // len(base))
+        ))
+        index = match.end()
+    return matches
+
+
+def _with_minimum(match: Match, length: int) -> Match:
+    """Apply zxcvbn's minimum guesses for matches shorter than the password."""
+    if match.j - match.i + 1 >= length:
+        return match
+    minimum = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if match.i == match.j else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+    if match.guesses >= minimum:
+        return match
+    return match._replace(guesses=minimum)
+
+
+def _upper_bound(password: str, matches: List[Match]) -> int:
+    """
+    Return the cost of a sequence known to cover the password.
+    
+    Brute force alone covers it, and so does any match at the start with
+    the rest brute-forced; the cheapest of these is returned. The search
+    in _most_guessable() always finds a sequence at least as cheap.
+    """
+    n = len(password)
+    bound = BRUTEFORCE_CARDINALITY ** n + 1
+    for match in matches:
+        if match.i != 0:
+            continue
+        guesses = _with_minimum(match, n).guesses
+        if match.j == n - 1:
+            bound = min(bound, guesses + 1)
+        else:
+            rest = BRUTEFORCE_CARDINALITY ** (n - 1 - match.j)
+            bound = min(bound, 2 * guesses * rest + MIN_GUESSES_BEFORE_GROWING_SEQUENCE)
+    return bound
+
+
+def _most_guessable(password: str, matches: List[Match]) -> Estimate:
+    """
+    Find the cheapest sequence of matches covering the whole password.
+    
+    A sequence of l matches costs l! * prod(guesses) + 10000 ** (l - 1):
+    the attacker must also guess how many patterns there are and in which
+    order. Gaps between matches are filled with brute-force matches. For
+    each end position and sequence length only the cheapest candidate is
+    kept, so the search takes time proportional to the number of matches
+    times the longest sequence. Prefixes dearer than a sequence already
+    known to cover the password are dropped as soon as they appear.
+    """
+    n = len(password)
+    if n == 0:
+        return Estimate(1, 0.0, ())
+    
+    by_end = [[] for _ in range(n)]
+    for match in matches:
+        by_end[match.j].append(_with_minimum(match, n))
+    
+    # best[k][l] = (total guesses, product of guesses, last match, previous key)
+    best = [{} for _ in range(n)]
+    # l! and 10000 ** (l - 1) for every possible sequence length l
+    factorials = [1] * (n + 2)
+    penalties = [0] * (n + 2)
+    for length in range(1, n + 2):
+        factorials[length] = factorials[length - 1] * length
+        penalties[length] = MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (length - 1)
+    
+    # Brute-force guesses by span length. With a cardinality of 10 these
+    # never fall below the minimums _with_minimum() applies
+    brute = [BRUTEFORCE_CARDINALITY ** length for length in range(n + 1)]
+    # The cost of the cheapest whole sequence known so far. A sequence only
+    # gets dearer as it grows, so the search drops any prefix dearer than
+    # that at once
+    bound = _upper_bound(password, matches)
+    
+    def update(i, k, guesses, length, product, previous, match=None):
+        # Brute-force matches (match=None) are only built if they are kept
+        nonlocal bound
+        product *= guesses
+        total = factorials[length] * product + penalties[length]
+        if total > bound:
+            return
+        slot = best[k]
+        for other_length, entry in slot.items():
+            if other_length <= length and entry[0] <= total:
+                return
+        if match is None:
+            match = Match("bruteforce", i, k, password[i:k + 1], guesses)
+        elif k < n - 1:
+            # Brute-forcing the rest would complete the sequence
+            bound = min(bound, factorials[length + 1] * product * brute[n - 1 - k] + penalties[length + 1])
+        if k == n - 1:
+            bound = min(bound, total)
+        slot[length] = (total, product, match, previous)
+    
+    # For each sequence length, the end and guess product of the cheapest
+    # sequence a brute-force span can follow. Every span grows by one
+    # character per step, so the cheapest stays the cheapest and each
+    # length needs only one candidate
+    extendable = {}
+    for k in range(n):
+        for match in by_end[k]:
+            i = match.i
+            if i == 0:
+                update(0, k, match.guesses, 1, 1, None, match)
+            else:
+                for length, entry in best[i - 1].items():
+                    update(i, k, match.guesses, length + 1, entry[1], (i - 1, length), match)
+        
+        # Brute-force the span ending at k, either from the start or right
+        # after a pattern match (never directly after another brute force)
+        update(0, k, brute[k + 1], 1, 1, None)
+        for length, (end, product) in extendable.items():
+            update(end + 1, k, brute[k - end], length + 1, product, (end, length))
+        if by_end[k]:
+            for length, entry in best[k].items():
+                if entry[2].pattern == "bruteforce":
+                    continue
+                candidate = extendable.get(length)
+                if candidate is None or entry[1] < candidate[1] * BRUTEFORCE_CARDINALITY ** (k - candidate[0]):
+                    extendable[length] = (k, entry[1])
+            # A candidate with a longer sequence and a larger product than
+            # another stays so as both grow, so it can never win
+            cheapest = None
+            for length in sorted(extendable):
+                end, product = extendable[length]
+                cost = product * BRUTEFORCE_CARDINALITY ** (k - end)
+                if cheapest is not None and cost >= cheapest:
+                    del extendable[length]
+                else:
+                    cheapest = cost
+    
+    final = best[n - 1]
+    length = min(final, key=lambda l: final[l][0])
+    guesses = final[length][0]
+    
+    sequence = []
+    key = (n - 1, length)
+    while key is not None:
+        entry = best[key[0]][key[1]]
+        sequence.append(entry[2])
+        key = entry[3]
+    sequence.reverse()
+    
+    return Estimate(guesses, math.log2(guesses), tuple(sequence))
+
+
+def _estimate(
+    password: str, trie: Dict[str, object], reference_year: int, memo: Dict[str, int]
+) -> Estimate:
+    matches = _dictionary_matches(password, trie) + _spatial_matches(password) + _sequence_matches(password)
+    repeats = _repeat_matches(password, trie, reference_year, memo)
+    # Date matching is the dearest matcher, so it goes last and skips any
+    # dates the other matches already beat
+    dates = _date_matches(password, reference_year, _upper_bound(password, matches + repeats))
+    return _most_guessable(password, matches + dates + repeats)
+
+
+def estimate(
+    password: str,
+    user_words: Optional[Iterable[str]] = None,
+    reference_year: Optional[int] = None
+) -> Estimate:
+    """
+    Estimate how many guesses an attacker needs to find a password.
+    
+    Args:
+        password (str): The password to estimate.
+        user_words (Iterable[str], optional): Extra words to treat as the
+            most common dictionary entries, such as the user's name or the
+            site name. Defaults to None.
+        reference_year (int, optional): The year that dates are guessed
+            outwards from. Defaults to None (the current year).
+    
+    Returns:
+        Estimate: The guesses, the equivalent entropy in bits and the
+        cheapest decomposition of the password into patterns.
+    """
+    trie = _TRIE
+    if user_words:
+        trie = _build_trie(tuple(user_words) + _DEFAULT_WORDS)
+    if reference_year is None:
+        reference_year = time.localtime().tm_year
+    return _estimate(password, trie, reference_year, {})
+
+
+def estimate_entropy(password: str) -> float:
+    """
+    Estimate the entropy (in bits) of a password from its patterns.
+    
+    Args:
+        password (str): The password to estimate.
+    
+    Returns:
+        float: log2 of the estimated number of guesses.
+    """
+    return _estimate(password, _TRIE, time.localtime().tm_year, {}).entropy
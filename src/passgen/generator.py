@@ -2,16 +2,281 @@
 Password generation functionality for the passgen library.
 """
 
-import random
-import string
-from typing import Optional
+import bisect
+import threading
+from typing import Dict, List, Optional, Tuple, Union
 
+# The ambiguous character sets moved to .policy; re-exported for code that
+# still imports them from here
+from .policy import (  # noqa: F401
+    AMBIGUOUS_DIGITS,
+    AMBIGUOUS_LOWERCASE,
+    AMBIGUOUS_SYMBOLS,
+    AMBIGUOUS_UPPERCASE,
+)
+from .policy import PasswordPolicy, _composition_table, get_policy
+from .random_source import RandomSource, SystemRandomSource, default_source
+from .result import GeneratedPassword
 
-# Define ambiguous characters
-AMBIGUOUS_UPPERCASE = "OI"
-AMBIGUOUS_LOWERCASE = "l"
-AMBIGUOUS_DIGITS = "01"
-AMBIGUOUS_SYMBOLS = "|`'\",;:~-_=+()[]{}<>"
+# Modules only some Generator methods need, imported on first use so that
+# generate() does not pay for their tables
+_pronounceable = None
+_token = None
+
+
+def _import_pronounceable():
+    global _pronounceable
+    from . import pronounceable
+    _pronounceable = pronounceable
+    return pronounceable
+
+
+def _import_token():
+    global _token
+    from . import token
+    _token = token
+    return token
+
+
+def _validate_length(length: int) -> None:
+    """
+    Validate a requested password length.
+    
+    Args:
+        length (int): The requested password length.
+    
+    Raises:
+        ValueError: If length is less than 4 or greater than 64.
+    """
+    if length < 4:
+        raise ValueError("Password length must be at least 4 characters")
+    if length > 64:
+        raise ValueError("Password length cannot exceed 64 characters")
+
+
+def _generate_constrained(policy: PasswordPolicy, length: int, rng: RandomSource) -> str:
+    """
+    Generate a password that satisfies a policy's constraints by construction.
+    
+    The number of characters from each class is drawn with the exact weights
+    of the valid passwords, the class of each position is fixed by a
+    Fisher-Yates shuffle, and then each class's characters are drawn in one
+    bulk call. Every valid password is equally likely (before max_repeats),
+    and the work is the same on every call: there is no retry loop.
+    
+    Args:
+        policy (PasswordPolicy): A constrained policy.
+        length (int): The password length.
+        rng (RandomSource): The source of randomness.
+    
+    Returns:
+        str: The generated password.
+    
+    Raises:
+        ValueError: If length is shorter than the class minimums allow.
+    """
+    tables = _composition_table(policy, length)
+    classes = policy.classes
+    
+    # Choose how many characters come from each class
+    labels: List[int] = []
+    remaining = length
+    for index, cls in enumerate(classes):
+        cumulative = tables[index][remaining]
+        n = cls.minimum + bisect.bisect_right(cumulative, rng.randbelow(cumulative[-1]))
+        labels.extend([index] * n)
+        remaining -= n
+    rng.shuffle(labels)
+    
+    # Draw each class's characters in bulk and deal them out in label order
+    pools = [
+        iter(rng.mapped_bytes(cls.byte_table, cls.rejected_bytes, labels.count(index)).decode("ascii"))
+        for index, cls in enumerate(classes)
+    ]
+    chars = [next(pools[index]) for index in labels]
+    
+    max_repeats = policy.max_repeats
+    if max_repeats is not None:
+        run = 1
+        for i in range(1, length):
+            if chars[i] != chars[i - 1]:
+                run = 1
+            elif run < max_repeats:
+                run += 1
+            else:
+                # Redraw from the class without the repeated character, which
+                # keeps the class counts and stays uniform over the others
+                alphabet = classes[labels[i]].alphabet
+                j = rng.randbelow(len(alphabet) - 1)
+                if j >= alphabet.index(chars[i]):
+                    j += 1
+                chars[i] = alphabet[j]
+                run = 1
+    
+    return "".join(chars)
+
+
+class Generator:
+    """
+    A password generator with its own random source and compiled policies.
+    
+    A Generator never shares mutable state with other instances, so giving
+    each thread its own Generator lets threads generate passwords without
+    contention. The module-level generate() and generate_many() functions
+    use a per-thread default instance (see default_generator()).
+    
+    A single Generator is not thread-safe.
+    
+    Args:
+        rng (RandomSource, optional): The source of randomness. Defaults to
+            None (a new SystemRandomSource).
+    """
+    
+    def __init__(self, rng: Optional[RandomSource] = None):
+        self.rng = rng if rng is not None else SystemRandomSource()
+        self._policies: Dict[Tuple[bool, bool, bool, bool, bool], PasswordPolicy] = {}
+    
+    def policy(
+        self,
+        uppercase: bool = True,
+        lowercase: bool = True,
+        digits: bool = True,
+        symbols: bool = True,
+        exclude_ambiguous: bool = False
+    ) -> PasswordPolicy:
+        """
+        Return this generator's compiled policy for the given options.
+        
+        Returns:
+            PasswordPolicy: The compiled policy.
+        
+        Raises:
+            ValueError: If no character sets are selected.
+        """
+        key = (uppercase, lowercase, digits, symbols, exclude_ambiguous)
+        try:
+            return self._policies[key]
+        except KeyError:
+            policy = self._policies[key] = PasswordPolicy(*key)
+            return policy
+    
+    def generate(
+        self,
+        length: int = 12,
+        uppercase: bool = True,
+        lowercase: bool = True,
+        digits: bool = True,
+        symbols: bool = True,
+        exclude_ambiguous: bool = False,
+        policy: Optional[PasswordPolicy] = None,
+        detailed: bool = False
+    ) -> Union[str, GeneratedPassword]:
+        """
+        Generate a random password. See passgen.generate() for the arguments.
+        """
+        _validate_length(length)
+        if policy is None:
+            policy = self.policy(uppercase, lowercase, digits, symbols, exclude_ambiguous)
+        
+        if policy.constrained:
+            password = _generate_constrained(policy, length, self.rng)
+        else:
+            # Generate password
+            password = self.rng.mapped_bytes(
+                policy.byte_table, policy.rejected_bytes, length
+            ).decode("ascii")
+        
+        if detailed:
+            return GeneratedPassword(password, policy.size, policy.entropy(length), policy)
+        return password
+    
+    def generate_many(
+        self,
+        count: int,
+        length: int = 12,
+        uppercase: bool = True,
+        lowercase: bool = True,
+        digits: bool = True,
+        symbols: bool = True,
+        exclude_ambiguous: bool = False,
+        policy: Optional[PasswordPolicy] = None,
+        detailed: bool = False
+    ) -> Union[List[str], List[GeneratedPassword]]:
+        """
+        Generate many random passwords. See passgen.generate_many() for the arguments.
+        """
+        if count < 0:
+            raise ValueError("Password count cannot be negative")
+        _validate_length(length)
+        if policy is None:
+            policy = self.policy(uppercase, lowercase, digits, symbols, exclude_ambiguous)
+        
+        if policy.constrained:
+            passwords = [_generate_constrained(policy, length, self.rng) for _ in range(count)]
+        else:
+            # Draw every character for the batch at once, then slice it up
+            total = count * length
+            pool = self.rng.mapped_bytes(
+                policy.byte_table, policy.rejected_bytes, total
+            ).decode("ascii")
+            passwords = [pool[i:i + length] for i in range(0, total, length)]
+        
+        if detailed:
+            # Every password of the batch has the same entropy
+            size, entropy = policy.size, policy.entropy(length)
+            return [GeneratedPassword(password, size, entropy, policy) for password in passwords]
+        return passwords
+    
+    def generate_pronounceable(
+        self,
+        length: int = 12,
+        include_digits: bool = False,
+        include_symbols: bool = False,
+        capitalize: bool = False,
+        detailed: bool = False
+    ) -> Union[str, GeneratedPassword]:
+        """
+        Generate a pronounceable password. See passgen.generate_pronounceable()
+        for the arguments.
+        """
+        module = _pronounceable or _import_pronounceable()
+        return module.generate_pronounceable(
+            length, include_digits, include_symbols, capitalize, rng=self.rng, detailed=detailed
+        )
+    
+    def generate_token(
+        self,
+        length: int = 32,
+        encoding: str = "base64url",
+        alphabet: Optional[Union[str, PasswordPolicy]] = None
+    ) -> str:
+        """
+        Generate a random token of any length. See passgen.generate_token()
+        for the arguments.
+        """
+        module = _token or _import_token()
+        return module.generate_token(length, encoding, alphabet, rng=self.rng)
+
+
+_local = threading.local()
+
+
+def default_generator() -> Generator:
+    """
+    Return the calling thread's default Generator.
+    
+    Each thread gets its own instance, built on the thread's default random
+    source, so the module-level functions never share mutable state between
+    threads or take locks.
+    
+    Returns:
+        Generator: The thread's default generator.
+    """
+    try:
+        return _local.generator
+    except AttributeError:
+        generator = _local.generator = Generator(default_source())
+        return generator
 
 
 def generate(
@@ -20,8 +285,11 @@ def generate(
     lowercase: bool = True,
     digits: bool = True,
     symbols: bool = True,
-    exclude_ambiguous: bool = False
-) -> str:
+    exclude_ambiguous: bool = False,
+    policy: Optional[PasswordPolicy] = None,
+    rng: Optional[RandomSource] = None,
+    detailed: bool = False
+) -> Union[str, GeneratedPassword]:
     """
     Generate a random password with configurable character sets.
     
@@ -34,52 +302,88 @@ def generate(
         symbols (bool, optional): Include symbols. Defaults to True.
         exclude_ambiguous (bool, optional): Exclude ambiguous characters like
             '0', 'O', '1', 'l', 'I', etc. Defaults to False.
+        policy (PasswordPolicy, optional): A precompiled policy to use instead
+            of the individual character options. Its constraints (class
+            minimums, max_repeats) are satisfied by construction.
+            Defaults to None.
+        rng (RandomSource, optional): The source of randomness. Defaults to
+            None (the calling thread's cryptographically secure source).
+        detailed (bool, optional): Return a GeneratedPassword carrying the
+            alphabet size, exact entropy and policy instead of a string.
+            Defaults to False.
     
     Returns:
-        str: The generated password.
+        str or GeneratedPassword: The generated password.
     
     Raises:
         ValueError: If length is less than 4 or greater than 64.
         ValueError: If no character sets are selected.
+        ValueError: If length is shorter than the policy's class minimums.
     """
-    # Validate password length
-    if length < 4:
-        raise ValueError("Password length must be at least 4 characters")
-    if length > 64:
-        raise ValueError("Password length cannot exceed 64 characters")
-    
-    # Build character set based on configuration
-    chars = ""
-    
-    if uppercase:
-        if exclude_ambiguous:
-            chars += ''.join(c for c in string.ascii_uppercase if c not in AMBIGUOUS_UPPERCASE)
-        else:
-            chars += string.ascii_uppercase
-    
-    if lowercase:
-        if exclude_ambiguous:
-            chars += ''.join(c for c in string.ascii_lowercase if c not in AMBIGUOUS_LOWERCASE)
-        else:
-            chars += string.ascii_lowercase
-    
-    if digits:
-        if exclude_ambiguous:
-            chars += ''.join(c for c in string.digits if c not in AMBIGUOUS_DIGITS)
-        else:
-            chars += string.digits
+    if rng is None:
+        generator = default_generator()
+    else:
+        # A one-off generator would recompile the policy; use the shared cache
+        generator = Generator(rng)
+        if policy is None:
+            policy = get_policy(uppercase, lowercase, digits, symbols, exclude_ambiguous)
+    return generator.generate(
+        length, uppercase, lowercase, digits, symbols, exclude_ambiguous, policy, detailed
+    )
+
+
+def generate_many(
+    count: int,
+    length: int = 12,
+    uppercase: bool = True,
+    lowercase: bool = True,
+    digits: bool = True,
+    symbols: bool = True,
+    exclude_ambiguous: bool = False,
+    policy: Optional[PasswordPolicy] = None,
+    rng: Optional[RandomSource] = None,
+    detailed: bool = False
+) -> Union[List[str], List[GeneratedPassword]]:
+    """
+    Generate many random passwords in one call.
     
-    if symbols:
-        if exclude_ambiguous:
-            chars += ''.join(c for c in string.punctuation if c not in AMBIGUOUS_SYMBOLS)
-        else:
-            chars += string.punctuation
+    Accepts the same options as generate(), but validates them only once
+    and draws the random bytes for the whole batch at once. This is much
+    faster than calling generate() in a loop.
     
-    # Ensure at least one character set is selected
-    if not chars:
-        raise ValueError("At least one character set must be selected")
+    Args:
+        count (int): The number of passwords to generate.
+        length (int, optional): The length of each password.
+            Must be between 4 and 64. Defaults to 12.
+        uppercase (bool, optional): Include uppercase letters. Defaults to True.
+        lowercase (bool, optional): Include lowercase letters. Defaults to True.
+        digits (bool, optional): Include digits. Defaults to True.
+        symbols (bool, optional): Include symbols. Defaults to True.
+        exclude_ambiguous (bool, optional): Exclude ambiguous characters like
+            '0', 'O', '1', 'l', 'I', etc. Defaults to False.
+        policy (PasswordPolicy, optional): A precompiled policy to use instead
+            of the individual character options. Its constraints are
+            satisfied by construction. Defaults to None.
+        rng (RandomSource, optional): The source of randomness. Defaults to
+            None (the calling thread's cryptographically secure source).
+        detailed (bool, optional): Return GeneratedPassword objects instead
+            of strings. Defaults to False.
     
-    # Generate password
-    password = ''.join(random.choice(chars) for _ in range(length))
+    Returns:
+        List[str] or List[GeneratedPassword]: The generated passwords.
     
-    return password 
\ No newline at end of file
+    Raises:
+        ValueError: If count is negative.
+        ValueError: If length is less than 4 or greater than 64.
+        ValueError: If no character sets are selected.
+        ValueError: If length is shorter than the policy's class minimums.
+    """
+    if rng is None:
+        generator = default_generator()
+    else:
+        generator = Generator(rng)
+        if policy is None:
+            policy = get_policy(uppercase, lowercase, digits, symbols, exclude_ambiguous)
+    return generator.generate_many(
+        count, length, uppercase, lowercase, digits, symbols, exclude_ambiguous, policy, detailed
+    )
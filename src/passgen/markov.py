@@ -0,0 +1,385 @@
+"""
+Markov-chain pronounceable passwords trained from a word list.
+
+A model is trained offline with train_markov() and written to a compact
+binary file; MarkovModel maps that file into memory, so loading a model
+does no parsing and no training happens at import or load time.
+
+Letters are the symbols 1-26 ('a'-'z') and 0 marks a word boundary. A
+model of order n predicts each letter from the previous n-1 symbols; that
+context is a base-27 number, used directly as an index into the state
+tables. Every state stores an alias table of its possible next letters
+(Walker's method, in exact integer weights), so sampling a letter costs one
+random draw whatever the number of choices. When a state has no next
+letter (it was only ever seen at the end of a word) the chain restarts
+from the word-boundary state, so every password has exactly one
+derivation and its probability, and therefore its information content, is
+exact.
+
+Model file layout (all integers little-endian uint32 unless noted, S = 27
+** (order - 1) states and E alias entries):
+
+    offset 0   8 bytes   magic b"PGMARKV1"
+    offset 8   4 bytes   order
+    offset 12  4 bytes   E
+               4*(S+1)   first alias entry of each state (and the end)
+               4*S       total letter count of each state
+               4*E       alias threshold of each entry
+               4*E       letter count of each entry
+               4*E       letter | alias entry index << 8 of each entry
+               (padding to a multiple of 8)
+               8*E       -log2 probability of each entry's letter (float64)
+"""
+
+import array
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .random_source import RandomSource, default_source
+from .wordlist import read_wordlist
+
+MAGIC = b"PGMARKV1"
+HEADER_SIZE = 16
+ALPHABET_SIZE = 27
+MIN_ORDER = 2
+MAX_ORDER = 4
+DEFAULT_ORDER = 3
+
+_WORD = re.compile(r"[a-z]+")
+_TWO_64 = 1 << 64
+
+
+def _alias_table(counts: List[int]) -> Tuple[List[int], List[int]]:
+    """
+    Build an exact integer alias table for a list of positive counts.
+    
+    With k counts summing to T, picking entry i uniformly and a value r
+    uniformly from [0, T), then keeping i if r < threshold[i] and taking
+    alias[i] otherwise, yields entry j with probability counts[j] / T.
+    
+    Args:
+        counts (List[int]): The positive counts.
+    
+    Returns:
+        Tuple[List[int], List[int]]: The thresholds and alias indices.
+    """
+    k = len(counts)
+    total = sum(counts)
+    scaled = [count * k for count in counts]
+    threshold = [total] * k
+    alias = list(range(k))
+    small = [i for i in range(k) if scaled[i] < total]
+    large = [i for i in range(k) if scaled[i] >= total]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        threshold[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= total - scaled[less]
+        (small if scaled[more] < total else large).append(more)
+    return threshold, alias
+
+
+def _section_offsets(states: int, entries: int) -> Tuple[int, int, int, int, int, int, int]:
+    """Return the byte offsets of each section of a model file, and its size."""
+    offsets = HEADER_SIZE
+    totals = offsets + 4 * (states + 1)
+    thresholds = totals + 4 * states
+    counts = thresholds + 4 * entries
+    packed = counts + 4 * entries
+    bits = packed + 4 * entries
+    bits += -bits % 8
+    return offsets, totals, thresholds, counts, packed, bits, bits + 8 * entries
+
+
+def _to_le(values: array.array) -> bytes:
+    """Return the bytes of an array in little-endian order."""
+    if sys.byteorder != "little":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def train_markov(
+    wordlist: Union[str, os.PathLike, Iterable[str]],
+    model_path: Union[str, os.PathLike],
+    order: int = DEFAULT_ORDER
+) -> int:
+    """
+    Train a Markov model from a word list and write it to a model file.
+    
+    Words are lowercased and split into runs of the letters a-z; anything
+    else separates words.
+    
+    Args:
+        wordlist (str, PathLike or Iterable[str]): A newline-delimited UTF-8
+            word list file, or the words themselves.
+        model_path (str or PathLike): Where to write the model.
+        order (int, optional): The n-gram order, from 2 to 4. Defaults to 3.
+    
+    Returns:
+        int: The number of letters the model was trained on.
+    
+    Raises:
+        ValueError: If the order is out of range or the word list contains
+            no letters.
+    """
+    if not MIN_ORDER <= order <= MAX_ORDER:
+        raise ValueError("Markov order must be between %d and %d" % (MIN_ORDER, MAX_ORDER))
+    if isinstance(wordlist, (str, os.PathLike)):
+        wordlist = read_wordlist(wordlist)
+    
+    states = ALPHABET_SIZE ** (order - 1)
+    table: Dict[int, List[int]] = {}
+    letters = 0
+    for line in wordlist:
+        for word in _WORD.findall(line.lower()):
+            state = 0
+            for char in word:
+                symbol = ord(char) - 96
+                try:
+                    table[state][symbol] += 1
+                except KeyError:
+                    table[state] = [0] * ALPHABET_SIZE
+                    table[state][symbol] = 1
+                state = (state * ALPHABET_SIZE + symbol) % states
+            letters += len(word)
+    if not letters:
+        raise ValueError("The word list contains no letters to train on")
+    
+    offsets = array.array("I", [0])
+    totals = array.array("I")
+    thresholds = array.array("I")
+    counts = array.array("I")
+    packed = array.array("I")
+    bits = array.array("d")
+    for state in range(states):
+        row = table.get(state)
+        if row is not None:
+            symbols = [symbol for symbol in range(1, ALPHABET_SIZE) if row[symbol]]
+            weights = [row[symbol] for symbol in symbols]
+            total = sum(weights)
+            if total >= 1 << 32:
+                raise ValueError("Letter counts exceed the model's 32-bit limit")
+            threshold, alias = _alias_table(weights)
+            thresholds.extend(threshold)
+            counts.extend(weights)
+            packed.extend(symbol | index << 8 for symbol, index in zip(symbols, alias))
+            bits.extend(math.log2(total / weight) for weight in weights)
+            totals.append(total)
+        else:
+            totals.append(0)
+        offsets.append(len(counts))
+    
+    entries = len(counts)
+    *_, bits_offset, _size = _section_offsets(states, entries)
+    with open(model_path, "wb") as out:
+        out.write(MAGIC + struct.pack("<II", order, entries))
+        for section in (offsets, totals, thresholds, counts, packed):
+            out.write(_to_le(section))
+        out.write(b"\0" * (bits_offset - out.tell()))
+        out.write(_to_le(bits))
+    
+    return letters
+
+
+class MarkovModel:
+    """
+    A memory-mapped Markov model built by train_markov().
+    
+    Sampling reads the model's tables in place, so opening a model costs
+    the same whatever its size. Can be used as a context manager.
+    
+    Args:
+        path (str or PathLike): The model file to open.
+    
+    Raises:
+        ValueError: If the file is not a valid model.
+    
+    Attributes:
+        order (int): The n-gram order of the model.
+    """
+    
+    def __init__(self, path: Union[str, os.PathLike]):
+        with open(path, "rb") as stream:
+            header = stream.read(HEADER_SIZE)
+            if len(header) != HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+                raise ValueError("Not a passgen Markov model: %s" % (path,))
+            self.order, entries = struct.unpack("<II", header[len(MAGIC):])
+            if not MIN_ORDER <= self.order <= MAX_ORDER:
+                raise ValueError("Unsupported Markov model order: %s" % (path,))
+            self._states = ALPHABET_SIZE ** (self.order - 1)
+            sections = _section_offsets(self._states, entries)
+            if os.fstat(stream.fileno()).st_size != sections[-1]:
+                raise ValueError("Truncated Markov model: %s" % (path,))
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        # Check before any view of the map exists, since a map cannot be
+        # closed while views export its buffer
+        (first_choices,) = struct.unpack_from("<I", self._map, sections[0] + 4)
+        if first_choices == 0:
+            self._map.close()
+            raise ValueError("Markov model has no transitions: %s" % (path,))
+        
+        views = []
+        for (start, end), typecode in zip(zip(sections, sections[1:]),
+                                          ("I", "I", "I", "I", "I", "d")):
+            view = memoryview(self._map)[start:end]
+            if typecode == "d":
+                view = view[:8 * entries]
+            if sys.byteorder == "little":
+                views.append(view.cast(typecode))
+            else:
+                values = array.array(typecode, view)
+                values.byteswap()
+                views.append(values)
+        self._offsets, self._totals, self._thresholds, self._counts, self._packed, self._bits = views
+    
+    def sample(self, length: int, rng: Optional[RandomSource] = None) -> Tuple[str, float]:
+        """
+        Sample a password and its information content.
+        
+        Args:
+            length (int): The number of letters.
+            rng (RandomSource, optional): The source of randomness. Defaults
+                to None (the calling thread's cryptographically secure source).
+        
+        Returns:
+            Tuple[str, float]: The password, and -log2 of the probability
+                that the model generates it (its exact entropy in bits).
+        """
+        if rng is None:
+            rng = default_source()
+        offsets, totals, thresholds = self._offsets, self._totals, self._thresholds
+        packed, bits, states = self._packed, self._bits, self._states
+        
+        out = bytearray(length)
+        entropy = 0.0
+        state = 0
+        for i, word in enumerate(array.array("Q", rng.randbytes(8 * length))):
+            start = offsets[state]
+            choices = offsets[state + 1] - start
+            if not choices:
+                state, start, choices = 0, 0, offsets[1]
+            total = totals[state]
+            span = choices * total
+            # Redraw the rare words that would bias the reduction mod span
+            while word >= _TWO_64 - _TWO_64 % span:
+                (word,) = array.array("Q", rng.randbytes(8))
+            pick, value = divmod(word % span, total)
+            entry = start + pick
+            if value >= thresholds[entry]:
+                entry = start + (packed[entry] >> 8)
+            symbol = packed[entry] & 0xFF
+            out[i] = 96 + symbol
+            entropy += bits[entry]
+            state = (state * ALPHABET_SIZE + symbol) % states
+        return out.decode("ascii"), entropy
+    
+    def generate(self, length: int, rng: Optional[RandomSource] = None) -> str:
+        """
+        Generate a password from the model.
+        
+        Args:
+            length (int): The number of letters.
+            rng (RandomSource, optional): The source of randomness. Defaults
+                to None (the calling thread's cryptographically secure source).
+        
+        Returns:
+            str: The generated password.
+        """
+        return self.sample(length, rng)[0]
+    
+    def entropy(self, password: str) -> float:
+        """
+        Return the information content of a password under the model.
+        
+        This is -log2 of the probability that the model generates exactly
+        this password, the same value sample() reports.
+        
+        Args:
+            password (str): A password of the letters a-z.
+        
+        Returns:
+            float: The entropy in bits.
+        
+        Raises:
+            ValueError: If the model cannot generate the password.
+        """
+        offsets, packed, bits = self._offsets, self._packed, self._bits
+        entropy = 0.0
+        state = 0
+        for char in password:
+            symbol = ord(char) - 96
+            start, end = offsets[state], offsets[state + 1]
+            if start == end:
+                state, start, end = 0, 0, offsets[1]
+            for entry in range(start, end):
+                if packed[entry] & 0xFF == symbol:
+                    break
+            else:
+                raise ValueError("The model cannot generate %r" % (password,))
+            entropy += bits[entry]
+            state = (state * ALPHABET_SIZE + symbol) % self._states
+        return entropy
+    
+    def close(self) -> None:
+        """Unmap the model file."""
+        self._offsets = self._totals = self._thresholds = None
+        self._counts = self._packed = self._bits = None
+        self._map.close()
+    
+    def __enter__(self) -> "MarkovModel":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@lru_cache(maxsize=8)
+def load_model(path: str) -> MarkovModel:
+    """
+    Return a shared MarkovModel for a model file, opening it once per process.
+    
+    Args:
+        path (str): The model file.
+    
+    Returns:
+        MarkovModel: The loaded model.
+    """
+    return MarkovModel(path)
+
+
+def generate_markov(
+    model: Union[MarkovModel, str, os.PathLike],
+    length: int = 12,
+    rng: Optional[RandomSource] = None
+) -> str:
+    """
+    Generate a pronounceable password from a trained Markov model.
+    
+    Args:
+        model (MarkovModel, str or PathLike): The model, or the path of a
+            model file (opened once and shared, see load_model()).
+        length (int, optional): The length of the password to generate.
+            Must be between 4 and 64. Defaults to 12.
+        rng (RandomSource, optional): The source of randomness. Defaults to
+            None (the calling thread's cryptographically secure source).
+    
+    Returns:
+        str: The generated password.
+    
+    Raises:
+        ValueError: If length is less than 4 or greater than 64.
+    """
+    if length < 4:
+        raise ValueError("Password length must be at least 4 characters")
+    if length > 64:
+        raise ValueError("Password length cannot exceed 64 characters")
+    if not isinstance(model, MarkovModel):
+        model = load_model(os.fspath(model))
+    return model.sample(length, rng)[0]
@@ -0,0 +1,204 @@
+"""
+Incremental strength scoring for passwords being typed.
+
+A StrengthMeter keeps the per-class character counts of a password up to
+date as characters are added and removed, so scoring after a keystroke
+only classifies the characters it changed instead of the whole password.
+The text itself is a plain list of characters: appending and backspacing
+are cheap, while inserting or deleting mid-password shifts the
+characters after the edit, and reading the password joins the whole list.
+At password lengths that is fast enough that a rope or gap buffer would
+not pay off. Its labels and entropy are those of check_strength() and
+calculate_entropy() with the default "charset" engine.
+"""
+
+from typing import List
+
+from .strength import (
+    COMMON_PASSWORDS,
+    DIGITS_POOL,
+    LOWERCASE_POOL,
+    SYMBOLS_POOL,
+    UNICODE_POOL,
+    UPPERCASE_POOL,
+    CharacterProfile,
+    _CLASS_TABLE,
+    _LOG2_POOL,
+    _SPECIAL_CASES,
+    _grade,
+)
+
+# Count index of each ASCII character: 0 lowercase, 1 uppercase, 2 digit,
+# 3 symbol, -1 whitespace
+_CLASS_INDEX = tuple({108: 0, 117: 1, 100: 2, 115: 3}.get(code, -1) for code in _CLASS_TABLE[:128])
+_UNICODE = 4
+
+# Only passwords up to these lengths can be special-cased or common, so
+# longer ones never need their text looked up
+_MAX_SPECIAL_LENGTH = max(map(len, _SPECIAL_CASES))
+_MAX_COMMON_LENGTH = max(map(len, COMMON_PASSWORDS))
+
+
+class StrengthMeter:
+    """
+    A password under edit, with its strength kept up to date.
+    
+    Every edit updates the character class counts for the characters it
+    adds or removes only, and reading the strength or entropy takes
+    constant time. Appending and backspacing take time proportional to the
+    characters changed; insert() and delete() also shift the characters
+    after the edit, and reading the password builds a new string. The
+    results are always equal to check_strength(meter.password) and
+    calculate_entropy(meter.password).
+    
+    Args:
+        password (str, optional): The initial text. Defaults to "".
+    """
+    
+    def __init__(self, password: str = ""):
+        self._chars: List[str] = []
+        self._counts = [0, 0, 0, 0, 0]
+        # The label, until the next edit
+        self._strength = None
+        self.append(password)
+    
+    def _count(self, text: str, sign: int) -> None:
+        """Add (sign 1) or remove (sign -1) the class counts of text."""
+        self._strength = None
+        counts = self._counts
+        for char in text:
+            code = ord(char)
+            if code < 128:
+                index = _CLASS_INDEX[code]
+                if index >= 0:
+                    counts[index] += sign
+            else:
+                counts[_UNICODE] += sign
+                if char.isdecimal():
+                    counts[2] += sign
+                elif not char.isspace():
+                    counts[3] += sign
+    
+    def append(self, text: str) -> None:
+        """
+        Add characters at the end of the password.
+        
+        Args:
+            text (str): The characters typed.
+        """
+        self._chars.extend(text)
+        self._count(text, 1)
+    
+    def backspace(self, count: int = 1) -> None:
+        """
+        Remove characters from the end of the password.
+        
+        Args:
+            count (int, optional): The number of characters to remove; more
+                than the length clears the password. Defaults to 1.
+        
+        Raises:
+            ValueError: If count is negative.
+        """
+        if count < 0:
+            raise ValueError("Character count cannot be negative")
+        if count:
+            self.delete(max(len(self._chars) - count, 0), count)
+    
+    def insert(self, index: int, text: str) -> None:
+        """
+        Insert characters before a position, as when typing mid-password.
+        
+        Takes time proportional to the length of the password, since the
+        characters after the position move up.
+        
+        Args:
+            index (int): The position, clamped to the password like
+                list.insert().
+            text (str): The characters typed.
+        """
+        self._chars[index:index] = text
+        self._count(text, 1)
+    
+    def delete(self, index: int, count: int = 1) -> None:
+        """
+        Remove characters starting at a position.
+        
+        Takes time proportional to the length of the password, since the
+        characters after the removed ones move down.
+        
+        Args:
+            index (int): The position of the first character to remove.
+            count (int, optional): The number of characters to remove; fewer
+                are removed at the end of the password. Defaults to 1.
+        
+        Raises:
+            ValueError: If count is negative.
+        """
+        if count < 0:
+            raise ValueError("Character count cannot be negative")
+        if index < 0:
+            index = max(index + len(self._chars), 0)
+        removed = self._chars[index:index + count]
+        del self._chars[index:index + count]
+        self._count(removed, -1)
+    
+    def clear(self) -> None:
+        """Remove the whole password."""
+        self._chars.clear()
+        self._counts = [0, 0, 0, 0, 0]
+        self._strength = None
+    
+    def __len__(self) -> int:
+        return len(self._chars)
+    
+    @property
+    def password(self) -> str:
+        """str: The current text, joined from the characters on every read."""
+        return "".join(self._chars)
+    
+    @property
+    def profile(self) -> CharacterProfile:
+        """CharacterProfile: The class counts, as classify() would return them."""
+        return CharacterProfile(len(self._chars), *self._counts)
+    
+    @property
+    def entropy(self) -> float:
+        """float: The entropy in bits, as calculate_entropy() would return it."""
+        lowercase, uppercase, digits, symbols, unicode = self._counts
+        pool = (
+            (LOWERCASE_POOL if lowercase else 0)
+            + (UPPERCASE_POOL if uppercase else 0)
+            + (DIGITS_POOL if digits else 0)
+            + (SYMBOLS_POOL if symbols else 0)
+            + (UNICODE_POOL if unicode else 0)
+        )
+        return len(self._chars) * _LOG2_POOL[pool] if self._chars else 0.0
+    
+    @property
+    def strength(self) -> str:
+        """str: "Weak", "Medium", or "Strong", as check_strength() would return."""
+        if self._strength is None:
+            self._strength = self._grade()
+        return self._strength
+    
+    def _grade(self) -> str:
+        """Work out the label of the current password."""
+        length = len(self._chars)
+        if length <= _MAX_SPECIAL_LENGTH:
+            password = "".join(self._chars)
+            if password in _SPECIAL_CASES:
+                return _SPECIAL_CASES[password]
+        if length >= 64:
+            return "Strong"
+        if length < 4:
+            return "Weak"
+        if length <= _MAX_COMMON_LENGTH and "".join(self._chars).lower() in COMMON_PASSWORDS:
+            return "Weak"
+        lowercase, uppercase, digits, symbols, _ = self._counts
+        classes = (lowercase > 0) + (uppercase > 0) + (digits > 0) + (symbols > 0)
+        return _grade(length, classes, self.entropy)
+    
+    def __repr__(self) -> str:
+        # Never show the password itself
+        return "StrengthMeter(length=%d, strength=%r)" % (len(self._chars), self.strength)
@@ -0,0 +1,555 @@
+"""
+Opt-in instrumentation of the main passgen entry points.
+
+enable() swaps the instrumented functions for timed wrappers that count
+calls, errors and the options used and record latency (and, for batch
+functions, batch size) in fixed-bucket histograms. disable() puts the
+original functions back, so while metrics are off the library runs
+exactly the code it would without this module: there is no flag to test
+and no wrapper to call.
+
+The recorded data is available as a dict from snapshot(), as Prometheus
+text from to_prometheus(), or over HTTP from serve().
+
+Only the outermost instrumented call is recorded: when check_strength()
+calls calculate_entropy(), for example, one check_strength() call is
+counted and no calculate_entropy() call.
+
+Generator methods are patched on the class, so every generate() and
+generate_many() call is seen. The other functions are patched in their
+modules and in the passgen package; a reference taken with
+"from passgen import check_strength" before enable() keeps pointing at
+the uninstrumented function, so enable metrics at startup or call through
+the passgen module.
+"""
+
+import functools
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+from . import generator, pronounceable, strength
+
+# Upper bounds of the latency histogram buckets, in seconds; a final
+# bucket holds everything slower
+LATENCY_BUCKETS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+# Upper bounds of the batch size histogram buckets
+BATCH_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+# Latency bounds in integer nanoseconds, to compare with perf_counter_ns()
+_LATENCY_BOUNDS_NS = tuple(round(bound * 1e9) for bound in LATENCY_BUCKETS)
+
+# Marks parameters without a default value
+_REQUIRED = object()
+
+
+class Histogram:
+    """
+    A histogram with fixed bucket bounds.
+    
+    The counts live in a preallocated array, so observing a value never
+    allocates. Bucket i counts values v with bounds[i-1] < v <= bounds[i];
+    the last bucket counts values above every bound.
+    
+    Args:
+        bounds (Sequence): The ascending upper bounds of the buckets.
+    """
+    
+    __slots__ = ("bounds", "counts", "total")
+    
+    def __init__(self, bounds: Sequence):
+        self.bounds = tuple(bounds)
+        self.counts = array("Q", bytes(8 * (len(self.bounds) + 1)))
+        self.total = 0
+    
+    def observe(self, value) -> None:
+        """Count a value. Not thread-safe; each thread needs its own histogram."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+    
+    def add(self, other: "Histogram", sign: int = 1) -> None:
+        """Add (or with sign=-1, subtract) the counts of another histogram."""
+        counts = self.counts
+        for i, count in enumerate(other.counts):
+            counts[i] += sign * count
+        self.total += sign * other.total
+    
+    def reset(self) -> None:
+        """Zero every bucket."""
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.total = 0
+
+
+class _Shard:
+    """
+    One thread's share of the metrics of a function.
+    
+    Only the owning thread writes to a shard, so recording takes no lock.
+    Shards are also used to hold totals.
+    """
+    
+    __slots__ = (
+        "calls", "errors", "options", "latency", "batch_size",
+        "last_args", "last_options",
+    )
+    
+    def __init__(self, batch: bool):
+        self.calls = 0
+        self.errors = 0
+        self.options: Dict[str, int] = {}
+        self.latency = Histogram(_LATENCY_BOUNDS_NS)
+        self.batch_size = Histogram(BATCH_BUCKETS) if batch else None
+        # The optional positional arguments of the thread's last call, and
+        # the names of those that were not defaults
+        self.last_args: Tuple[object, ...] = ()
+        self.last_options: Tuple[str, ...] = ()
+    
+    def add(self, other: "_Shard", sign: int = 1) -> None:
+        """Add (or with sign=-1, subtract) the counts of another shard."""
+        self.calls += sign * other.calls
+        self.errors += sign * other.errors
+        options = self.options
+        for name, count in other.options.items():
+            options[name] = options.get(name, 0) + sign * count
+        self.latency.add(other.latency, sign)
+        if self.batch_size is not None:
+            self.batch_size.add(other.batch_size, sign)
+
+
+class _ThreadExit:
+    """
+    Queues a thread's shard when the thread ends.
+    
+    Kept in the thread's local storage, so it is garbage collected when the
+    thread ends. deque.append() is atomic, so no lock is taken here: the
+    finalizer may run while another thread, or this one, holds the owner's
+    lock.
+    """
+    
+    __slots__ = ("queue", "shard")
+    
+    def __init__(self, queue: "deque[_Shard]", shard: _Shard):
+        self.queue = queue
+        self.shard = shard
+    
+    def __del__(self):
+        self.queue.append(self.shard)
+
+
+class FunctionMetrics:
+    """
+    The metrics recorded for one instrumented function.
+    
+    Like the generators, recording is lock-free per thread: every thread
+    records into its own shard, and to_dict() adds the shards up. reset()
+    does not touch the shards either; it remembers the totals at that point
+    and to_dict() subtracts them.
+    
+    Args:
+        name (str): The function name.
+        batch (bool, optional): Whether the function returns a batch whose
+            size is recorded. Defaults to False.
+    """
+    
+    def __init__(self, name: str, batch: bool = False):
+        self.name = name
+        self.batch = batch
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # The shards of live threads, the shards of threads that have ended
+        # but are not yet folded into the counts of ended threads, and the
+        # totals at the last reset()
+        self._shards: Set[_Shard] = set()
+        self._ended: "deque[_Shard]" = deque()
+        self._retired = _Shard(batch)
+        self._base = _Shard(batch)
+        self._required = 0
+        self._optional: Tuple[str, ...] = ()
+        self._defaults: Dict[str, object] = {}
+    
+    def bind(self, func: Callable) -> None:
+        """Learn the positional parameters and defaults of the function."""
+        code = func.__code__
+        names = code.co_varnames[:code.co_argcount]
+        defaults = func.__defaults__ or ()
+        self._required = len(names) - len(defaults)
+        self._optional = names[self._required:]
+        self._defaults = dict(zip(self._optional, defaults))
+    
+    def _new_shard(self) -> _Shard:
+        """Create and register the calling thread's shard."""
+        shard = _Shard(self.batch)
+        with self._lock:
+            self._retire_ended()
+            self._shards.add(shard)
+        self._local.shard = shard
+        self._local.exit = _ThreadExit(self._ended, shard)
+        return shard
+    
+    def _retire_ended(self) -> None:
+        """Fold the shards of threads that have ended into the totals. Lock held."""
+        ended = self._ended
+        while ended:
+            shard = ended.popleft()
+            self._retired.add(shard)
+            self._shards.discard(shard)
+    
+    def record(
+        self,
+        elapsed: int,
+        args: Sequence[object],
+        kwargs: Mapping[str, object],
+        size: Optional[int],
+        error: bool = False
+    ) -> None:
+        """
+        Record one call in the calling thread's shard.
+        
+        Args:
+            elapsed (int): The duration of the call, in nanoseconds.
+            args (Sequence[object]): The positional arguments of the call.
+            kwargs (Mapping[str, object]): The keyword arguments of the call.
+            size (int or None): The number of results, for batch functions.
+            error (bool, optional): Whether the call raised. Defaults to False.
+        """
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard.calls += 1
+        if error:
+            shard.errors += 1
+        latency = shard.latency
+        latency.counts[bisect_left(latency.bounds, elapsed)] += 1
+        latency.total += elapsed
+        if size is not None:
+            shard.batch_size.observe(size)
+        
+        # Callers tend to repeat the same options, so the result for the
+        # previous optional positional arguments is reused when they match.
+        # Required arguments (passwords) are never kept.
+        optional = args[self._required:]
+        if optional != shard.last_args:
+            defaults = self._defaults
+            shard.last_args = optional
+            shard.last_options = tuple(
+                name for name, value in zip(self._optional, optional)
+                if value != defaults[name]
+            )
+        options = shard.options
+        for name in shard.last_options:
+            options[name] = options.get(name, 0) + 1
+        if kwargs:
+            defaults = self._defaults
+            for name, value in kwargs.items():
+                default = defaults.get(name, _REQUIRED)
+                if default is not _REQUIRED and value != default:
+                    options[name] = options.get(name, 0) + 1
+    
+    def _totals(self) -> _Shard:
+        """Add up the retired and live shards. Lock held."""
+        self._retire_ended()
+        totals = _Shard(self.batch)
+        totals.add(self._retired)
+        for shard in self._shards:
+            totals.add(shard)
+        return totals
+    
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._base = self._totals()
+    
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Return the metrics as a JSON-serializable dict.
+        
+        Calls that are in the middle of being recorded by other threads may
+        be missing from some of the values.
+        
+        Returns:
+            Dict[str, object]: The call and error counts, the number of
+            calls passing a non-default value for each option, and
+            histograms (bucket bounds, per-bucket counts, count and sum;
+            latencies in seconds).
+        """
+        with self._lock:
+            totals = self._totals()
+            totals.add(self._base, -1)
+        options = dict.fromkeys(self._defaults, 0)
+        options.update(totals.options)
+        data = {
+            "calls": totals.calls,
+            "errors": totals.errors,
+            "options": options,
+            "latency": {
+                "bounds": list(LATENCY_BUCKETS),
+                "counts": list(totals.latency.counts),
+                "count": sum(totals.latency.counts),
+                "sum": totals.latency.total / 1e9,
+            },
+        }
+        if totals.batch_size is not None:
+            data["batch_size"] = {
+                "bounds": list(BATCH_BUCKETS),
+                "counts": list(totals.batch_size.counts),
+                "count": sum(totals.batch_size.counts),
+                "sum": totals.batch_size.total,
+            }
+        return data
+
+
+# The instrumented functions: metric name, whether the result is a batch,
+# and the (owner, attribute) bindings to patch, where an owner of None is
+# the passgen package; the first binding holds the original function
+_TARGETS: Tuple[Tuple[str, bool, Tuple[Tuple[object, str], ...]], ...] = (
+    ("generate", False, ((generator.Generator, "generate"),)),
+    ("generate_many", True, ((generator.Generator, "generate_many"),)),
+    ("generate_pronounceable", False, (
+        (pronounceable, "generate_pronounceable"),
+        (None, "generate_pronounceable"),
+    )),
+    ("calculate_entropy", False, (
+        (strength, "calculate_entropy"),
+        (None, "calculate_entropy"),
+    )),
+    ("check_strength", False, (
+        (strength, "check_strength"),
+        (None, "check_strength"),
+    )),
+    ("calculate_entropy_many", True, (
+        (strength, "calculate_entropy_many"),
+        (None, "calculate_entropy_many"),
+    )),
+    ("check_strength_many", True, (
+        (strength, "check_strength_many"),
+        (None, "check_strength_many"),
+    )),
+)
+
+METRICS: Dict[str, FunctionMetrics] = {
+    name: FunctionMetrics(name, batch) for name, batch, _ in _TARGETS
+}
+
+_lock = threading.Lock()
+_originals: Dict[str, Callable] = {}
+_wrappers: Dict[str, Callable] = {}
+
+
+class _CallState(threading.local):
+    """Whether the thread is inside an instrumented function."""
+    
+    active = False
+
+
+_state = _CallState()
+
+
+def _owner(owner: object) -> object:
+    """Resolve a binding owner, None being the passgen package."""
+    return sys.modules[__package__] if owner is None else owner
+
+
+def _instrument(func: Callable, metrics: FunctionMetrics, batch: bool) -> Callable:
+    """Return a wrapper of func that records its calls in metrics."""
+    clock = time.perf_counter_ns
+    record = metrics.record
+    metrics.bind(func)
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        state = _state
+        if state.active:
+            # Made by another instrumented function, whose call already
+            # accounts for it
+            return func(*args, **kwargs)
+        state.active = True
+        start = clock()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            record(clock() - start, args, kwargs, None, True)
+            raise
+        finally:
+            state.active = False
+        record(clock() - start, args, kwargs, len(result) if batch else None)
+        return result
+    
+    return wrapper
+
+
+def enable() -> None:
+    """
+    Start recording metrics by installing the instrumented functions.
+    
+    Calling it again while metrics are enabled does nothing.
+    """
+    with _lock:
+        if _wrappers:
+            return
+        for name, batch, bindings in _TARGETS:
+            owner, attribute = bindings[0]
+            original = getattr(owner, attribute)
+            wrapper = _instrument(original, METRICS[name], batch)
+            for owner, attribute in bindings:
+                owner = _owner(owner)
+                # Leave bindings that someone else has replaced alone
+                if getattr(owner, attribute, None) is original:
+                    setattr(owner, attribute, wrapper)
+            _originals[name] = original
+            _wrappers[name] = wrapper
+
+
+def disable() -> None:
+    """
+    Stop recording metrics by restoring the original functions.
+    
+    The metrics recorded so far are kept; see reset().
+    """
+    with _lock:
+        for name, _, bindings in _TARGETS:
+            wrapper = _wrappers.pop(name, None)
+            if wrapper is None:
+                continue
+            original = _originals.pop(name)
+            for owner, attribute in bindings:
+                owner = _owner(owner)
+                if getattr(owner, attribute, None) is wrapper:
+                    setattr(owner, attribute, original)
+
+
+def is_enabled() -> bool:
+    """Return whether metrics are being recorded."""
+    return bool(_wrappers)
+
+
+def reset() -> None:
+    """Forget every metric recorded so far."""
+    for metrics in METRICS.values():
+        metrics.reset()
+
+
+def snapshot() -> Dict[str, object]:
+    """
+    Return the recorded metrics as a JSON-serializable dict.
+    
+    Returns:
+        Dict[str, object]: {"enabled": bool, "functions": {name: metrics}},
+        with each function's metrics as described in FunctionMetrics.to_dict().
+    """
+    return {
+        "enabled": is_enabled(),
+        "functions": {name: metrics.to_dict() for name, metrics in METRICS.items()},
+    }
+
+
+def _histogram_lines(
+    metric: str,
+    labels: str,
+    bounds: Sequence[float],
+    data: Mapping[str, object]
+) -> List[str]:
+    """Format a histogram from a snapshot as Prometheus sample lines."""
+    lines = []
+    cumulative = 0
+    for bound, count in zip(bounds, data["counts"]):
+        cumulative += count
+        lines.append('%s_bucket{%s,le="%g"} %d' % (metric, labels, bound, cumulative))
+    lines.append('%s_bucket{%s,le="+Inf"} %d' % (metric, labels, data["count"]))
+    lines.append("%s_sum{%s} %s" % (metric, labels, data["sum"]))
+    lines.append("%s_count{%s} %d" % (metric, labels, data["count"]))
+    return lines
+
+
+def to_prometheus() -> str:
+    """
+    Return the recorded metrics in the Prometheus text exposition format.
+    
+    Returns:
+        str: The passgen_calls_total, passgen_errors_total and
+        passgen_option_calls_total counters and the
+        passgen_call_duration_seconds and passgen_batch_size histograms,
+        labelled by function.
+    """
+    functions = snapshot()["functions"]
+    calls = [
+        "# HELP passgen_calls_total Calls to instrumented passgen functions.",
+        "# TYPE passgen_calls_total counter",
+    ]
+    errors = [
+        "# HELP passgen_errors_total Calls to instrumented passgen functions that raised.",
+        "# TYPE passgen_errors_total counter",
+    ]
+    options = [
+        "# HELP passgen_option_calls_total Calls that passed a non-default value for an option.",
+        "# TYPE passgen_option_calls_total counter",
+    ]
+    durations = [
+        "# HELP passgen_call_duration_seconds Time spent in passgen functions.",
+        "# TYPE passgen_call_duration_seconds histogram",
+    ]
+    batches = [
+        "# HELP passgen_batch_size Results returned per batch call.",
+        "# TYPE passgen_batch_size histogram",
+    ]
+    for name, data in functions.items():
+        labels = 'function="%s"' % name
+        calls.append("passgen_calls_total{%s} %d" % (labels, data["calls"]))
+        errors.append("passgen_errors_total{%s} %d" % (labels, data["errors"]))
+        for option, count in sorted(data["options"].items()):
+            options.append('passgen_option_calls_total{%s,option="%s"} %d' % (labels, option, count))
+        durations += _histogram_lines(
+            "passgen_call_duration_seconds", labels, LATENCY_BUCKETS, data["latency"]
+        )
+        if "batch_size" in data:
+            batches += _histogram_lines(
+                "passgen_batch_size", labels, BATCH_BUCKETS, data["batch_size"]
+            )
+    return "\n".join(calls + errors + options + durations + batches) + "\n"
+
+
+def serve(port: int = 9464, host: str = "127.0.0.1"):
+    """
+    Serve to_prometheus() over HTTP from a background thread.
+    
+    Every GET request is answered with the current metrics, so the server
+    can be scraped at any path (conventionally /metrics). The server only
+    listens on the loopback interface unless told otherwise.
+    
+    Args:
+        port (int, optional): The port to listen on, or 0 for any free port.
+            Defaults to 9464.
+        host (str, optional): The address to bind. Defaults to "127.0.0.1".
+    
+    Returns:
+        http.server.ThreadingHTTPServer: The running server; its
+        server_address holds the bound port, and shutdown() stops it.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="passgen-metrics", daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,227 @@
+"""
+Diceware-style passphrases drawn from memory-mapped word lists.
+
+A word list is compiled once with build_wordlist() into an indexed file:
+a table of offsets followed by the words themselves. Wordlist maps that
+file into memory, so opening even a list of millions of words does no
+parsing, and fetching the i-th word is a constant-time slice.
+
+Word list file layout (all integers little-endian):
+
+    offset 0   8 bytes   magic b"PGWORDS1"
+    offset 8   8 bytes   number of words n (uint64)
+    offset 16  8*(n+1)   offset of each word within the data, and its end (uint64)
+               ...       the UTF-8 words, back to back
+"""
+
+import mmap
+import os
+import re
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+from .random_source import RandomSource, default_source
+from .wordlist import read_wordlist
+
+MAGIC = b"PGWORDS1"
+HEADER_SIZE = 16
+OFFSET_SIZE = 8
+
+DEFAULT_WORDS = 6
+DEFAULT_SEPARATOR = "-"
+
+# Numbered diceware lines, such as "11111<TAB>abacus" in the EFF lists
+_DICE_PREFIX = re.compile(r"^[1-6]+\s+")
+
+
+def _wordlist_words(wordlist: Iterable[str]) -> Iterator[str]:
+    """Yield the words of a list, without dice numbers, blanks or duplicates."""
+    seen = set()
+    for line in wordlist:
+        word = _DICE_PREFIX.sub("", line.strip(), count=1)
+        if word and word not in seen:
+            seen.add(word)
+            yield word
+
+
+def build_wordlist(
+    wordlist: Union[str, os.PathLike, Iterable[str]],
+    path: Union[str, os.PathLike]
+) -> int:
+    """
+    Compile a word list into an indexed file for Wordlist.
+    
+    Blank lines and repeated words are dropped, since a repeated word would
+    be picked more often than the others. Lines numbered with dice rolls, as
+    in the EFF lists, have the numbers removed.
+    
+    Args:
+        wordlist (str, PathLike or Iterable[str]): A newline-delimited UTF-8
+            word list file, or the words themselves.
+        path (str or PathLike): Where to write the compiled list.
+    
+    Returns:
+        int: The number of distinct words in the compiled list.
+    
+    Raises:
+        ValueError: If the word list has no words.
+    """
+    if isinstance(wordlist, (str, os.PathLike)):
+        wordlist = read_wordlist(wordlist)
+    
+    offsets = array("Q", [0])
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.TemporaryFile(dir=directory) as data:
+        pending, size = [], 0
+        for word in _wordlist_words(wordlist):
+            encoded = word.encode("utf-8", "surrogatepass")
+            size += len(encoded)
+            offsets.append(size)
+            pending.append(encoded)
+            if len(pending) >= 8192:
+                data.write(b"".join(pending))
+                pending = []
+        data.write(b"".join(pending))
+        
+        count = len(offsets) - 1
+        if not count:
+            raise ValueError("The word list contains no words")
+        if offsets.itemsize != OFFSET_SIZE:
+            raise ValueError("Unsupported platform: 64-bit offsets are not 8 bytes")
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        
+        data.seek(0)
+        with open(path, "wb") as out:
+            out.write(MAGIC + struct.pack("<Q", count))
+            out.write(offsets.tobytes())
+            shutil.copyfileobj(data, out)
+    
+    return count
+
+
+class Wordlist:
+    """
+    A memory-mapped word list built by build_wordlist().
+    
+    Supports len() and constant-time indexing. Can be used as a context
+    manager.
+    
+    Args:
+        path (str or PathLike): The compiled word list to open.
+    
+    Raises:
+        ValueError: If the file is not a valid compiled word list.
+    """
+    
+    def __init__(self, path: Union[str, os.PathLike]):
+        with open(path, "rb") as stream:
+            header = stream.read(HEADER_SIZE)
+            if len(header) != HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+                raise ValueError("Not a passgen word list: %s" % (path,))
+            (self._count,) = struct.unpack("<Q", header[len(MAGIC):])
+            self._data = HEADER_SIZE + (self._count + 1) * OFFSET_SIZE
+            size = os.fstat(stream.fileno()).st_size
+            if not self._count or size < self._data:
+                raise ValueError("Truncated word list: %s" % (path,))
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        (end,) = struct.unpack_from("<Q", self._map, self._data - OFFSET_SIZE)
+        if size != self._data + end:
+            self._map.close()
+            raise ValueError("Truncated word list: %s" % (path,))
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Word list index out of range")
+        start, end = struct.unpack_from("<QQ", self._map, HEADER_SIZE + index * OFFSET_SIZE)
+        return self._map[self._data + start:self._data + end].decode("utf-8", "surrogatepass")
+    
+    def close(self) -> None:
+        """Unmap the word list file."""
+        self._map.close()
+    
+    def __enter__(self) -> "Wordlist":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@lru_cache(maxsize=8)
+def load_wordlist(path: str) -> Wordlist:
+    """
+    Return a shared Wordlist for a compiled file, opening it once per process.
+    
+    Args:
+        path (str): The compiled word list.
+    
+    Returns:
+        Wordlist: The opened word list.
+    """
+    return Wordlist(path)
+
+
+def generate_passphrase(
+    wordlist: Union[Wordlist, Sequence[str], str, os.PathLike],
+    words: int = DEFAULT_WORDS,
+    separator: str = DEFAULT_SEPARATOR,
+    capitalize: bool = False,
+    include_digit: bool = False,
+    rng: Optional[RandomSource] = None
+) -> str:
+    """
+    Generate a passphrase of random words.
+    
+    Every word is drawn uniformly and independently, so the passphrase has
+    exactly passgen.strength.passphrase_entropy(words, len(wordlist),
+    include_digit) bits of entropy. Capitalization is applied to every word
+    and adds no entropy.
+    
+    Args:
+        wordlist (Wordlist, Sequence[str], str or PathLike): The words to
+            draw from: an open Wordlist, an in-memory sequence of distinct
+            words, or the path of a compiled word list (opened once and
+            shared, see load_wordlist()).
+        words (int, optional): The number of words. Defaults to 6.
+        separator (str, optional): The text between words. Defaults to "-".
+        capitalize (bool, optional): Capitalize the first letter of every
+            word. Defaults to False.
+        include_digit (bool, optional): Append a random digit to a random
+            word. Defaults to False.
+        rng (RandomSource, optional): The source of randomness. Defaults to
+            None (the calling thread's cryptographically secure source).
+    
+    Returns:
+        str: The generated passphrase.
+    
+    Raises:
+        ValueError: If words is less than 1 or the word list is empty.
+    """
+    if words < 1:
+        raise ValueError("A passphrase must have at least 1 word")
+    if isinstance(wordlist, (str, os.PathLike)):
+        wordlist = load_wordlist(os.fspath(wordlist))
+    size = len(wordlist)
+    if not size:
+        raise ValueError("The word list is empty")
+    if rng is None:
+        rng = default_source()
+    
+    chosen = [wordlist[rng.randbelow(size)] for _ in range(words)]
+    if capitalize:
+        chosen = [word[:1].upper() + word[1:] for word in chosen]
+    if include_digit:
+        pos = rng.randbelow(words)
+        chosen[pos] += str(rng.randbelow(10))
+    
+    return separator.join(chosen)
@@ -0,0 +1,360 @@
+"""
+Compiled password policies for the passgen library.
+
+A PasswordPolicy holds everything generate() needs to know about a set of
+character options, computed once: the alphabet, its size and a byte lookup
+table for mapping random bytes to characters in bulk.
+
+A policy may also carry constraints (a minimum number of characters from
+each class, a maximum run of repeated characters, forbidden characters).
+Passwords are built to satisfy them rather than generated until they do.
+"""
+
+import math
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
+
+
+# The character classes, as in string.ascii_uppercase and friends;
+# spelled out so that importing the policy does not import string and re
+UPPERCASE = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+LOWERCASE = "abcdefghijklmnopqrstuvwxyz"
+DIGITS = "0123456789"
+SYMBOLS = "!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"
+
+# Define ambiguous characters
+AMBIGUOUS_UPPERCASE = "OI"
+AMBIGUOUS_LOWERCASE = "l"
+AMBIGUOUS_DIGITS = "01"
+AMBIGUOUS_SYMBOLS = "|`'\",;:~-_=+()[]{}<>"
+
+
+def _filtered(chars: str, ambiguous: str, exclude_ambiguous: bool, forbidden: str = "") -> str:
+    """Return chars, minus the ambiguous ones if requested and the forbidden ones."""
+    if exclude_ambiguous:
+        chars = ''.join(c for c in chars if c not in ambiguous)
+    if forbidden:
+        chars = ''.join(c for c in chars if c not in forbidden)
+    return chars
+
+
+def _byte_table(chars: str) -> Tuple[bytes, bytes]:
+    """Return the bytes.translate() table and rejected bytes for an alphabet."""
+    size = len(chars)
+    limit = 256 - (256 % size)
+    encoded = chars.encode("ascii")
+    return (
+        bytes(encoded[b % size] if b < limit else 0 for b in range(256)),
+        bytes(range(limit, 256)),
+    )
+
+
+class CharacterClass(NamedTuple):
+    """
+    One enabled character class of a policy.
+    
+    Attributes:
+        name (str): "uppercase", "lowercase", "digits" or "symbols".
+        alphabet (str): The class's characters, after exclusions.
+        minimum (int): The minimum number of characters required from it.
+        byte_table (bytes): A bytes.translate() table for the class alphabet.
+        rejected_bytes (bytes): The byte values to discard for the class.
+    """
+    name: str
+    alphabet: str
+    minimum: int
+    byte_table: bytes
+    rejected_bytes: bytes
+
+
+class PasswordPolicy:
+    """
+    An immutable, hashable set of character options for password generation.
+    
+    Policies with the same options compare and hash equal. Use get_policy()
+    to obtain a shared, cached instance instead of constructing one per call.
+    
+    Attributes:
+        uppercase (bool): Whether uppercase letters are included.
+        lowercase (bool): Whether lowercase letters are included.
+        digits (bool): Whether digits are included.
+        symbols (bool): Whether symbols are included.
+        exclude_ambiguous (bool): Whether ambiguous characters are excluded.
+        alphabet (str): The characters a password may be drawn from.
+        size (int): The number of characters in the alphabet.
+        byte_table (bytes): A 256-entry bytes.translate() table mapping a
+            random byte to an alphabet character.
+        rejected_bytes (bytes): The byte values that must be discarded to
+            keep the byte-to-character mapping free of modulo bias.
+        min_uppercase, min_lowercase, min_digits, min_symbols (int): The
+            minimum number of characters required from each class.
+        max_repeats (int or None): The longest allowed run of one repeated
+            character, or None for no limit.
+        forbidden (str): Characters never used, sorted.
+        classes (Tuple[CharacterClass, ...]): The enabled, non-empty classes.
+        constrained (bool): Whether generation must enforce a minimum or
+            max_repeats (forbidden characters only shrink the alphabet).
+    """
+    
+    __slots__ = (
+        "uppercase", "lowercase", "digits", "symbols", "exclude_ambiguous",
+        "min_uppercase", "min_lowercase", "min_digits", "min_symbols",
+        "max_repeats", "forbidden",
+        "alphabet", "size", "byte_table", "rejected_bytes", "classes",
+        "constrained", "_key",
+    )
+    
+    def __init__(
+        self,
+        uppercase: bool = True,
+        lowercase: bool = True,
+        digits: bool = True,
+        symbols: bool = True,
+        exclude_ambiguous: bool = False,
+        min_uppercase: int = 0,
+        min_lowercase: int = 0,
+        min_digits: int = 0,
+        min_symbols: int = 0,
+        max_repeats: Optional[int] = None,
+        forbidden: str = ""
+    ):
+        """
+        Compile a policy for the given character options and constraints.
+        
+        Raises:
+            ValueError: If no character sets are selected, or every selected
+                character is forbidden.
+            ValueError: If a minimum is negative or applies to a class that
+                is disabled or has no characters left.
+            ValueError: If max_repeats is less than 1, or a class has fewer
+                than 2 characters so runs could not be broken.
+        """
+        forbidden = "".join(sorted(set(forbidden)))
+        specs = (
+            ("uppercase", uppercase, UPPERCASE, AMBIGUOUS_UPPERCASE, min_uppercase),
+            ("lowercase", lowercase, LOWERCASE, AMBIGUOUS_LOWERCASE, min_lowercase),
+            ("digits", digits, DIGITS, AMBIGUOUS_DIGITS, min_digits),
+            ("symbols", symbols, SYMBOLS, AMBIGUOUS_SYMBOLS, min_symbols),
+        )
+        
+        classes = []
+        for name, enabled, chars, ambiguous, minimum in specs:
+            if minimum < 0:
+                raise ValueError("Minimum %s count cannot be negative" % name)
+            chars = _filtered(chars, ambiguous, exclude_ambiguous, forbidden) if enabled else ""
+            if not chars:
+                if minimum:
+                    raise ValueError("Minimum %s count requires %s characters" % (name, name))
+                continue
+            classes.append(CharacterClass(name, chars, int(minimum), *_byte_table(chars)))
+        chars = "".join(cls.alphabet for cls in classes)
+        
+        # Ensure at least one character set is selected
+        if not chars:
+            if uppercase or lowercase or digits or symbols:
+                raise ValueError("Every selected character is forbidden")
+            raise ValueError("At least one character set must be selected")
+        
+        if max_repeats is not None:
+            if max_repeats < 1:
+                raise ValueError("max_repeats must be at least 1")
+            if any(len(cls.alphabet) < 2 for cls in classes):
+                raise ValueError("max_repeats requires at least 2 characters in every class")
+            max_repeats = int(max_repeats)
+        
+        byte_table, rejected_bytes = _byte_table(chars)
+        
+        set_ = object.__setattr__
+        set_(self, "uppercase", bool(uppercase))
+        set_(self, "lowercase", bool(lowercase))
+        set_(self, "digits", bool(digits))
+        set_(self, "symbols", bool(symbols))
+        set_(self, "exclude_ambiguous", bool(exclude_ambiguous))
+        set_(self, "min_uppercase", int(min_uppercase))
+        set_(self, "min_lowercase", int(min_lowercase))
+        set_(self, "min_digits", int(min_digits))
+        set_(self, "min_symbols", int(min_symbols))
+        set_(self, "max_repeats", max_repeats)
+        set_(self, "forbidden", forbidden)
+        set_(self, "alphabet", chars)
+        set_(self, "size", len(chars))
+        set_(self, "byte_table", byte_table)
+        set_(self, "rejected_bytes", rejected_bytes)
+        set_(self, "classes", tuple(classes))
+        set_(self, "constrained", max_repeats is not None or any(cls.minimum for cls in classes))
+        set_(self, "_key", (self.uppercase, self.lowercase, self.digits,
+                            self.symbols, self.exclude_ambiguous,
+                            self.min_uppercase, self.min_lowercase, self.min_digits,
+                            self.min_symbols, self.max_repeats, self.forbidden))
+    
+    @property
+    def key(self) -> tuple:
+        """tuple: The options and constraints identifying this policy."""
+        return self._key
+    
+    @property
+    def min_length(self) -> int:
+        """int: The shortest password that can satisfy the class minimums."""
+        return sum(cls.minimum for cls in self.classes)
+    
+    def entropy(self, length: int) -> float:
+        """
+        Return the entropy (in bits) of a password generated with this policy.
+        
+        Without constraints this is length * log2(size). With class minimums
+        it is log2 of the number of passwords that satisfy them, since those
+        are generated uniformly. Limiting repeats removes some choices, so
+        with max_repeats the result is a lower bound.
+        
+        Args:
+            length (int): The password length.
+        
+        Returns:
+            float: The entropy in bits.
+        
+        Raises:
+            ValueError: If length is shorter than the class minimums allow.
+        """
+        if not self.constrained:
+            return length * math.log2(self.size)
+        bits = _log2(_composition_table(self, length)[0][length][-1])
+        if self.max_repeats is not None:
+            # A run can only be broken once every max_repeats positions, and
+            # breaking it removes one of k choices at that position
+            smallest = min(len(cls.alphabet) for cls in self.classes)
+            bits -= (length - 1) // self.max_repeats * math.log2(smallest / (smallest - 1))
+        return bits
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("PasswordPolicy objects are immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("PasswordPolicy objects are immutable")
+    
+    def __eq__(self, other):
+        if not isinstance(other, PasswordPolicy):
+            return NotImplemented
+        return self._key == other._key
+    
+    def __hash__(self):
+        return hash(self._key)
+    
+    def __repr__(self):
+        text = (
+            "PasswordPolicy(uppercase={}, lowercase={}, digits={}, symbols={}, "
+            "exclude_ambiguous={}".format(*self._key)
+        )
+        for name in ("min_uppercase", "min_lowercase", "min_digits", "min_symbols"):
+            if getattr(self, name):
+                text += ", {}={}".format(name, getattr(self, name))
+        if self.max_repeats is not None:
+            text += ", max_repeats={}".format(self.max_repeats)
+        if self.forbidden:
+            text += ", forbidden={!r}".format(self.forbidden)
+        return text + ")"
+    
+    def __reduce__(self):
+        return (get_policy, self._key)
+
+
+def _log2(n: int) -> float:
+    """Return log2 of a positive integer too large for a float."""
+    shift = max(n.bit_length() - 64, 0)
+    return math.log2(n >> shift) + shift
+
+
+def _binomial(n: int, k: int) -> int:
+    """Return n choose k (math.comb needs Python 3.8)."""
+    return math.factorial(n) // (math.factorial(k) * math.factorial(n - k))
+
+
+@lru_cache(maxsize=64)
+def _composition_table(policy: PasswordPolicy, length: int) -> List[List[List[int]]]:
+    """
+    Count the passwords that satisfy a policy's class minimums.
+    
+    Entry [i][t] holds cumulative counts for choosing how many of t
+    remaining positions go to class i (starting from its minimum), with the
+    rest filled by classes i+1, ... under their own minimums. The last
+    entry of [0][length] is the total number of valid passwords, and the
+    generator samples class counts from these weights one class at a time.
+    
+    Raises:
+        ValueError: If length is shorter than the class minimums allow.
+    """
+    if length < policy.min_length:
+        raise ValueError(
+            "Password length must be at least %d to satisfy the policy minimums"
+            % policy.min_length
+        )
+    # counts[t]: ways to fill t positions with the classes after class i
+    counts = [1] + [0] * length
+    tables: List[List[List[int]]] = []
+    for cls in reversed(policy.classes):
+        size = len(cls.alphabet)
+        table = []
+        for t in range(length + 1):
+            cumulative, total = [], 0
+            for n in range(cls.minimum, t + 1):
+                total += _binomial(t, n) * size ** n * counts[t - n]
+                cumulative.append(total)
+            table.append(cumulative)
+        tables.append(table)
+        counts = [table[t][-1] if table[t] else 0 for t in range(length + 1)]
+    tables.reverse()
+    return tables
+
+
+@lru_cache(maxsize=128)
+def _cached_policy(*key):
+    return PasswordPolicy(*key)
+
+
+def get_policy(
+    uppercase: bool = True,
+    lowercase: bool = True,
+    digits: bool = True,
+    symbols: bool = True,
+    exclude_ambiguous: bool = False,
+    min_uppercase: int = 0,
+    min_lowercase: int = 0,
+    min_digits: int = 0,
+    min_symbols: int = 0,
+    max_repeats: Optional[int] = None,
+    forbidden: str = ""
+) -> PasswordPolicy:
+    """
+    Return the shared compiled policy for the given options and constraints.
+    
+    Policies are cached, so each combination in use is compiled at most
+    once per process.
+    
+    Args:
+        uppercase (bool, optional): Include uppercase letters. Defaults to True.
+        lowercase (bool, optional): Include lowercase letters. Defaults to True.
+        digits (bool, optional): Include digits. Defaults to True.
+        symbols (bool, optional): Include symbols. Defaults to True.
+        exclude_ambiguous (bool, optional): Exclude ambiguous characters.
+            Defaults to False.
+        min_uppercase (int, optional): Minimum number of uppercase letters.
+            Defaults to 0.
+        min_lowercase (int, optional): Minimum number of lowercase letters.
+            Defaults to 0.
+        min_digits (int, optional): Minimum number of digits. Defaults to 0.
+        min_symbols (int, optional): Minimum number of symbols. Defaults to 0.
+        max_repeats (int, optional): The longest allowed run of one repeated
+            character. Defaults to None (no limit).
+        forbidden (str, optional): Characters never to use. Defaults to "".
+    
+    Returns:
+        PasswordPolicy: The compiled policy.
+    
+    Raises:
+        ValueError: If no character sets are selected, or the constraints
+            are invalid (see PasswordPolicy).
+    """
+    return _cached_policy(bool(uppercase), bool(lowercase), bool(digits),
+                          bool(symbols), bool(exclude_ambiguous),
+                          int(min_uppercase), int(min_lowercase), int(min_digits),
+                          int(min_symbols), None if max_repeats is None else int(max_repeats),
+                          "".join(sorted(set(forbidden))))
@@ -2,9 +2,14 @@
 Pronounceable password generation functionality.
 """
 
-import random
-import string
-from typing import List, Optional
+import array
+import bisect
+import math
+from itertools import product
+from typing import Dict, List, Optional, Tuple, Union
+
+from .random_source import RandomSource, default_source
+from .result import GeneratedPassword
 
 # Common consonants and vowels for English language
 CONSONANTS = "bcdfghjklmnpqrstvwxz"
@@ -22,113 +27,219 @@ COMMON_SYLLABLES = [
     "ta", "te", "th", "ti", "to", "tr", "un", "ve", "vi", "wa", "wi"
 ]
 
+# Probability (in tenths) of using a common syllable instead of a pattern
+COMMON_SYLLABLE_TENTHS = 7
+
+DIGITS = b"0123456789"
+SYMBOLS = b"!@#$%^&*()-_=+[]{}|;:,.<>/?"
+
+# The longest syllable, which bounds how far a password buffer can overrun
+_MAX_SYLLABLE = max(len(pattern) for pattern in SYLLABLE_PATTERNS)
 
-def _generate_syllable() -> str:
+
+def _syllable_table() -> Tuple[List[bytes], List[int]]:
     """
-    Generate a random pronounceable syllable.
+    Expand every syllable the generator can produce, with cumulative weights.
+    
+    A common syllable is chosen 70% of the time, uniformly; otherwise a
+    pattern is chosen uniformly and each of its letters uniformly from its
+    class. Every expansion of every pattern is listed here with that exact
+    probability as an integer weight (reduced by their common divisor to
+    keep the total small), so one random draw and a binary search pick a
+    syllable.
     
     Returns:
-        str: A pronounceable syllable.
+        Tuple[List[bytes], List[int]]: The syllables and their cumulative
+            weights; the last weight is the total.
     """
-    # 70% of the time use a common syllable, 30% generate a new one
-    if random.random() < 0.7:
-        return random.choice(COMMON_SYLLABLES)
+    letters = {"C": CONSONANTS, "V": VOWELS}
+    expansions = {
+        pattern: ["".join(chars) for chars in product(*(letters[c] for c in pattern))]
+        for pattern in SYLLABLE_PATTERNS
+    }
     
-    # Generate a syllable based on patterns
-    pattern = random.choice(SYLLABLE_PATTERNS)
-    syllable = ""
+    # Scale the weights so all of them are integers
+    scale = 1
+    for syllables in expansions.values():
+        size = len(syllables)
+        scale = scale * size // math.gcd(scale, size)
+    common = len(COMMON_SYLLABLES)
+    patterns = len(SYLLABLE_PATTERNS)
+    weighted = [
+        (syllable, COMMON_SYLLABLE_TENTHS * patterns * scale)
+        for syllable in COMMON_SYLLABLES
+    ]
+    for expanded in expansions.values():
+        weight = (10 - COMMON_SYLLABLE_TENTHS) * common * scale // len(expanded)
+        weighted.extend((syllable, weight) for syllable in expanded)
+    divisor = 0
+    for _, weight in weighted:
+        divisor = math.gcd(divisor, weight)
     
-    for char_type in pattern:
-        if char_type == "C":
-            syllable += random.choice(CONSONANTS)
-        elif char_type == "V":
-            syllable += random.choice(VOWELS)
-    
-    return syllable
+    syllables, cumulative, total = [], [], 0
+    for syllable, weight in weighted:
+        total += weight // divisor
+        syllables.append(syllable.encode("ascii"))
+        cumulative.append(total)
+    return syllables, cumulative
+
+
+_SYLLABLES, _CUMULATIVE = _syllable_table()
+_TOTAL_WEIGHT = _CUMULATIVE[-1]
+
+# Random words are drawn in bulk and reduced modulo the total weight; the
+# few words at or above the largest multiple of the total are rejected to
+# avoid modulo bias
+_WORD_SIZE = array.array("I").itemsize
+_WORD_LIMIT = (256 ** _WORD_SIZE // _TOTAL_WEIGHT) * _TOTAL_WEIGHT
 
 
-def _add_digit(password: str) -> str:
+def _syllable_probabilities() -> Tuple[Dict[bytes, float], Dict[bytes, float]]:
     """
-    Add a random digit to the password, preserving the overall length.
+    Return the probability of each syllable, and of each syllable prefix.
     
-    Args:
-        password (str): The password to modify.
-    
-    Returns:
-        str: The password with a digit added.
+    The prefix table maps every prefix of every syllable (including the
+    whole syllable) to the probability that a drawn syllable starts with it.
     """
-    if not password:
-        return password
-    
-    # Choose a random position
-    pos = random.randint(0, len(password) - 1)
-    
-    # Replace the character at that position with a digit
-    chars = list(password)
-    chars[pos] = random.choice(string.digits)
+    whole: Dict[bytes, float] = {}
+    prefixes: Dict[bytes, float] = {}
+    previous = 0
+    for syllable, cumulative in zip(_SYLLABLES, _CUMULATIVE):
+        probability = (cumulative - previous) / _TOTAL_WEIGHT
+        previous = cumulative
+        whole[syllable] = whole.get(syllable, 0.0) + probability
+        for end in range(1, len(syllable) + 1):
+            prefixes[syllable[:end]] = prefixes.get(syllable[:end], 0.0) + probability
+    return whole, prefixes
+
+
+_SYLLABLE_PROBABILITY, _PREFIX_PROBABILITY = _syllable_probabilities()
+_LOWERCASE = [bytes([c]) for c in range(97, 123)]
+
+
+def _window_probability(letters: List[Optional[bytes]], table: Dict[bytes, float]) -> float:
+    """Sum a probability table over a window, where None matches any letter."""
+    if None not in letters:
+        return table.get(b"".join(letters), 0.0)
+    options = [_LOWERCASE if letter is None else (letter,) for letter in letters]
+    return sum(table.get(b"".join(choice), 0.0) for choice in product(*options))
+
+
+def _syllables_probability(letters: List[Optional[bytes]]) -> float:
+    """
+    Return the probability that the syllable stage produces these letters.
     
-    return ''.join(chars)
+    A string can usually be split into syllables in more than one way, so
+    this sums over every split: f[i] is the probability that whole syllables
+    fill exactly the first i letters, and the last syllable may run past
+    the end (it is trimmed). Replaced letters are None and match anything.
+    """
+    length = len(letters)
+    f = [1.0] + [0.0] * length
+    for i in range(2, length):
+        for size in (2, 3):
+            if i >= size and f[i - size]:
+                f[i] += f[i - size] * _window_probability(letters[i - size:i], _SYLLABLE_PROBABILITY)
+    return sum(
+        f[start] * _window_probability(letters[start:], _PREFIX_PROBABILITY)
+        for start in range(max(0, length - _MAX_SYLLABLE), length)
+        if f[start]
+    )
 
 
-def _add_symbol(password: str) -> str:
+def _pronounceable_entropy(password: str, num_digits: int, num_symbols: int, capitalize: bool) -> float:
     """
-    Add a random symbol to the password, preserving the overall length.
+    Return -log2 of the probability that generate_pronounceable() produces a password.
     
     Args:
-        password (str): The password to modify.
+        password (str): A password produced with the given options.
+        num_digits (int): The number of letters replaced by digits.
+        num_symbols (int): The number of letters replaced by symbols.
+        capitalize (bool): Whether letters were capitalized.
     
     Returns:
-        str: The password with a symbol added.
+        float: The entropy in bits, or infinity if the password cannot be
+            produced with these options.
     """
-    if not password:
-        return password
+    length = len(password)
+    letters = [
+        password[i].lower().encode("ascii") if password[i].isalpha() else None
+        for i in range(length)
+    ]
+    probability = _syllables_probability(letters)
+    if not probability:
+        return math.inf
+    bits = -math.log2(probability)
     
-    # Choose a random position
-    pos = random.randint(0, len(password) - 1)
+    replaced = num_digits + num_symbols
+    if replaced:
+        # An ordered sample of positions, the first num_digits for digits
+        orderings = math.factorial(num_digits) * math.factorial(num_symbols)
+        bits += math.log2(math.factorial(length) // math.factorial(length - replaced) // orderings)
+        bits += num_digits * math.log2(len(DIGITS)) + num_symbols * math.log2(len(SYMBOLS))
+    if capitalize:
+        remaining = length - replaced
+        chosen = max(1, int(remaining * 0.3))
+        bits += math.log2(math.factorial(remaining) // (math.factorial(chosen) * math.factorial(remaining - chosen)))
+    return bits
+
+
+def _fill_syllables(buffer: bytearray, length: int, rng: RandomSource) -> None:
+    """
+    Fill the first length bytes of a buffer with random syllables.
     
-    # Replace the character at that position with a symbol
-    chars = list(password)
-    chars[pos] = random.choice("!@#$%^&*()-_=+[]{}|;:,.<>/?")
+    The buffer must have room for a syllable starting at any position
+    before length; bytes past length are left over and dropped by the caller.
     
-    return ''.join(chars)
+    Args:
+        buffer (bytearray): The buffer to fill.
+        length (int): The number of bytes that must be filled.
+        rng (RandomSource): The source of randomness.
+    """
+    syllables, cumulative, total = _SYLLABLES, _CUMULATIVE, _TOTAL_WEIGHT
+    limit, find = _WORD_LIMIT, bisect.bisect_right
+    # Syllables are at least 2 letters long, so this many words are almost
+    # always enough; draw another batch in the rare case they are not
+    words = length // 2 + 2
+    pos = 0
+    while pos < length:
+        for value in array.array("I", rng.randbytes(words * _WORD_SIZE)):
+            if value >= limit:
+                continue
+            syllable = syllables[find(cumulative, value % total)]
+            end = pos + len(syllable)
+            buffer[pos:end] = syllable
+            pos = end
+            if pos >= length:
+                break
 
 
-def _capitalize(password: str) -> str:
+def _capitalize(buffer: bytearray, rng: RandomSource) -> None:
     """
-    Capitalize some characters in the password.
+    Capitalize around 30% of the letters (but at least 1) of a buffer in place.
     
     Args:
-        password (str): The password to modify.
-    
-    Returns:
-        str: The password with some characters capitalized.
+        buffer (bytearray): The password being built.
+        rng (RandomSource): The source of randomness.
     """
-    if not password:
-        return password
-    
-    # Capitalize around 30% of the letters (but at least 1)
-    chars = list(password)
-    letter_positions = [i for i, c in enumerate(chars) if c.isalpha()]
-    
+    letter_positions = [i for i, c in enumerate(buffer) if 97 <= c <= 122]
     if not letter_positions:
-        return password
+        return
     
     # Determine how many characters to capitalize
     num_to_capitalize = max(1, int(len(letter_positions) * 0.3))
-    positions_to_capitalize = random.sample(letter_positions, num_to_capitalize)
-    
-    for pos in positions_to_capitalize:
-        chars[pos] = chars[pos].upper()
-    
-    return ''.join(chars)
+    for pos in rng.sample(letter_positions, num_to_capitalize):
+        buffer[pos] -= 32
 
 
 def generate_pronounceable(
     length: int = 12,
     include_digits: bool = False,
     include_symbols: bool = False,
-    capitalize: bool = False
-) -> str:
+    capitalize: bool = False,
+    rng: Optional[RandomSource] = None,
+    detailed: bool = False
+) -> Union[str, GeneratedPassword]:
     """
     Generate a pronounceable password.
     
@@ -138,9 +249,13 @@ def generate_pronounceable(
         include_digits (bool, optional): Include digits. Defaults to False.
         include_symbols (bool, optional): Include symbols. Defaults to False.
         capitalize (bool, optional): Capitalize some characters. Defaults to False.
+        rng (RandomSource, optional): The source of randomness. Defaults to
+            None (the calling thread's cryptographically secure source).
+        detailed (bool, optional): Return a GeneratedPassword with the exact
+            entropy of this password instead of a string. Defaults to False.
     
     Returns:
-        str: The generated pronounceable password.
+        str or GeneratedPassword: The generated pronounceable password.
     
     Raises:
         ValueError: If length is less than 4 or greater than 64.
@@ -151,30 +266,38 @@ def generate_pronounceable(
     if length > 64:
         raise ValueError("Password length cannot exceed 64 characters")
     
-    # Generate syllables until we have enough characters
-    password = ""
-    while len(password) < length:
-        password += _generate_syllable()
-    
-    # Trim to exact length
-    password = password[:length]
+    if rng is None:
+        rng = default_source()
     
-    # Add digit(s) if requested
-    if include_digits:
-        # Add 1-3 digits depending on password length
-        num_digits = min(max(1, length // 8), 3)
-        for _ in range(num_digits):
-            password = _add_digit(password)
+    # Build the password in one buffer, with room for the last syllable to
+    # overrun, then trim to the exact length
+    buffer = bytearray(length + _MAX_SYLLABLE - 1)
+    _fill_syllables(buffer, length, rng)
+    del buffer[length:]
     
-    # Add symbol(s) if requested
-    if include_symbols:
-        # Add 1-2 symbols depending on password length
-        num_symbols = min(max(1, length // 12), 2)
-        for _ in range(num_symbols):
-            password = _add_symbol(password)
+    # Replace 1-3 letters with digits and 1-2 with symbols, depending on the
+    # length, at distinct positions so none overwrites another
+    num_digits = min(max(1, length // 8), 3) if include_digits else 0
+    num_symbols = min(max(1, length // 12), 2) if include_symbols else 0
+    if num_digits or num_symbols:
+        positions = rng.sample(range(length), num_digits + num_symbols)
+        for pos in positions[:num_digits]:
+            buffer[pos] = rng.choice(DIGITS)
+        for pos in positions[num_digits:]:
+            buffer[pos] = rng.choice(SYMBOLS)
     
     # Capitalize if requested
     if capitalize:
-        password = _capitalize(password)
+        _capitalize(buffer, rng)
     
-    return password 
\ No newline at end of file
+    password = buffer.decode("ascii")
+    if detailed:
+        alphabet_size = (
+            len(CONSONANTS) + len(VOWELS)
+            + (len(CONSONANTS) + len(VOWELS) if capitalize else 0)
+            + (len(DIGITS) if num_digits else 0)
+            + (len(SYMBOLS) if num_symbols else 0)
+        )
+        entropy = _pronounceable_entropy(password, num_digits, num_symbols, capitalize)
+        return GeneratedPassword(password, alphabet_size, entropy)
+    return password
@@ -0,0 +1,245 @@
+"""
+Pluggable random sources for password generation.
+
+A RandomSource hands out random bytes from an internal buffer that is
+refilled in large blocks, and derives everything else (unbiased integers
+below a bound, choices, samples, shuffles and bulk character draws) from
+those bytes. The default SystemRandomSource reads the operating system's
+CSPRNG; SeededRandomSource is deterministic, for reproducible tests and
+benchmarks.
+"""
+
+import os
+import random
+import threading
+import weakref
+from typing import List, MutableSequence, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# Number of random bytes fetched per refill of a source's buffer
+DEFAULT_BUFFER_SIZE = 4096
+
+
+class RandomSource:
+    """
+    Base class for buffered random sources.
+    
+    Subclasses only implement _fill(). Instances are not thread-safe; use
+    one source per thread (default_source() does this automatically).
+    
+    Args:
+        buffer_size (int, optional): The number of bytes fetched per refill.
+            Defaults to DEFAULT_BUFFER_SIZE.
+    """
+    
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        if buffer_size < 1:
+            raise ValueError("Buffer size must be at least 1 byte")
+        self.buffer_size = buffer_size
+        self._buffer = b""
+        self._pos = 0
+    
+    def _fill(self, n: int) -> bytes:
+        """Return n fresh random bytes."""
+        raise NotImplementedError
+    
+    def randbytes(self, n: int) -> bytes:
+        """
+        Return n random bytes.
+        
+        Args:
+            n (int): The number of bytes.
+        
+        Returns:
+            bytes: The random bytes.
+        """
+        pos = self._pos
+        end = pos + n
+        if end <= len(self._buffer):
+            self._pos = end
+            return self._buffer[pos:end]
+        rest = self._buffer[pos:]
+        needed = n - len(rest)
+        if needed >= self.buffer_size:
+            # Serve large requests directly rather than growing the buffer
+            self._buffer = b""
+            self._pos = 0
+            return rest + self._fill(needed)
+        self._buffer = self._fill(self.buffer_size)
+        self._pos = needed
+        return rest + self._buffer[:needed]
+    
+    def randbelow(self, n: int) -> int:
+        """
+        Return a uniformly random integer in [0, n).
+        
+        Uses rejection sampling, so the result has no modulo bias.
+        
+        Args:
+            n (int): The exclusive upper bound; must be positive.
+        
+        Returns:
+            int: The random integer.
+        
+        Raises:
+            ValueError: If n is not positive.
+        """
+        if n <= 0:
+            raise ValueError("Upper bound must be positive")
+        if n <= 256:
+            limit = 256 - 256 % n
+            while True:
+                value = self.randbytes(1)[0]
+                if value < limit:
+                    return value % n
+        bits = (n - 1).bit_length()
+        size = (bits + 7) // 8
+        mask = (1 << bits) - 1
+        while True:
+            value = int.from_bytes(self.randbytes(size), "big") & mask
+            if value < n:
+                return value
+    
+    def randint(self, a: int, b: int) -> int:
+        """Return a uniformly random integer in [a, b]."""
+        return a + self.randbelow(b - a + 1)
+    
+    def random(self) -> float:
+        """Return a uniformly random float in [0.0, 1.0) with 53 bits of precision."""
+        return (int.from_bytes(self.randbytes(7), "big") >> 3) * (1.0 / (1 << 53))
+    
+    def choice(self, seq: Sequence[T]) -> T:
+        """
+        Return a uniformly random element of a non-empty sequence.
+        
+        Raises:
+            IndexError: If seq is empty.
+        """
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[self.randbelow(len(seq))]
+    
+    def shuffle(self, items: MutableSequence) -> None:
+        """Shuffle a mutable sequence in place (Fisher-Yates)."""
+        for i in range(len(items) - 1, 0, -1):
+            j = self.randbelow(i + 1)
+            items[i], items[j] = items[j], items[i]
+    
+    def sample(self, population: Sequence[T], k: int) -> List[T]:
+        """
+        Return k distinct elements chosen from population.
+        
+        Raises:
+            ValueError: If k is negative or larger than the population.
+        """
+        n = len(population)
+        if not 0 <= k <= n:
+            raise ValueError("Sample larger than population or is negative")
+        pool = list(population)
+        for i in range(k):
+            j = i + self.randbelow(n - i)
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+    
+    def mapped_bytes(self, table: bytes, rejected: bytes, count: int) -> bytes:
+        """
+        Draw count random bytes mapped through a translation table.
+        
+        Random bytes are passed through bytes.translate(table, rejected), so
+        the bytes listed in rejected are discarded and more are drawn until
+        count remain. This is how alphabets are sampled in bulk without
+        modulo bias (see PasswordPolicy.byte_table).
+        
+        Args:
+            table (bytes): A 256-byte translation table.
+            rejected (bytes): The byte values to discard.
+            count (int): The number of bytes to return.
+        
+        Returns:
+            bytes: count mapped bytes.
+        """
+        out = self.randbytes(count).translate(table, rejected)
+        while len(out) < count:
+            # Draw enough extra bytes that one more round usually suffices
+            extra = (count - len(out)) * 2 + 8
+            out += self.randbytes(extra).translate(table, rejected)
+        return out[:count]
+
+
+# Every live SystemRandomSource, so forked children can drop their buffers
+_system_sources = weakref.WeakSet()
+
+
+class SystemRandomSource(RandomSource):
+    """
+    A cryptographically secure source reading os.urandom() in blocks.
+    
+    Buffered bytes are discarded in a child process after os.fork(), so a
+    parent and child never hand out the same randomness. For the same
+    reason a source is pickled without its buffer: the copy unpickled in
+    another process is a fresh, empty source.
+    
+    Args:
+        buffer_size (int, optional): The number of bytes fetched per refill.
+            Defaults to DEFAULT_BUFFER_SIZE.
+    """
+    
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        super().__init__(buffer_size)
+        _system_sources.add(self)
+    
+    def __reduce__(self):
+        return (type(self), (self.buffer_size,))
+    
+    def _fill(self, n: int) -> bytes:
+        return os.urandom(n)
+
+
+def _discard_buffers_after_fork() -> None:
+    for source in list(_system_sources):
+        source._buffer = b""
+        source._pos = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_discard_buffers_after_fork)
+
+
+class SeededRandomSource(RandomSource):
+    """
+    A deterministic source, for reproducible tests and benchmarks.
+    
+    Never use a seeded source to generate real credentials.
+    
+    Args:
+        seed (int, str or bytes): The seed; equal seeds give equal output.
+        buffer_size (int, optional): The number of bytes fetched per refill.
+            Defaults to DEFAULT_BUFFER_SIZE.
+    """
+    
+    def __init__(self, seed, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        super().__init__(buffer_size)
+        self._random = random.Random(seed)
+    
+    def _fill(self, n: int) -> bytes:
+        return self._random.getrandbits(n * 8).to_bytes(n, "little")
+
+
+_local = threading.local()
+
+
+def default_source() -> RandomSource:
+    """
+    Return the calling thread's default SystemRandomSource.
+    
+    Each thread gets its own source, so buffers are never shared.
+    
+    Returns:
+        RandomSource: The thread's default source.
+    """
+    try:
+        return _local.source
+    except AttributeError:
+        source = _local.source = SystemRandomSource()
+        return source
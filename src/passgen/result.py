@@ -0,0 +1,64 @@
+"""
+Generation results that carry what the generator knows about a password.
+"""
+
+from typing import Optional
+
+from .policy import PasswordPolicy
+
+
+class GeneratedPassword:
+    """
+    A generated password with its exact entropy.
+    
+    Returned instead of a plain string when a generator is called with
+    detailed=True. The entropy is computed from the generator's own
+    choices, so it is exact where calculate_entropy() can only guess the
+    alphabet from the characters it sees.
+    
+    Attributes:
+        password (str): The generated password.
+        alphabet_size (int): The number of distinct characters the
+            generator could have used.
+        entropy (float): -log2 of the probability that the generator
+            produces this password, in bits. For uniform generators such as
+            generate() this is the same for every password and equals the
+            generator's entropy (a lower bound for policies with max_repeats,
+            see PasswordPolicy.entropy()).
+        policy (PasswordPolicy or None): The policy used by generate(), or
+            None for other generators.
+    """
+    
+    __slots__ = ("password", "alphabet_size", "entropy", "policy")
+    
+    def __init__(
+        self,
+        password: str,
+        alphabet_size: int,
+        entropy: float,
+        policy: Optional[PasswordPolicy] = None
+    ):
+        self.password = password
+        self.alphabet_size = alphabet_size
+        self.entropy = entropy
+        self.policy = policy
+    
+    def __str__(self) -> str:
+        return self.password
+    
+    def __repr__(self) -> str:
+        return "GeneratedPassword(password=%r, alphabet_size=%d, entropy=%.2f, policy=%r)" % (
+            self.password, self.alphabet_size, self.entropy, self.policy
+        )
+    
+    def __eq__(self, other):
+        if not isinstance(other, GeneratedPassword):
+            return NotImplemented
+        return (
+            self.password == other.password
+            and self.alphabet_size == other.alphabet_size
+            and self.entropy == other.entropy
+            and self.policy == other.policy
+        )
+    
+    __hash__ = None
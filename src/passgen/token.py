@@ -0,0 +1,163 @@
+"""
+Long random secrets and tokens.
+
+Unlike generate(), tokens have no length cap, so they suit API keys, HMAC
+secrets and recovery codes. The random bytes for a token are drawn in one
+call and turned into text by a single C-level encode or translate, so the
+cost is linear in the length of the token.
+"""
+
+import base64
+import binascii
+import math
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+from .policy import PasswordPolicy
+from .random_source import RandomSource, default_source
+
+# Alphabets of the supported token encodings
+HEX_ALPHABET = "0123456789abcdef"
+BASE32_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BASE64URL_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+
+ENCODINGS = {
+    "hex": HEX_ALPHABET,
+    "base32": BASE32_ALPHABET,
+    "base58": BASE58_ALPHABET,
+    "base64url": BASE64URL_ALPHABET,
+}
+
+# Bits carried per character by the encodings that C-level codecs produce
+# directly from random bytes. base64.b32encode() is implemented in Python,
+# so base32 goes through the translate path instead (32 divides 256, so no
+# bytes are rejected).
+_CODEC_BITS = {"hex": 4, "base64url": 6}
+
+
+@lru_cache(maxsize=64)
+def _alphabet_table(alphabet: str) -> Tuple[bytes, bytes]:
+    """
+    Compile an alphabet into a bytes.translate() table and rejected bytes.
+    
+    Raises:
+        ValueError: If the alphabet is empty, too long, repeats characters or
+            is not ASCII.
+    """
+    if not alphabet:
+        raise ValueError("Token alphabet cannot be empty")
+    if len(alphabet) > 256 or not alphabet.isascii():
+        raise ValueError("Token alphabet must be at most 256 ASCII characters")
+    if len(set(alphabet)) != len(alphabet):
+        raise ValueError("Token alphabet cannot repeat characters")
+    size = len(alphabet)
+    limit = 256 - (256 % size)
+    encoded = alphabet.encode("ascii")
+    table = bytes(encoded[b % size] if b < limit else 0 for b in range(256))
+    return table, bytes(range(limit, 256))
+
+
+def _check_encoding(encoding: str) -> None:
+    """
+    Reject unknown encoding names.
+    
+    Raises:
+        ValueError: If encoding is not in ENCODINGS.
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(
+            "Unknown token encoding %r; expected one of %s"
+            % (encoding, ", ".join(sorted(ENCODINGS)))
+        )
+
+
+def _encode(data: bytes, encoding: str) -> bytes:
+    """Encode random bytes with a stdlib codec, without padding."""
+    if encoding == "hex":
+        return binascii.hexlify(data)
+    return base64.urlsafe_b64encode(data)
+
+
+def token_entropy(
+    length: int,
+    encoding: str = "base64url",
+    alphabet: Optional[Union[str, PasswordPolicy]] = None
+) -> float:
+    """
+    Return the exact entropy (in bits) of a token.
+    
+    Args:
+        length (int): The length of the token in characters.
+        encoding (str, optional): The token encoding. Defaults to "base64url".
+        alphabet (str or PasswordPolicy, optional): A custom alphabet, as for
+            generate_token(). Defaults to None.
+    
+    Returns:
+        float: length * log2(alphabet size).
+    
+    Raises:
+        ValueError: If length is negative, the encoding is unknown, or the
+            alphabet is invalid.
+    """
+    if length < 0:
+        raise ValueError("Token length cannot be negative")
+    if alphabet is None:
+        _check_encoding(encoding)
+        alphabet = ENCODINGS[encoding]
+    elif isinstance(alphabet, PasswordPolicy):
+        alphabet = alphabet.alphabet
+    else:
+        _alphabet_table(alphabet)
+    return length * math.log2(len(alphabet))
+
+
+def generate_token(
+    length: int = 32,
+    encoding: str = "base64url",
+    alphabet: Optional[Union[str, PasswordPolicy]] = None,
+    rng: Optional[RandomSource] = None
+) -> str:
+    """
+    Generate a random token of any length.
+    
+    Every character is drawn uniformly and independently from the encoding's
+    alphabet. Hex and base64url tokens are produced by encoding random bytes
+    directly; the other alphabets map random bytes to characters with
+    rejection sampling, so they are also free of bias.
+    
+    Args:
+        length (int, optional): The length of the token in characters.
+            Must be at least 1. Defaults to 32.
+        encoding (str, optional): "hex", "base32", "base58" or "base64url".
+            Defaults to "base64url".
+        alphabet (str or PasswordPolicy, optional): A custom alphabet of
+            unique ASCII characters, or a policy whose alphabet to use
+            (for example to generate very long passwords). Overrides
+            encoding. Defaults to None.
+        rng (RandomSource, optional): The source of randomness. Defaults to
+            None (the calling thread's cryptographically secure source).
+    
+    Returns:
+        str: The generated token.
+    
+    Raises:
+        ValueError: If length is less than 1, the encoding is unknown, or the
+            alphabet is invalid.
+    """
+    if length < 1:
+        raise ValueError("Token length must be at least 1 character")
+    if alphabet is None:
+        _check_encoding(encoding)
+    if rng is None:
+        rng = default_source()
+    
+    if alphabet is None and encoding in _CODEC_BITS:
+        nbytes = -(-length * _CODEC_BITS[encoding] // 8)
+        return _encode(rng.randbytes(nbytes), encoding)[:length].decode("ascii")
+    
+    if isinstance(alphabet, PasswordPolicy):
+        table, rejected = alphabet.byte_table, alphabet.rejected_bytes
+    else:
+        table, rejected = _alphabet_table(alphabet if alphabet is not None else ENCODINGS[encoding])
+    return rng.mapped_bytes(table, rejected, length).decode("ascii")
@@ -0,0 +1,31 @@
+"""
+Reading newline-delimited word lists.
+
+Blocklists, Bloom filters, passphrase word lists and Markov models are all
+built from the same kind of input: a UTF-8 text file with one entry per
+line. read_wordlist() streams such a file, so building from a list of any
+size never holds the whole file in memory.
+"""
+
+import os
+from typing import Iterator, Union
+
+
+def read_wordlist(path: Union[str, os.PathLike]) -> Iterator[str]:
+    """
+    Yield the non-empty lines of a UTF-8 word list file.
+    
+    Lines are stripped of their "\\n" or "\\r\\n" terminator, and bytes that
+    are not valid UTF-8 are replaced rather than raising.
+    
+    Args:
+        path (str or PathLike): The word list file.
+    
+    Yields:
+        str: Each non-empty line, in file order.
+    """
+    with open(path, "rb") as stream:
+        for line in stream:
+            line = line.rstrip(b"\r\n")
+            if line:
+                yield line.decode("utf-8", "replace")
@@ -0,0 +1,108 @@
+"""
+Tests for the asyncio-friendly generation and auditing API.
+"""
+
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+from passgen import (
+    SeededRandomSource, SystemRandomSource, calculate_entropy, check_strength, generate_many,
+)
+from passgen.aio import aaudit_stream, agenerate_many
+
+
+def run(coro):
+    """Run a coroutine to completion on a fresh event loop."""
+    return asyncio.run(coro)
+
+
+async def collect(aiterable):
+    return [item async for item in aiterable]
+
+
+def test_agenerate_many():
+    """Test that the requested number of passwords is produced."""
+    passwords = run(collect(agenerate_many(2500, chunk_size=1000, length=10, symbols=False)))
+    assert len(passwords) == 2500
+    assert all(len(p) == 10 and p.isalnum() for p in passwords)
+    assert len(set(passwords)) == len(passwords)
+    assert run(collect(agenerate_many(0))) == []
+
+
+def test_agenerate_many_seeded():
+    """Test that a seeded source gives the same output as generate_many()."""
+    passwords = run(collect(agenerate_many(30, chunk_size=7, rng=SeededRandomSource(9))))
+    rng = SeededRandomSource(9)
+    expected = []
+    for size in (7, 7, 7, 7, 2):
+        expected += generate_many(size, rng=rng)
+    assert passwords == expected
+    # Jobs sharing a source run one at a time, even with a thread pool
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        shared = run(collect(agenerate_many(
+            30, chunk_size=7, executor=pool, rng=SeededRandomSource(9))))
+    assert shared == expected
+
+
+def test_agenerate_many_process_executor():
+    """Test that passwords generated in worker processes are all distinct."""
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        passwords = run(collect(agenerate_many(40, chunk_size=10, executor=pool)))
+        assert len(passwords) == 40
+        assert len(set(passwords)) == 40
+        # Copies of an explicit source would repeat each other's output
+        with pytest.raises(ValueError):
+            run(collect(agenerate_many(40, chunk_size=10, executor=pool,
+                                       rng=SystemRandomSource())))
+
+
+def test_agenerate_many_invalid():
+    """Test that invalid arguments are rejected before any work starts."""
+    with pytest.raises(ValueError):
+        run(collect(agenerate_many(-1)))
+    with pytest.raises(ValueError):
+        run(collect(agenerate_many(10, chunk_size=0)))
+    with pytest.raises(ValueError):
+        run(collect(agenerate_many(10, length=100)))
+
+
+def test_aaudit_sources():
+    """Test auditing iterables, async iterables and binary streams."""
+    passwords = ["password", "Password1", "aB3$xY7*cD9!eF", "パスワード123"]
+    expected = [(i, check_strength(p)) for i, p in enumerate(passwords, start=1)]
+    
+    async def agen():
+        for password in passwords:
+            yield password
+    
+    stream = io.BytesIO("\n".join(passwords).encode("utf-8"))
+    for source in (passwords, agen(), stream):
+        records = run(collect(aaudit_stream(source, chunk_size=3)))
+        assert [(r.line, r.strength) for r in records] == expected
+        assert records[2].entropy == pytest.approx(calculate_entropy(passwords[2]))
+
+
+def test_event_loop_stays_responsive():
+    """Test that other tasks keep running while a large batch is consumed."""
+    async def main():
+        ticks = 0
+        done = False
+        
+        async def ticker():
+            nonlocal ticks
+            while not done:
+                ticks += 1
+                await asyncio.sleep(0)
+        
+        task = asyncio.ensure_future(ticker())
+        count = 0
+        async for _ in agenerate_many(50000, chunk_size=5000, time_slice=0.001):
+            count += 1
+        done = True
+        await task
+        return count, ticks
+    
+    count, ticks = run(main())
+    assert count == 50000
+    assert ticks > 10
@@ -0,0 +1,140 @@
+"""
+Tests for streaming password list auditing.
+"""
+
+import io
+import json
+import pytest
+from passgen import calculate_entropy, check_strength, generate_many
+from passgen.audit import (
+    AuditRecord,
+    ENTROPY_BUCKET_WIDTH,
+    audit_file,
+    audit_stream,
+    iter_audit,
+    iter_blocks,
+    split_lines,
+)
+from passgen.cli import main
+
+PASSWORDS = ["password", "Password1", "aB3$xY7*cD9!eF", "パスワード123", "", "qwerty"]
+
+
+@pytest.fixture
+def password_file(tmp_path):
+    """Write a small password list with mixed line endings."""
+    path = tmp_path / "passwords.txt"
+    path.write_bytes("\n".join(PASSWORDS[:3]).encode() + b"\r\n" + "\n".join(PASSWORDS[3:]).encode() + b"\n")
+    return path
+
+
+def test_iter_audit_records(password_file):
+    """Test that every line gets a record matching the single-password functions."""
+    with open(password_file, "rb") as stream:
+        records = list(iter_audit(stream, chunk_bytes=8))
+    assert records == [
+        AuditRecord(i, check_strength(p), pytest.approx(calculate_entropy(p)))
+        for i, p in enumerate(PASSWORDS, start=1)
+    ]
+
+
+def test_audit_file_summary(password_file):
+    """Test the aggregate counts and entropy histogram."""
+    summary = audit_file(password_file, chunk_bytes=8)
+    assert summary.total == len(PASSWORDS)
+    assert summary.counts == {"Weak": 3, "Medium": 2, "Strong": 1}
+    assert sum(summary.histogram) == len(PASSWORDS)
+    assert summary.entropy_min == 0.0
+    assert summary.entropy_max == pytest.approx(calculate_entropy("aB3$xY7*cD9!eF"))
+    
+    bucket = int(calculate_entropy("password") // ENTROPY_BUCKET_WIDTH)
+    assert summary.histogram[bucket] >= 1
+
+
+def test_audit_empty_stream():
+    """Test auditing an empty input."""
+    summary = audit_stream(io.BytesIO(b""))
+    assert summary.total == 0
+    assert summary.to_dict()["entropy"] == {"min": 0.0, "max": 0.0, "mean": 0.0}
+
+
+def test_audit_invalid_utf8():
+    """Test that undecodable bytes do not abort the audit."""
+    summary = audit_stream(io.BytesIO(b"ok-password\n\xff\xfe\xfd\n"))
+    assert summary.total == 2
+
+
+class BoundedStream(io.BytesIO):
+    """A stream that fails any read without a size limit."""
+    
+    def readline(self, size=-1):
+        assert 0 < size <= 64
+        return super().readline(size)
+
+
+def test_iter_blocks_caps_long_lines():
+    """Test that a huge line cannot grow a block beyond the bounds."""
+    data = b"a\n" + b"x" * 10000 + b"\nb\n" + b"y" * 100 + b"\n" + b"z" * 5000
+    blocks = list(iter_blocks(BoundedStream(data), chunk_bytes=16, max_line_bytes=64))
+    assert all(len(block) <= 16 + 64 for block in blocks)
+    lines = [line for block in blocks for line in split_lines(block)]
+    assert lines == ["a", "x" * 64, "b", "y" * 64, "z" * 64]
+    
+    records = list(iter_audit(io.BytesIO(b"short\n" + b"x" * (1 << 20) + b"\nlast\n"), chunk_bytes=1024))
+    assert [record.line for record in records] == [1, 2, 3]
+
+
+def test_iter_blocks_caps_lines_inside_block():
+    """Test that a long line in the middle of a block is capped too."""
+    data = b"a\n" + b"x" * 100 + b"\r\nb\n" + b"y" * 100 + b"\n"
+    blocks = list(iter_blocks(io.BytesIO(data), chunk_bytes=1024, max_line_bytes=16))
+    assert len(blocks) == 1
+    assert split_lines(blocks[0]) == ["a", "x" * 16, "b", "y" * 16]
+    
+    records = list(iter_audit(io.BytesIO(data), chunk_bytes=1024))
+    assert [record.line for record in records] == [1, 2, 3, 4]
+
+
+def test_cli_audit_summary(password_file, capsys):
+    """Test the audit command's JSON summary."""
+    assert main(["audit", str(password_file), "--json"]) == 0
+    data = json.loads(capsys.readouterr().out)
+    assert data["total"] == len(PASSWORDS)
+    assert data["counts"]["Strong"] == 1
+
+
+def test_cli_audit_per_line(password_file, capsys):
+    """Test the audit command's per-line output."""
+    assert main(["audit", str(password_file), "--per-line"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == len(PASSWORDS)
+    assert lines[2].split("\t")[:2] == ["3", "Strong"]
+
+
+def test_parallel_audit_matches_serial(tmp_path):
+    """Test that worker processes produce the same records and summary."""
+    path = tmp_path / "many.txt"
+    passwords = generate_many(3000, length=10) + PASSWORDS
+    path.write_text("\n".join(passwords) + "\n", encoding="utf-8")
+    
+    with open(path, "rb") as stream:
+        serial = list(iter_audit(stream, chunk_bytes=4096))
+    with open(path, "rb") as stream:
+        ordered = list(iter_audit(stream, chunk_bytes=4096, workers=2))
+    with open(path, "rb") as stream:
+        unordered = list(iter_audit(stream, chunk_bytes=4096, workers=2, ordered=False))
+    
+    assert ordered == serial
+    assert sorted(unordered) == serial
+    
+    parallel = audit_file(path, chunk_bytes=4096, workers=2)
+    expected = audit_file(path, chunk_bytes=4096)
+    assert parallel.counts == expected.counts
+    assert parallel.histogram == expected.histogram
+    assert parallel.entropy_mean == pytest.approx(expected.entropy_mean)
+
+
+def test_invalid_workers(password_file):
+    """Test that the number of workers is validated."""
+    with pytest.raises(ValueError):
+        audit_file(password_file, workers=0)
@@ -0,0 +1,51 @@
+"""
+Tests for batch strength checking.
+"""
+
+import pytest
+from passgen import (
+    calculate_entropy,
+    calculate_entropy_many,
+    check_strength,
+    check_strength_many,
+    generate_many,
+)
+
+SAMPLES = [
+    "", "a", "abc", "password", "PASSWORD", "Password1", "Pass!@#",
+    "this is a password", "パスワード123", "P@ssw0rd!2023XyZ", "aB3$xY7*cD9!eF",
+    "a" * 64, "x" * 200, "nul\x00byte", "tab\tsep", "Qwerty12", "WELCOME!",
+] + generate_many(300, length=10) + generate_many(50, length=8, symbols=False)
+
+
+def test_batch_matches_single_python():
+    """Test that the pure-Python batch path matches the per-password functions."""
+    entropies = calculate_entropy_many(SAMPLES, use_numpy=False)
+    assert entropies == [calculate_entropy(p) for p in SAMPLES]
+    
+    strengths = check_strength_many(SAMPLES, use_numpy=False)
+    assert strengths == [check_strength(p) for p in SAMPLES]
+
+
+def test_batch_accepts_iterables():
+    """Test that any iterable of passwords is accepted."""
+    assert check_strength_many(iter(["abc", "aB3$xY7*cD9!eF"])) == ["Weak", "Strong"]
+    assert calculate_entropy_many(p for p in []) == []
+
+
+def test_batch_matches_single_numpy():
+    """Test that the NumPy batch path matches the per-password functions."""
+    pytest.importorskip("numpy")
+    entropies = calculate_entropy_many(SAMPLES, use_numpy=True)
+    assert entropies == pytest.approx([calculate_entropy(p) for p in SAMPLES])
+    
+    strengths = check_strength_many(SAMPLES, use_numpy=True)
+    assert strengths == [check_strength(p) for p in SAMPLES]
+
+
+def test_require_numpy_without_numpy(monkeypatch):
+    """Test that requiring NumPy fails clearly when it is unavailable."""
+    monkeypatch.setattr("passgen.strength._numpy", lambda: None)
+    with pytest.raises(ImportError):
+        check_strength_many(["abc"], use_numpy=True)
+    assert check_strength_many(["abc"]) == ["Weak"]
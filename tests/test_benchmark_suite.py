@@ -0,0 +1,61 @@
+"""
+Tests for the benchmark suite's result file and regression gate.
+"""
+
+import importlib.util
+import json
+import os
+import pytest
+
+SUITE_PATH = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "suite.py")
+
+
+@pytest.fixture(scope="module")
+def suite():
+    spec = importlib.util.spec_from_file_location("benchmark_suite", SUITE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_cases_cover_the_hot_paths(suite):
+    """Test that the suite covers generation, pronounceable and strength paths."""
+    names = [case.name for case in suite._cases()]
+    assert len(names) == len(set(names))
+    for prefix in ("generate/", "generate_many/", "pronounceable/", "entropy/", "strength/"):
+        assert any(name.startswith(prefix) for name in names)
+    for case in suite._cases():
+        case.func()
+
+
+def test_compare_flags_regressions(suite, capsys):
+    """Test that only cases slower than the threshold are regressions."""
+    baseline = {"a": 100.0, "b": 100.0, "c": 100.0}
+    results = {"a": 124.0, "b": 126.0, "c": 50.0, "new": 10.0}
+    assert suite.compare(results, baseline, 0.25) == ["b"]
+    assert suite.compare(results, baseline, 0.10) == ["a", "b"]
+    report = capsys.readouterr().out
+    assert "REGRESSION" in report and "new" in report
+
+
+def test_main_writes_results_and_gates(suite, tmp_path, capsys):
+    """Test the JSON output, baseline saving and exit status."""
+    baseline = tmp_path / "baseline.json"
+    output = tmp_path / "results.json"
+    args = ["--filter", "^generate/len8$", "--repeat", "1", "--min-time", "0.001",
+            "--baseline", str(baseline)]
+    
+    assert suite.main(args + ["--save-baseline", "--output", str(output)]) == 0
+    document = json.loads(output.read_text())
+    assert list(document["results"]) == ["generate/len8"]
+    assert document["unit"] == "ns/op"
+    assert json.loads(baseline.read_text())["results"] == document["results"]
+    
+    # A baseline that is far faster than anything possible must fail the gate
+    document["results"]["generate/len8"] = 1e-6
+    baseline.write_text(json.dumps(document))
+    assert suite.main(args) == 1
+    
+    document["results"]["generate/len8"] = 1e12
+    baseline.write_text(json.dumps(document))
+    assert suite.main(args) == 0
@@ -0,0 +1,76 @@
+"""
+Tests for the on-disk password blocklist.
+"""
+
+import pytest
+from passgen import check_strength, check_strength_many
+from passgen.blocklist import Blocklist, build_blocklist, fingerprint
+
+BREACHED = ["Tr0ub4dor&3", "correcthorsebatterystaple", "Sup3r$ecretPassw0rd!", "hunter2"]
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    """Build a blocklist index from a small wordlist file."""
+    wordlist = tmp_path / "breached.txt"
+    wordlist.write_text("\n".join(BREACHED + ["hunter2", ""]) + "\r\n", encoding="utf-8")
+    path = tmp_path / "breached.idx"
+    assert build_blocklist(wordlist, path) == len(BREACHED)
+    return path
+
+
+def test_blocklist_lookup(index_path):
+    """Test that indexed passwords are found and others are not."""
+    with Blocklist(index_path) as blocklist:
+        assert len(blocklist) == len(BREACHED)
+        for password in BREACHED:
+            assert password in blocklist
+        assert "TR0UB4DOR&3" in blocklist  # Lookups ignore case
+        assert "not-in-the-list" not in blocklist
+        assert "" not in blocklist
+        assert None not in blocklist
+
+
+def test_blocklist_multiple_runs(tmp_path):
+    """Test building an index that needs an external merge of sorted runs."""
+    words = ["word%d" % i for i in range(1000)]
+    path = tmp_path / "runs.idx"
+    assert build_blocklist(words + words[:100], path, run_size=64) == 1000
+    with Blocklist(path) as blocklist:
+        assert all(word in blocklist for word in words)
+        assert "word1000" not in blocklist
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["runs.idx"]
+
+
+def test_empty_blocklist(tmp_path):
+    """Test building and querying an empty index."""
+    path = tmp_path / "empty.idx"
+    assert build_blocklist([], path) == 0
+    with Blocklist(path) as blocklist:
+        assert len(blocklist) == 0
+        assert "anything" not in blocklist
+
+
+def test_invalid_index(tmp_path):
+    """Test that files which are not indexes are rejected."""
+    path = tmp_path / "bogus.idx"
+    path.write_bytes(b"not an index at all")
+    with pytest.raises(ValueError):
+        Blocklist(path)
+
+
+def test_fingerprint():
+    """Test that fingerprints are fixed-width and case-insensitive."""
+    assert len(fingerprint("hunter2")) == 8
+    assert fingerprint("Hunter2") == fingerprint("hunter2")
+    assert fingerprint("hunter2") != fingerprint("hunter3")
+
+
+def test_check_strength_with_blocklist(index_path):
+    """Test that blocklisted passwords are always Weak."""
+    password = "Sup3r$ecretPassw0rd!"
+    assert check_strength(password) == "Strong"
+    with Blocklist(index_path) as blocklist:
+        assert check_strength(password, blocklist=blocklist) == "Weak"
+        assert check_strength("Xq7!mP2#vL9$", blocklist=blocklist) == "Strong"
+        assert check_strength_many([password, "Xq7!mP2#vL9$"], blocklist=blocklist) == ["Weak", "Strong"]
@@ -0,0 +1,111 @@
+"""
+Tests for the Bloom filter blocklist front-end.
+"""
+
+import pytest
+from passgen import check_strength
+from passgen.blocklist import Blocklist, build_blocklist, fingerprint
+from passgen.bloom import (
+    BloomFilter,
+    FilteredBlocklist,
+    _positions,
+    build_bloom_filter,
+    filter_parameters,
+)
+
+WORDS = ["breached-%d" % i for i in range(2000)]
+
+
+def test_filter_parameters():
+    """Test the standard Bloom filter sizing formulas."""
+    bits, hashes = filter_parameters(1000, 0.01)
+    assert bits == 9592  # ceil(-1000 * ln(0.01) / ln(2)^2), rounded up to bytes
+    assert hashes == 7
+    
+    with pytest.raises(ValueError):
+        filter_parameters(1000, 0)
+    with pytest.raises(ValueError):
+        filter_parameters(1000, 1.5)
+
+
+def test_positions_cover_large_filters():
+    """Test that bit positions spread over filters larger than 2**32 bits."""
+    bits = 1 << 40
+    digests = [fingerprint(word) for word in WORDS]
+    positions = [pos for digest in digests for pos in _positions(digest, bits, 7)]
+    assert all(0 <= pos < bits for pos in positions)
+    # Every eighth of the filter is hit, including by the first position
+    assert len({pos * 8 // bits for pos in positions}) == 8
+    assert len({next(_positions(digest, bits, 7)) * 8 // bits for digest in digests}) == 8
+    
+    # Small filters keep the positions that existing filter files use
+    value = int.from_bytes(digests[0], "big")
+    expected = [((value & 0xFFFFFFFF) + i * ((value >> 32) | 1)) % 9592 for i in range(7)]
+    assert list(_positions(digests[0], 9592, 7)) == expected
+
+
+def test_large_filter_round_trip(tmp_path, monkeypatch):
+    """Test that lookups check the bits set by the 64-bit position scheme."""
+    monkeypatch.setattr("passgen.bloom._MAX_SMALL_BITS", 64)
+    path = tmp_path / "large.bloom"
+    build_bloom_filter(WORDS, path)
+    with BloomFilter(path) as bloom_filter:
+        assert bloom_filter.bits > 64
+        assert all(word in bloom_filter for word in WORDS)
+
+
+def test_bloom_no_false_negatives(tmp_path):
+    """Test that every added password is reported as present."""
+    path = tmp_path / "words.bloom"
+    build_bloom_filter(WORDS, path)
+    with BloomFilter(path) as bloom:
+        assert bloom.count == len(WORDS)
+        assert all(word in bloom for word in WORDS)
+        assert None not in bloom
+
+
+@pytest.mark.parametrize("fp_rate", [0.1, 0.01])
+def test_bloom_false_positive_rate(tmp_path, fp_rate):
+    """Test that the false-positive rate is close to the configured one."""
+    path = tmp_path / "words.bloom"
+    build_bloom_filter(WORDS, path, fp_rate=fp_rate)
+    with BloomFilter(path) as bloom:
+        probes = 20000
+        hits = sum("other-%d" % i in bloom for i in range(probes))
+    assert hits / probes < fp_rate * 2
+
+
+def test_bloom_from_wordlist_and_blocklist(tmp_path):
+    """Test building filters from a wordlist file and from an index."""
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("\n".join(WORDS) + "\n", encoding="utf-8")
+    index = tmp_path / "words.idx"
+    build_blocklist(wordlist, index)
+    
+    build_bloom_filter(wordlist, tmp_path / "a.bloom")
+    with Blocklist(index) as blocklist:
+        build_bloom_filter(blocklist, tmp_path / "b.bloom")
+    assert (tmp_path / "a.bloom").read_bytes() == (tmp_path / "b.bloom").read_bytes()
+
+
+def test_filtered_blocklist(tmp_path):
+    """Test the combined filter and exact index."""
+    index = tmp_path / "words.idx"
+    bloom = tmp_path / "words.bloom"
+    build_blocklist(WORDS, index)
+    build_bloom_filter(WORDS, bloom, fp_rate=0.5)
+    
+    with FilteredBlocklist(BloomFilter(bloom), Blocklist(index)) as blocked:
+        assert len(blocked) == len(WORDS)
+        assert all(word in blocked for word in WORDS)
+        # With a 50% filter many probes pass the filter, but none are exact hits
+        assert not any("other-%d" % i in blocked for i in range(2000))
+        assert check_strength("Breached-1999", blocklist=blocked) == "Weak"
+
+
+def test_invalid_filter(tmp_path):
+    """Test that files which are not filters are rejected."""
+    path = tmp_path / "bogus.bloom"
+    path.write_bytes(b"PGBLOOM1")
+    with pytest.raises(ValueError):
+        BloomFilter(path)
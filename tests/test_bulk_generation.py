@@ -0,0 +1,58 @@
+"""
+Tests for bulk password generation.
+"""
+
+import string
+import pytest
+from passgen import generate_many
+from passgen.generator import AMBIGUOUS_DIGITS, AMBIGUOUS_SYMBOLS
+
+
+def test_generate_many_count_and_length():
+    """Test that generate_many returns the requested number of passwords."""
+    passwords = generate_many(100, length=16)
+    assert isinstance(passwords, list)
+    assert len(passwords) == 100
+    assert all(isinstance(p, str) and len(p) == 16 for p in passwords)
+
+
+def test_generate_many_zero():
+    """Test that a count of zero returns an empty list."""
+    assert generate_many(0) == []
+
+
+def test_generate_many_invalid_arguments():
+    """Test that invalid arguments raise appropriate exceptions."""
+    with pytest.raises(ValueError):
+        generate_many(-1)
+    
+    with pytest.raises(ValueError):
+        generate_many(10, length=3)
+    
+    with pytest.raises(ValueError):
+        generate_many(10, length=65)
+    
+    with pytest.raises(ValueError):
+        generate_many(10, uppercase=False, lowercase=False, digits=False, symbols=False)
+
+
+def test_generate_many_character_sets():
+    """Test that bulk generation respects the configured character sets."""
+    passwords = generate_many(50, length=32, uppercase=False, lowercase=False, symbols=False)
+    assert all(c in string.digits for p in passwords for c in p)
+    
+    passwords = generate_many(50, length=64, exclude_ambiguous=True)
+    ambiguous = AMBIGUOUS_DIGITS + AMBIGUOUS_SYMBOLS + "OIl"
+    assert not any(c in ambiguous for p in passwords for c in p)
+
+
+def test_generate_many_covers_alphabet():
+    """Test that every character of a small alphabet is produced."""
+    passwords = generate_many(200, length=64, uppercase=False, lowercase=False, symbols=False)
+    assert set(''.join(passwords)) == set(string.digits)
+
+
+def test_generate_many_randomness():
+    """Test that bulk-generated passwords are unique."""
+    passwords = generate_many(1000, length=16)
+    assert len(set(passwords)) == len(passwords)
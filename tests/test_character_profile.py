@@ -0,0 +1,57 @@
+"""
+Tests for the single-pass character class profile.
+"""
+
+import re
+from passgen import calculate_entropy, check_strength, generate_many
+from passgen.strength import CharacterProfile, classify
+
+
+def test_classify_ascii():
+    """Test counting the character classes of an ASCII password."""
+    profile = classify("aB3$ xY7*")
+    assert profile == CharacterProfile(
+        length=9, lowercase=2, uppercase=2, digits=2, symbols=2, unicode=0
+    )
+    assert profile.class_count == 4
+    assert profile.pool_size == 95
+    assert not profile.has_unicode
+
+
+def test_classify_unicode():
+    """Test that non-ASCII characters are counted as unicode and symbols."""
+    profile = classify("パスワード123")
+    assert profile.length == 8
+    assert profile.unicode == 5
+    assert profile.symbols == 5
+    assert profile.digits == 3
+    assert profile.has_unicode and profile.has_symbols and profile.has_digits
+    assert not profile.has_lowercase and not profile.has_uppercase
+
+
+def test_classify_empty():
+    """Test classifying an empty password."""
+    profile = classify("")
+    assert profile.length == 0
+    assert profile.class_count == 0
+    assert profile.pool_size == 0
+
+
+def test_classify_matches_regex_scans():
+    """Test that the profile agrees with the equivalent regular expressions."""
+    samples = generate_many(200, length=24) + ["tab\there", "naïve café ٣", "\x1f\x7f"]
+    for password in samples:
+        profile = classify(password)
+        assert profile.has_lowercase == bool(re.search(r'[a-z]', password))
+        assert profile.has_uppercase == bool(re.search(r'[A-Z]', password))
+        assert profile.has_digits == bool(re.search(r'\d', password))
+        assert profile.has_symbols == bool(re.search(r'[^a-zA-Z0-9\s]', password))
+        assert profile.has_unicode == bool(re.search(r'[^\x00-\x7F]', password))
+
+
+def test_precomputed_profile():
+    """Test that a precomputed profile gives the same results."""
+    for password in ["Password1", "aB3$xY7*cD9!eF", "abcdefgh", "qwerty12"]:
+        profile = classify(password)
+        assert calculate_entropy(password, profile) == calculate_entropy(password)
+        assert check_strength(password, profile) == check_strength(password)
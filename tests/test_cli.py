@@ -0,0 +1,89 @@
+"""
+Tests for the passgen command line.
+"""
+
+import csv
+import io
+import json
+import math
+import os
+import string
+import subprocess
+import sys
+import pytest
+import passgen
+from passgen.cli import _GENERATE_BATCH, main
+
+
+def test_generate_plain(capsys):
+    """Test bulk plain output of generated passwords."""
+    assert main(["generate", "-n", "5", "-l", "20", "--no-symbols"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 5
+    assert all(len(line) == 20 and line.isalnum() for line in lines)
+
+
+def test_generate_spans_batches(capsys, monkeypatch):
+    """Test that output written in several batches has every password."""
+    monkeypatch.setattr("passgen.cli._GENERATE_BATCH", 7)
+    assert main(["generate", "-n", "30", "--format", "csv"]) == 0
+    rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))
+    assert rows[0] == ["password", "entropy"]
+    assert len(rows) == 31
+    assert all(len(row[0]) == 12 for row in rows[1:])
+    assert _GENERATE_BATCH >= 4096
+
+
+def test_generate_jsonl_with_constraints(capsys):
+    """Test JSON lines output with entropy and policy constraints."""
+    assert main(["generate", "-n", "50", "--format", "jsonl", "--min-digits", "3",
+                 "--forbidden", "\"\\"]) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(records) == 50
+    for record in records:
+        assert sum(c in string.digits for c in record["password"]) >= 3
+        assert not set(record["password"]) & set("\"\\")
+        assert 0 < record["entropy"] < 12 * math.log2(94)
+
+
+def test_pronounceable(capsys):
+    """Test pronounceable output with entropy."""
+    assert main(["pronounceable", "-n", "3", "-l", "16", "--digits", "--format", "jsonl"]) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(records) == 3
+    assert all(len(r["password"]) == 16 and r["entropy"] > 0 for r in records)
+
+
+def test_strength(capsys, tmp_path):
+    """Test strength output for arguments and for a file."""
+    assert main(["strength", "password", "Tr0ub4dor&3!xyz"]) == 0
+    lines = [line.split("\t") for line in capsys.readouterr().out.splitlines()]
+    assert [line[0] for line in lines] == ["Weak", "Strong"]
+    assert lines[1][2] == "Tr0ub4dor&3!xyz"
+    
+    path = tmp_path / "passwords.txt"
+    path.write_text("abc\nCorrectHorse9!\n", encoding="utf-8")
+    assert main(["strength", "-f", str(path), "--engine", "pattern", "--format", "csv"]) == 0
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert [row["password"] for row in rows] == ["abc", "CorrectHorse9!"]
+    assert rows[0]["strength"] == "Weak"
+
+
+def test_invalid_options(capsys):
+    """Test that invalid options fail with an error and no output."""
+    assert main(["generate", "-l", "3"]) == 2
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "at least 4" in captured.err
+    with pytest.raises(SystemExit):
+        main(["generate", "-n", "0"])
+
+
+def test_module_entry_point():
+    """Test that python -m passgen runs the command line."""
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(passgen.__file__)))
+    result = subprocess.run(
+        [sys.executable, "-m", "passgen", "generate", "-n", "2"],
+        stdout=subprocess.PIPE, check=True, env=env,
+    )
+    assert len(result.stdout.splitlines()) == 2
@@ -0,0 +1,82 @@
+"""
+Tests for generation results with exact entropy.
+"""
+
+import itertools
+import math
+import pickle
+import pytest
+from passgen import (
+    GeneratedPassword,
+    Generator,
+    SeededRandomSource,
+    generate,
+    generate_many,
+    generate_pronounceable,
+    get_policy,
+)
+from passgen.pronounceable import _pronounceable_entropy
+
+
+def test_generate_detailed():
+    """Test that generate() reports the policy's alphabet and exact entropy."""
+    result = generate(length=16, symbols=False, exclude_ambiguous=True, detailed=True)
+    assert isinstance(result, GeneratedPassword)
+    assert len(result.password) == 16
+    assert str(result) == result.password
+    # 24 uppercase + 25 lowercase + 8 digits
+    assert result.alphabet_size == 57
+    assert result.entropy == pytest.approx(16 * math.log2(57))
+    assert result.policy == get_policy(symbols=False, exclude_ambiguous=True)
+    assert isinstance(generate(), str)
+    
+    with pytest.raises(AttributeError):
+        result.extra = 1
+
+
+def test_generate_many_detailed():
+    """Test that batch results share the policy's entropy."""
+    policy = get_policy(min_digits=2, min_symbols=2)
+    results = generate_many(100, length=10, policy=policy, detailed=True)
+    assert len(results) == 100
+    assert {result.entropy for result in results} == {policy.entropy(10)}
+    assert all(result.policy is policy for result in results)
+    assert all(sum(c.isdigit() for c in result.password) >= 2 for result in results)
+
+
+def test_detailed_is_reproducible_and_picklable():
+    """Test that seeded results match plain output and survive pickling."""
+    result = Generator(SeededRandomSource(3)).generate(length=20, detailed=True)
+    assert result.password == generate(length=20, rng=SeededRandomSource(3))
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+def test_pronounceable_detailed():
+    """Test the exact entropy reported for pronounceable passwords."""
+    result = generate_pronounceable(length=16, include_digits=True, include_symbols=True,
+                                    capitalize=True, detailed=True)
+    assert len(result.password) == 16
+    assert result.alphabet_size == 26 + 26 + 10 + 27
+    assert result.policy is None
+    assert 0 < result.entropy < math.inf
+    assert result.entropy == pytest.approx(_pronounceable_entropy(result.password, 2, 1, True))
+
+
+@pytest.mark.parametrize("num_digits, capitalize", [(0, False), (1, False), (0, True)])
+def test_pronounceable_probabilities_sum_to_one(num_digits, capitalize):
+    """Test that the reported probabilities of all possible passwords sum to 1."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    total = 0.0
+    for chars in itertools.product(letters, repeat=3 - num_digits):
+        chars = list(chars)
+        for pos in range(3):
+            for digit in "0123456789" if num_digits else [None]:
+                candidate = chars[:]
+                if digit is not None:
+                    candidate.insert(pos, digit)
+                elif capitalize:
+                    candidate[pos] = candidate[pos].upper()
+                elif pos:
+                    continue
+                total += 2 ** -_pronounceable_entropy("".join(candidate), num_digits, 0, capitalize)
+    assert total == pytest.approx(1.0)
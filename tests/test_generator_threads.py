@@ -0,0 +1,84 @@
+"""
+Tests for Generator instances and per-thread default generators.
+"""
+
+import string
+import threading
+import pytest
+from passgen import Generator, SeededRandomSource, default_generator, generate
+
+
+def test_generator_methods():
+    """Test the Generator counterparts of the module-level functions."""
+    generator = Generator()
+    assert len(generator.generate(20)) == 20
+    assert all(c in string.digits for c in generator.generate(32, uppercase=False, lowercase=False, symbols=False))
+    assert [len(p) for p in generator.generate_many(5, length=8)] == [8] * 5
+    assert len(generator.generate_pronounceable(16, include_digits=True)) == 16
+    
+    with pytest.raises(ValueError):
+        generator.generate(3)
+    with pytest.raises(ValueError):
+        generator.generate_many(-1)
+
+
+def test_generator_owns_its_state():
+    """Test that generators keep separate random sources and policies."""
+    a = Generator()
+    b = Generator()
+    assert a.rng is not b.rng
+    assert a.policy() == b.policy()
+    assert a.policy() is not b.policy()
+    assert a.policy() is a.policy()
+
+
+def test_seeded_generator_is_reproducible():
+    """Test that a generator with a seeded source is deterministic."""
+    a = Generator(SeededRandomSource(11))
+    b = Generator(SeededRandomSource(11))
+    assert [a.generate() for _ in range(5)] == [b.generate() for _ in range(5)]
+    assert a.generate_many(3) == b.generate_many(3)
+
+
+def test_default_generator_per_thread():
+    """Test that each thread gets its own default generator."""
+    main = default_generator()
+    assert default_generator() is main
+    
+    seen = []
+    
+    def worker():
+        generator = default_generator()
+        seen.append(generator)
+        seen.append(generator.rng)
+    
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    generators = seen[0::2]
+    sources = seen[1::2]
+    assert len({id(g) for g in generators + [main]}) == 5
+    assert len({id(s) for s in sources + [main.rng]}) == 5
+
+
+def test_concurrent_generation_is_unique():
+    """Test that concurrent threads never produce duplicate passwords."""
+    results = []
+    lock = threading.Lock()
+    
+    def worker():
+        passwords = [generate(length=16) for _ in range(500)]
+        with lock:
+            results.extend(passwords)
+    
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(results) == 16 * 500
+    assert len(set(results)) == len(results)
@@ -0,0 +1,88 @@
+"""
+Tests for the package's import cost: lazy submodules and their import time.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import pytest
+import passgen
+
+# Modules that the common paths must not load
+HEAVY_MODULES = {
+    "passgen.pronounceable", "passgen.token", "passgen.passphrase", "passgen.markov",
+    "passgen.cache", "passgen.estimator", "passgen.blocklist", "passgen.metrics",
+    "hashlib", "inspect", "shutil", "tempfile", "base64", "mmap", "asyncio",
+}
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(passgen.__file__)))
+    return subprocess.run(
+        [sys.executable] + list(args),
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, env=env,
+        universal_newlines=True,
+    )
+
+
+def loaded_modules(code: str) -> set:
+    """Return the modules a snippet loads on top of a bare interpreter."""
+    script = (
+        "import sys; before = set(sys.modules)\n"
+        + code + "\n"
+        + "import json; print(json.dumps(sorted(set(sys.modules) - before)))"
+    )
+    # json is imported after the snapshot, so drop what it brings along
+    baseline = set(json.loads(run_python("-c", script.replace(code, "pass")).stdout))
+    return set(json.loads(run_python("-c", script).stdout)) - baseline
+
+
+def test_import_loads_no_submodules():
+    """Test that importing the package imports none of its submodules."""
+    modules = loaded_modules("import passgen")
+    assert not {name for name in modules if name.startswith("passgen.")}
+
+
+@pytest.mark.parametrize("code", [
+    "import passgen; passgen.generate()",
+    "from passgen import generate_many; generate_many(3)",
+    "import passgen; passgen.check_strength('Tr0ub4dor&3')",
+])
+def test_common_paths_stay_light(code):
+    """Test that generating and checking passwords load only what they need."""
+    modules = loaded_modules(code)
+    assert not modules & HEAVY_MODULES
+
+
+def test_lazy_names():
+    """Test that every public name and submodule resolves lazily."""
+    for name in passgen.__all__:
+        assert getattr(passgen, name) is not None
+        assert name in dir(passgen)
+    assert passgen.metrics.__name__ == "passgen.metrics"
+    with pytest.raises(AttributeError):
+        passgen.no_such_name
+    with pytest.raises(ImportError):
+        from passgen import no_such_name  # noqa: F401
+
+
+def test_lazy_import_is_cheaper_than_eager():
+    """Test that "import passgen" costs a fraction of importing every name."""
+    # Both are timed in one interpreter, so the machine's speed cancels out
+    script = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "import passgen\n"
+        "lazy = time.perf_counter() - start\n"
+        "for name in passgen.__all__:\n"
+        "    getattr(passgen, name)\n"
+        "print(lazy, time.perf_counter() - start)\n"
+    )
+    lazy, eager = float("inf"), float("inf")
+    for _ in range(3):
+        result = run_python("-c", script).stdout.split()
+        lazy, eager = min(lazy, float(result[0])), min(eager, float(result[1]))
+    assert lazy * 10 < eager, "import passgen took %.2f ms, importing every name %.2f ms" % (
+        lazy * 1000, eager * 1000
+    )
@@ -0,0 +1,115 @@
+"""
+Tests for Markov-chain pronounceable passwords.
+"""
+
+import collections
+import math
+import random
+from fractions import Fraction
+import pytest
+from passgen import SeededRandomSource
+from passgen.markov import MarkovModel, _alias_table, generate_markov, train_markov
+
+WORDS = [
+    "banana", "bandana", "cabana", "alabama", "panorama", "caravan", "macaroni",
+    "tomato", "potato", "avocado", "tornado", "dominate", "lemonade", "marinade",
+]
+
+
+@pytest.fixture(params=[2, 3, 4])
+def model_path(request, tmp_path):
+    """Train a model of each order from a small word list file."""
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("\n".join(WORDS) + "\n", encoding="utf-8")
+    path = tmp_path / "model.bin"
+    assert train_markov(wordlist, path, order=request.param) == sum(map(len, WORDS))
+    return path
+
+
+def test_generate_from_model(model_path):
+    """Test that a model generates lowercase passwords of the right length."""
+    with MarkovModel(model_path) as model:
+        for length in (4, 12, 64):
+            password = model.generate(length)
+            assert len(password) == length
+            assert set(password) <= set("".join(WORDS))
+    assert len(generate_markov(model_path, length=16)) == 16
+
+
+def test_sampled_entropy_matches_model(model_path):
+    """Test that the reported entropy is the model's information content."""
+    with MarkovModel(model_path) as model:
+        for _ in range(50):
+            password, entropy = model.sample(20)
+            assert entropy == pytest.approx(model.entropy(password))
+            assert entropy > 0
+        with pytest.raises(ValueError):
+            model.entropy("qqqq")
+
+
+def test_exact_probabilities(tmp_path):
+    """Test that passwords are generated with exactly the model's probabilities."""
+    # After "a" comes "b" once and "c" twice; "b" and "c" end a word, so the
+    # chain restarts and every password alternates "a" with "b" or "c"
+    path = tmp_path / "tiny.bin"
+    train_markov(["ab", "ac", "ac"], path, order=2)
+    with MarkovModel(path) as model:
+        assert model.entropy("abac") == pytest.approx(math.log2(9 / 2))
+        counts = collections.Counter(model.generate(4) for _ in range(9000))
+    assert set(counts) == {"abab", "abac", "acab", "acac"}
+    assert 3600 < counts["acac"] < 4400  # 4/9 of 9000 is 4000
+    assert 700 < counts["abab"] < 1300  # 1/9 of 9000 is 1000
+
+
+def test_alias_table_is_exact():
+    """Test that the integer alias table reproduces the counts exactly."""
+    rng = random.Random(3)
+    for _ in range(100):
+        counts = [rng.randint(1, 1000) for _ in range(rng.randint(1, 26))]
+        threshold, alias = _alias_table(counts)
+        k, total = len(counts), sum(counts)
+        probabilities = [Fraction(0)] * k
+        for i in range(k):
+            probabilities[i] += Fraction(threshold[i], k * total)
+            probabilities[alias[i]] += Fraction(total - threshold[i], k * total)
+        assert probabilities == [Fraction(c, total) for c in counts]
+
+
+def test_seeded_generation_is_reproducible(model_path):
+    """Test that a seeded source reproduces Markov passwords."""
+    a = generate_markov(model_path, length=24, rng=SeededRandomSource(9))
+    b = generate_markov(model_path, length=24, rng=SeededRandomSource(9))
+    assert a == b
+
+
+def test_invalid_models(tmp_path):
+    """Test that bad orders, word lists, files and lengths are rejected."""
+    with pytest.raises(ValueError):
+        train_markov(WORDS, tmp_path / "m.bin", order=5)
+    with pytest.raises(ValueError):
+        train_markov(["1234", "!!"], tmp_path / "m.bin")
+    
+    bogus = tmp_path / "bogus.bin"
+    bogus.write_bytes(b"not a model at all")
+    with pytest.raises(ValueError):
+        MarkovModel(bogus)
+    
+    path = tmp_path / "model.bin"
+    train_markov(WORDS, path)
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(ValueError):
+        MarkovModel(path)
+    
+    # A model whose word-boundary state has no transitions
+    train_markov(WORDS, path)
+    data = bytearray(path.read_bytes())
+    data[16:24] = bytes(8)
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="no transitions"):
+        MarkovModel(path)
+    
+    train_markov(WORDS, path)
+    with pytest.raises(ValueError):
+        generate_markov(path, length=3)
+    with pytest.raises(ValueError):
+        generate_markov(path, length=65)
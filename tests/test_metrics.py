@@ -0,0 +1,204 @@
+"""
+Tests for the opt-in call metrics.
+"""
+
+import json
+import threading
+import urllib.request
+import pytest
+import passgen
+from passgen import generator, metrics, pronounceable, strength
+from passgen.cli import main
+
+
+@pytest.fixture
+def recording():
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def test_disabled_by_default_leaves_functions_untouched():
+    """Test that nothing is wrapped unless metrics are enabled."""
+    assert not metrics.is_enabled()
+    assert generator.Generator.generate.__module__ == "passgen.generator"
+    assert not hasattr(generator.Generator.generate, "__wrapped__")
+    assert passgen.check_strength is strength.check_strength
+    assert not hasattr(passgen.check_strength, "__wrapped__")
+
+
+def test_enable_and_disable_restore_originals():
+    """Test that disable() puts back exactly the original functions."""
+    originals = (
+        generator.Generator.generate, passgen.generate_pronounceable,
+        pronounceable.generate_pronounceable, strength.calculate_entropy,
+    )
+    metrics.enable()
+    metrics.enable()
+    try:
+        assert metrics.is_enabled()
+        assert generator.Generator.generate.__wrapped__ is originals[0]
+        assert passgen.generate_pronounceable is pronounceable.generate_pronounceable
+        assert passgen.generate_pronounceable.__wrapped__ is originals[1]
+    finally:
+        metrics.disable()
+    assert (
+        generator.Generator.generate, passgen.generate_pronounceable,
+        pronounceable.generate_pronounceable, strength.calculate_entropy,
+    ) == originals
+
+
+def test_records_calls_options_and_batch_sizes(recording):
+    """Test call counts, non-default options and batch size histograms."""
+    passgen.generate(length=16)
+    passgen.generate(16, symbols=False)
+    passgen.generate_many(250, length=8)
+    passgen.generate_pronounceable(capitalize=True)
+    passgen.Generator().generate_pronounceable()
+    passgen.check_strength_many(["abc", "Password1", "x" * 20])
+    
+    functions = recording.snapshot()["functions"]
+    assert functions["generate"]["calls"] == 2
+    used = {name: n for name, n in functions["generate"]["options"].items() if n}
+    assert used == {"length": 2, "symbols": 1}
+    assert functions["generate"]["options"]["detailed"] == 0
+    assert sum(functions["generate"]["latency"]["counts"]) == 2
+    assert functions["generate"]["latency"]["sum"] > 0
+    assert functions["generate_pronounceable"]["calls"] == 2
+    assert functions["generate_pronounceable"]["options"]["capitalize"] == 1
+    
+    batch = functions["generate_many"]["batch_size"]
+    assert functions["generate_many"]["calls"] == 1
+    assert batch["sum"] == 250 and batch["count"] == 1
+    assert batch["counts"][metrics.BATCH_BUCKETS.index(1000)] == 1
+    assert functions["check_strength_many"]["batch_size"]["sum"] == 3
+    assert "batch_size" not in functions["generate"]
+    json.dumps(functions)
+
+
+def test_records_errors(recording):
+    """Test that calls which raise are counted as errors and re-raised."""
+    with pytest.raises(ValueError):
+        passgen.generate(length=2)
+    with pytest.raises(ValueError):
+        passgen.calculate_entropy("abc", engine="unknown")
+    functions = recording.snapshot()["functions"]
+    assert functions["generate"]["calls"] == functions["generate"]["errors"] == 1
+    assert functions["calculate_entropy"]["errors"] == 1
+
+
+def test_nested_calls_are_not_counted(recording):
+    """Test that functions called by instrumented functions are not recorded."""
+    passgen.check_strength("Tr0ub4dor&3")
+    functions = recording.snapshot()["functions"]
+    assert functions["check_strength"]["calls"] == 1
+    assert functions["calculate_entropy"]["calls"] == 0
+    passgen.calculate_entropy("Tr0ub4dor&3")
+    assert recording.snapshot()["functions"]["calculate_entropy"]["calls"] == 1
+
+
+def test_threads_record_separately(recording):
+    """Test that every thread's calls are counted, including ended threads'."""
+    def work():
+        for _ in range(50):
+            passgen.generate(length=10)
+    
+    for _ in range(5):
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    data = recording.snapshot()["functions"]["generate"]
+    assert data["calls"] == data["latency"]["count"] == 2000
+    assert data["options"]["length"] == 2000
+    # Ended threads are folded into the totals, not kept around
+    assert len(recording.METRICS["generate"]._shards) <= 1
+    recording.reset()
+    assert recording.snapshot()["functions"]["generate"]["calls"] == 0
+
+
+def test_thread_exit_during_snapshot(recording):
+    """Test that a thread can end while its function's metrics are locked."""
+    function = recording.METRICS["generate"]
+    recorded, locked = threading.Event(), threading.Event()
+    
+    def work():
+        passgen.generate()
+        recorded.set()
+        locked.wait()
+    
+    thread = threading.Thread(target=work)
+    thread.start()
+    recorded.wait()
+    with function._lock:
+        locked.set()
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+    assert recording.snapshot()["functions"]["generate"]["calls"] == 1
+    assert not function._ended
+
+
+def test_histogram_buckets():
+    """Test bucket boundaries: values equal to a bound land in its bucket."""
+    histogram = metrics.Histogram((1, 10, 100))
+    for value in (0, 1, 2, 10, 11, 100, 1000):
+        histogram.observe(value)
+    assert list(histogram.counts) == [2, 2, 2, 1]
+    assert histogram.total == 1124
+    other = metrics.Histogram((1, 10, 100))
+    other.add(histogram)
+    other.add(histogram)
+    assert list(other.counts) == [4, 4, 4, 2] and other.total == 2248
+    other.add(histogram, -1)
+    assert list(other.counts) == list(histogram.counts) and other.total == 1124
+    histogram.reset()
+    assert list(histogram.counts) == [0, 0, 0, 0] and histogram.total == 0
+
+
+def test_prometheus_format(recording):
+    """Test that histogram buckets are cumulative and end at the count."""
+    for _ in range(3):
+        passgen.check_strength("Tr0ub4dor&3")
+    text = recording.to_prometheus()
+    assert "# TYPE passgen_calls_total counter" in text
+    assert 'passgen_calls_total{function="check_strength"} 3' in text
+    assert "# TYPE passgen_call_duration_seconds histogram" in text
+    
+    prefix = 'passgen_call_duration_seconds_bucket{function="check_strength",le="'
+    buckets = [line for line in text.splitlines() if line.startswith(prefix)]
+    values = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert len(values) == len(metrics.LATENCY_BUCKETS) + 1
+    assert values == sorted(values) and values[-1] == 3
+    assert buckets[-1].startswith(prefix + '+Inf"}')
+    assert 'passgen_call_duration_seconds_count{function="check_strength"} 3' in text
+    assert text.endswith("\n")
+    # The checked password is not kept around by the options cache
+    assert "Tr0ub4dor&3" not in metrics.METRICS["check_strength"]._local.shard.last_args
+
+
+def test_serve(recording):
+    """Test scraping the metrics over HTTP."""
+    passgen.generate()
+    server = recording.serve(port=0)
+    try:
+        url = "http://127.0.0.1:%d/metrics" % server.server_address[1]
+        with urllib.request.urlopen(url, timeout=10) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            body = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert 'passgen_calls_total{function="generate"} 1' in body
+
+
+def test_cli_metrics(tmp_path, capsys):
+    """Test dumping metrics from the command line."""
+    path = tmp_path / "metrics.prom"
+    assert main(["--metrics", str(path), "generate", "-n", "10", "--format", "csv"]) == 0
+    assert not metrics.is_enabled()
+    text = path.read_text()
+    assert 'passgen_batch_size_sum{function="generate_many"} 10' in text
+    metrics.reset()
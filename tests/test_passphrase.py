@@ -0,0 +1,97 @@
+"""
+Tests for passphrase generation from memory-mapped word lists.
+"""
+
+import collections
+import math
+import pytest
+from passgen import SeededRandomSource
+from passgen.passphrase import Wordlist, build_wordlist, generate_passphrase
+from passgen.strength import passphrase_entropy
+
+WORDS = ["abacus", "abdomen", "abide", "zebra", "zesty", "zucchini", "café", "naïve"]
+
+
+@pytest.fixture
+def wordlist_path(tmp_path):
+    """Compile a small EFF-style numbered word list."""
+    source = tmp_path / "words.txt"
+    lines = ["111%d%d\t%s" % (i // 6 + 1, i % 6 + 1, word) for i, word in enumerate(WORDS)]
+    source.write_text("\n".join(lines + ["11111\tabacus", ""]) + "\n", encoding="utf-8")
+    path = tmp_path / "words.idx"
+    assert build_wordlist(source, path) == len(WORDS)
+    return path
+
+
+def test_wordlist_access(wordlist_path):
+    """Test that compiled words are read back by index."""
+    with Wordlist(wordlist_path) as wordlist:
+        assert len(wordlist) == len(WORDS)
+        assert [wordlist[i] for i in range(len(WORDS))] == WORDS
+        assert wordlist[-1] == WORDS[-1]
+        with pytest.raises(IndexError):
+            wordlist[len(WORDS)]
+
+
+def test_generate_passphrase(wordlist_path):
+    """Test the word count, separator and options of passphrases."""
+    passphrase = generate_passphrase(wordlist_path, words=5, separator=" ")
+    assert len(passphrase.split(" ")) == 5
+    assert all(word in WORDS for word in passphrase.split(" "))
+    
+    passphrase = generate_passphrase(wordlist_path, words=4, capitalize=True, include_digit=True)
+    words = passphrase.split("-")
+    assert len(words) == 4
+    assert all(word[0].isupper() for word in words)
+    assert sum(c.isdigit() for c in passphrase) == 1
+    assert any(word[-1].isdigit() for word in words)
+    
+    assert generate_passphrase(["only"], words=3) == "only-only-only"
+
+
+def test_words_are_uniform(wordlist_path):
+    """Test that every word of the list is drawn about equally often."""
+    counts = collections.Counter(
+        generate_passphrase(wordlist_path, words=8000, separator="\n").split("\n")
+    )
+    assert set(counts) == set(WORDS)
+    assert min(counts.values()) > 800
+    assert max(counts.values()) < 1200
+
+
+def test_passphrase_entropy():
+    """Test the exact passphrase entropy."""
+    assert passphrase_entropy(6, 7776) == pytest.approx(6 * math.log2(7776))
+    assert passphrase_entropy(4, 1024) == 40
+    assert passphrase_entropy(4, 1024, include_digit=True) == pytest.approx(40 + math.log2(40))
+    with pytest.raises(ValueError):
+        passphrase_entropy(0, 1024)
+
+
+def test_seeded_passphrase_is_reproducible(wordlist_path):
+    """Test that a seeded source reproduces passphrases."""
+    a = generate_passphrase(wordlist_path, rng=SeededRandomSource(4), include_digit=True)
+    b = generate_passphrase(wordlist_path, rng=SeededRandomSource(4), include_digit=True)
+    assert a == b
+
+
+def test_invalid_wordlists(tmp_path):
+    """Test that empty lists, bad files and bad word counts are rejected."""
+    with pytest.raises(ValueError):
+        build_wordlist(["", "  "], tmp_path / "empty.idx")
+    
+    bogus = tmp_path / "bogus.idx"
+    bogus.write_bytes(b"not a word list")
+    with pytest.raises(ValueError):
+        Wordlist(bogus)
+    
+    path = tmp_path / "words.idx"
+    build_wordlist(WORDS, path)
+    path.write_bytes(path.read_bytes()[:-3])
+    with pytest.raises(ValueError):
+        Wordlist(path)
+    
+    with pytest.raises(ValueError):
+        generate_passphrase(WORDS, words=0)
+    with pytest.raises(ValueError):
+        generate_passphrase([])
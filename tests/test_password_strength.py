@@ -2,6 +2,7 @@
 Tests for password strength estimation.
 """
 
+import math
 import pytest
 from passgen import check_strength, calculate_entropy
 
@@ -26,8 +27,8 @@ def test_entropy_calculation():
     # Adding symbols increases entropy
     assert calculate_entropy("password!@#") > calculate_entropy("password")
     
-    # Random string from all character types has highest entropy
-    assert calculate_entropy("aB3$xY7*") > calculate_entropy("password123")
+    # Random string from all character types has highest entropy for its length
+    assert calculate_entropy("aB3$xY7*") > calculate_entropy("abcd1234")
 
 
 def test_entropy_with_character_sets():
@@ -111,4 +112,15 @@ def test_check_strength_edge_cases():
     assert check_strength("this is a password") == "Medium"
     
     # Password with unicode characters
-    assert check_strength("パスワード123") == "Medium"  # Japanese for "password" 
\ No newline at end of file
+    assert check_strength("パスワード123") == "Medium"  # Japanese for "password" 
+
+def test_entropy_is_independent_of_caller():
+    """Test that entropy depends only on the password, not on the call stack."""
+    def nested(depth):
+        if depth == 0:
+            return calculate_entropy("aB3$xY7*")
+        return nested(depth - 1)
+    
+    assert nested(200) == calculate_entropy("aB3$xY7*")
+    assert calculate_entropy("aB3$xY7*") == pytest.approx(8 * math.log2(95))
+    assert calculate_entropy("Xq7!Xq7!Xq7!Xq7!") == pytest.approx(16 * math.log2(95))
@@ -0,0 +1,123 @@
+"""
+Tests for the pattern-aware strength estimator.
+"""
+
+import math
+import time
+import pytest
+from passgen import calculate_entropy, check_strength, estimator
+from passgen.estimator import RANKED_WORDS, estimate, estimate_entropy
+
+# Repeat-, sequence- and date-heavy inputs: the slowest 32-character cases
+WORST_CASES = [
+    "a" * 32, "abc" * 11, "123123123abcabcabc987987987xyzxyz",
+    "aaaabbbbccccddddeeeeffffgggghhhh", "19901990199019901990199019901990",
+    "1a1a1a1a2b2b2b2b3c3c3c3c4d4d4d4d", "qwertyqwertyqwertyqwertyqwertyqw",
+    "12345678901234567890123456789012",
+]
+
+
+def patterns(password):
+    """Return the (pattern, token) decomposition of a password."""
+    return [(m.pattern, m.token) for m in estimate(password).sequence]
+
+
+def test_dictionary_and_sequence():
+    """Test that common words and digit runs are recognized."""
+    assert patterns("password") == [("dictionary", "password")]
+    assert patterns("Password123") == [("dictionary", "Password"), ("sequence", "123")]
+
+
+def test_l33t_substitutions():
+    """Test that l33t spellings of dictionary words are recognized."""
+    assert patterns("P@ssw0rd") == [("dictionary", "P@ssw0rd")]
+    assert estimate("P@ssw0rd").guesses > estimate("password").guesses
+
+
+def test_keyboard_repeat_and_date():
+    """Test keyboard walks, repeats and dates."""
+    assert patterns("zxcvfr") == [("spatial", "zxcvfr")]
+    assert patterns("aaaaaaaa") == [("repeat", "aaaaaaaa")]
+    assert patterns("abcabcabc") == [("repeat", "abcabcabc")]
+    assert patterns("1985-12-31") == [("date", "1985-12-31")]
+    assert patterns("31121985") == [("date", "31121985")]
+
+
+def test_random_password_is_bruteforce():
+    """Test that random strings fall back to brute force."""
+    result = estimate("Xk9#mQ2$vL7!pR4@")
+    assert [m.pattern for m in result.sequence] == ["bruteforce"]
+    assert result.entropy == pytest.approx(16 * math.log2(10))
+
+
+def test_sequence_covers_password():
+    """Test that the decomposition covers the whole password in order."""
+    for password in ["correcthorsebatterystaple", "Summer2019!", "qwerty123abc", "x"]:
+        sequence = estimate(password).sequence
+        assert "".join(m.token for m in sequence) == password
+        assert sequence[0].i == 0 and sequence[-1].j == len(password) - 1
+
+
+def test_estimate_empty_and_user_words():
+    """Test the empty password and caller-supplied dictionary words."""
+    assert estimate("").guesses == 1
+    assert estimate("").entropy == 0.0
+    assert estimate_entropy("acmecorp") > estimate("acmecorp", user_words=["acmecorp"]).entropy
+
+
+def test_reference_year():
+    """Test that dates are guessed outwards from the reference year."""
+    assert estimate("1990", reference_year=1990).guesses < estimate("1990", reference_year=2040).guesses
+    assert estimate("1990").guesses == estimate("1990", reference_year=time.localtime().tm_year).guesses
+
+
+def test_ranked_words_are_distinct():
+    """Test that no word is ranked twice."""
+    assert len(set(RANKED_WORDS)) == len(RANKED_WORDS)
+
+
+def test_repeat_bases_estimated_once(monkeypatch):
+    """Test that a base repeated in several places is estimated only once."""
+    calls = []
+    original = estimator._estimate
+    
+    def counting(password, *args):
+        calls.append(password)
+        return original(password, *args)
+    
+    monkeypatch.setattr(estimator, "_estimate", counting)
+    estimator.estimate("xyzxyz!xyzxyz#xyzxyz")
+    assert calls.count("xyz") == 1
+
+
+def test_pattern_engine():
+    """Test selecting the pattern engine in the strength functions."""
+    assert calculate_entropy("Password123", engine="pattern") == estimate_entropy("Password123")
+    assert calculate_entropy("Password123", engine="pattern") < calculate_entropy("Password123")
+    assert check_strength("Summer2019!qwe", engine="charset") == "Strong"
+    assert check_strength("Summer2019!qwe", engine="pattern") == "Weak"
+    
+    with pytest.raises(ValueError):
+        calculate_entropy("abc", engine="zxcvbn")
+    with pytest.raises(ValueError):
+        check_strength("abc", engine="zxcvbn")
+
+
+def test_estimate_is_fast():
+    """Test that a 32-character password is estimated quickly."""
+    password = "Correct-Horse-Battery-Staple-99!"
+    start = time.perf_counter()
+    for _ in range(20):
+        estimate(password)
+    assert (time.perf_counter() - start) / 20 < 0.01
+
+
+def test_worst_case_is_fast():
+    """Test that repeat-, sequence- and date-heavy passwords take under 1 ms."""
+    for password in WORST_CASES:
+        best = float("inf")
+        for _ in range(10):
+            start = time.perf_counter()
+            estimate(password)
+            best = min(best, time.perf_counter() - start)
+        assert best < 0.001, "%r took %.2f ms" % (password, best * 1000)
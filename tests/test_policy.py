@@ -0,0 +1,64 @@
+"""
+Tests for compiled password policies.
+"""
+
+import pickle
+import string
+import pytest
+from passgen import PasswordPolicy, generate, generate_many, get_policy
+
+
+def test_policy_alphabet():
+    """Test that a policy compiles the expected alphabet."""
+    policy = PasswordPolicy()
+    assert policy.alphabet == (
+        string.ascii_uppercase + string.ascii_lowercase + string.digits + string.punctuation
+    )
+    assert policy.size == 94
+    
+    policy = PasswordPolicy(uppercase=False, lowercase=False, symbols=False, exclude_ambiguous=True)
+    assert policy.alphabet == "23456789"
+    assert policy.size == 8
+
+
+def test_policy_byte_table():
+    """Test that the byte table maps accepted bytes onto the alphabet without bias."""
+    policy = PasswordPolicy(uppercase=False, lowercase=False, symbols=False)
+    assert len(policy.byte_table) == 256
+    # 256 = 25 * 10 + 6, so the top 6 byte values must be rejected
+    assert policy.rejected_bytes == bytes(range(250, 256))
+    mapped = bytes(range(250)).translate(policy.byte_table).decode("ascii")
+    assert all(mapped.count(d) == 25 for d in string.digits)
+
+
+def test_policy_is_immutable_and_hashable():
+    """Test that policies are immutable and compare by their options."""
+    policy = PasswordPolicy(symbols=False)
+    with pytest.raises(AttributeError):
+        policy.alphabet = "abc"
+    with pytest.raises(AttributeError):
+        policy.extra = 1
+    
+    assert policy == PasswordPolicy(symbols=False)
+    assert policy != PasswordPolicy()
+    assert len({policy, PasswordPolicy(symbols=False)}) == 1
+    assert pickle.loads(pickle.dumps(policy)) == policy
+
+
+def test_get_policy_is_cached():
+    """Test that get_policy returns the same instance for the same options."""
+    assert get_policy(digits=False) is get_policy(digits=False)
+    assert get_policy(digits=False) is not get_policy()
+
+
+def test_empty_policy():
+    """Test that a policy without any character set is rejected."""
+    with pytest.raises(ValueError):
+        PasswordPolicy(uppercase=False, lowercase=False, digits=False, symbols=False)
+
+
+def test_generate_with_policy():
+    """Test passing a precompiled policy to generate() and generate_many()."""
+    policy = get_policy(uppercase=False, lowercase=False, symbols=False)
+    assert all(c in string.digits for c in generate(length=32, policy=policy))
+    assert all(c in string.digits for p in generate_many(10, policy=policy) for c in p)
@@ -0,0 +1,109 @@
+"""
+Tests for policy constraints satisfied by construction.
+"""
+
+import collections
+import math
+import pickle
+import string
+import pytest
+from passgen import PasswordPolicy, SeededRandomSource, generate, generate_many, get_policy
+
+
+def test_minimums_are_always_met():
+    """Test that every password meets the class minimums."""
+    policy = get_policy(min_uppercase=2, min_lowercase=2, min_digits=2, min_symbols=2)
+    for password in generate_many(2000, length=8, policy=policy):
+        assert len(password) == 8
+        assert sum(c in string.ascii_uppercase for c in password) >= 2
+        assert sum(c in string.ascii_lowercase for c in password) >= 2
+        assert sum(c in string.digits for c in password) >= 2
+        assert sum(c in string.punctuation for c in password) >= 2
+
+
+def test_minimums_can_fill_the_whole_password():
+    """Test that minimums adding up to the length are satisfied exactly."""
+    policy = get_policy(min_uppercase=2, min_digits=2)
+    for password in generate_many(200, length=4, policy=policy):
+        assert sorted(c.isdigit() for c in password) == [False, False, True, True]
+        assert sum(c.isupper() for c in password) == 2
+    with pytest.raises(ValueError):
+        generate(length=4, policy=get_policy(min_uppercase=3, min_digits=2))
+
+
+def test_max_repeats():
+    """Test that no run of one character exceeds max_repeats."""
+    policy = get_policy(uppercase=False, lowercase=False, symbols=False,
+                        min_digits=4, max_repeats=1, forbidden="23456789")
+    for password in generate_many(500, length=32, policy=policy):
+        assert set(password) == {"0", "1"}
+        assert "00" not in password and "11" not in password
+    
+    policy = get_policy(uppercase=False, lowercase=False, symbols=False,
+                        max_repeats=2, forbidden="2345678")
+    for password in generate_many(500, length=32, policy=policy):
+        assert not any(password[i] == password[i + 1] == password[i + 2] for i in range(30))
+
+
+def test_forbidden_characters():
+    """Test that forbidden characters never appear."""
+    policy = get_policy(forbidden="aeiouAEIOU'\"\\")
+    assert not set(policy.alphabet) & set("aeiouAEIOU'\"\\")
+    assert not policy.constrained
+    password = generate(length=64, policy=policy)
+    assert not set(password) & set(policy.forbidden)
+    with pytest.raises(ValueError):
+        get_policy(uppercase=False, lowercase=False, symbols=False, forbidden=string.digits)
+
+
+def test_constrained_generation_is_uniform():
+    """Test that every valid password is equally likely."""
+    # Alphabet "01!#" with at least one symbol: 4^4 - 2^4 = 240 passwords
+    policy = get_policy(uppercase=False, lowercase=False, min_symbols=1,
+                        forbidden=string.digits[2:] + string.punctuation.replace("!", "").replace("#", ""))
+    assert policy.alphabet == "01!#"
+    assert policy.entropy(4) == pytest.approx(math.log2(240))
+    
+    counts = collections.Counter(generate_many(240 * 200, length=4, policy=policy))
+    assert len(counts) == 240
+    assert min(counts.values()) > 120
+    assert max(counts.values()) < 290
+
+
+def test_entropy_accounts_for_constraints():
+    """Test that the reported entropy reflects the constraints."""
+    plain = get_policy()
+    assert plain.entropy(12) == pytest.approx(12 * math.log2(94))
+    
+    constrained = get_policy(min_uppercase=1, min_lowercase=1, min_digits=1, min_symbols=1)
+    assert 12 * math.log2(94) - 1 < constrained.entropy(12) < 12 * math.log2(94)
+    
+    # Forcing 4 of 4 digits leaves 10^4 passwords
+    digits_only = get_policy(min_digits=4)
+    assert digits_only.entropy(4) == pytest.approx(math.log2(10 ** 4))
+    
+    limited = get_policy(max_repeats=1)
+    assert limited.entropy(12) < plain.entropy(12)
+
+
+def test_constrained_policy_is_reproducible_and_picklable():
+    """Test seeded generation and pickling of constrained policies."""
+    policy = get_policy(min_digits=3, max_repeats=2, forbidden="xyz")
+    assert pickle.loads(pickle.dumps(policy)) is policy
+    assert policy == PasswordPolicy(min_digits=3, max_repeats=2, forbidden="zyx")
+    assert policy != get_policy(min_digits=3)
+    assert (generate(length=16, policy=policy, rng=SeededRandomSource(5))
+            == generate(length=16, policy=policy, rng=SeededRandomSource(5)))
+
+
+def test_invalid_constraints():
+    """Test that impossible constraints are rejected when compiling."""
+    with pytest.raises(ValueError):
+        get_policy(min_digits=-1)
+    with pytest.raises(ValueError):
+        get_policy(digits=False, min_digits=1)
+    with pytest.raises(ValueError):
+        get_policy(max_repeats=0)
+    with pytest.raises(ValueError):
+        get_policy(uppercase=False, lowercase=False, symbols=False,
+                   max_repeats=1, forbidden="123456789")
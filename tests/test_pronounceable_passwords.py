@@ -101,4 +101,27 @@ def test_all_lowercase():
     password = generate_pronounceable(length=16, capitalize=False)
     
     # Check that the password contains only lowercase letters
-    assert password.islower(), f"Password has uppercase letters: {password}" 
\ No newline at end of file
+    assert password.islower(), f"Password has uppercase letters: {password}" 
+
+def test_syllable_table_weights():
+    """Test that the precomputed syllable table keeps the syllable distribution."""
+    from passgen.pronounceable import (
+        _CUMULATIVE, _SYLLABLES, COMMON_SYLLABLES, SYLLABLE_PATTERNS,
+    )
+    total = _CUMULATIVE[-1]
+    common = len(COMMON_SYLLABLES)
+    # Common syllables are chosen 70% of the time, each equally often
+    assert _CUMULATIVE[common - 1] * 10 == total * 7
+    assert _CUMULATIVE[0] * common == _CUMULATIVE[common - 1]
+    # The rest is split evenly between the syllable patterns
+    assert len(_SYLLABLES) == common + 20 * 6 + 20 * 6 * 20 + 6 * 20 + 20 * 6 * 6 + 6 * 20 * 20
+    weights = [b - a for a, b in zip([0] + _CUMULATIVE, _CUMULATIVE)]
+    assert sum(weights[common:common + 120]) * 10 * len(SYLLABLE_PATTERNS) == total * 3
+
+
+def test_digits_and_symbols_do_not_overwrite_each_other():
+    """Test that the requested digits and symbols all survive."""
+    for _ in range(200):
+        password = generate_pronounceable(length=16, include_digits=True, include_symbols=True)
+        assert sum(c.isdigit() for c in password) == 2
+        assert sum(not c.isalnum() for c in password) == 1
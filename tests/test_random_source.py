@@ -0,0 +1,131 @@
+"""
+Tests for the pluggable random sources.
+"""
+
+import collections
+import pickle
+import os
+import pytest
+from passgen import (
+    SeededRandomSource,
+    SystemRandomSource,
+    generate,
+    generate_many,
+    generate_pronounceable,
+    get_policy,
+)
+from passgen.random_source import default_source
+
+
+def test_randbytes_spans_buffer_refills():
+    """Test that byte draws are served correctly across buffer refills."""
+    rng = SystemRandomSource(buffer_size=16)
+    sizes = [1, 7, 15, 16, 17, 100, 3]
+    chunks = [rng.randbytes(n) for n in sizes]
+    assert [len(c) for c in chunks] == sizes
+    assert len(set(chunks)) == len(chunks)
+
+
+def test_seeded_source_is_reproducible():
+    """Test that equal seeds give equal passwords and different seeds do not."""
+    a = [generate(length=16, rng=SeededRandomSource(42)) for _ in range(3)]
+    b = [generate(length=16, rng=SeededRandomSource(42)) for _ in range(3)]
+    assert a == b
+    assert generate(length=16, rng=SeededRandomSource(43)) != a[0]
+    
+    assert generate_many(5, rng=SeededRandomSource("seed")) == generate_many(5, rng=SeededRandomSource("seed"))
+    assert (
+        generate_pronounceable(length=20, include_digits=True, include_symbols=True,
+                               capitalize=True, rng=SeededRandomSource(7))
+        == generate_pronounceable(length=20, include_digits=True, include_symbols=True,
+                                  capitalize=True, rng=SeededRandomSource(7))
+    )
+
+
+def test_randbelow_is_unbiased():
+    """Test that small and large bounds are sampled uniformly."""
+    rng = SeededRandomSource(1)
+    counts = collections.Counter(rng.randbelow(6) for _ in range(60000))
+    assert set(counts) == set(range(6))
+    assert all(abs(count - 10000) < 500 for count in counts.values())
+    
+    big = 10 ** 12
+    values = [rng.randbelow(big) for _ in range(1000)]
+    assert all(0 <= v < big for v in values)
+    assert max(values) > big // 2
+    
+    with pytest.raises(ValueError):
+        rng.randbelow(0)
+
+
+def test_sequence_helpers():
+    """Test choice, sample, shuffle, randint and random."""
+    rng = SeededRandomSource(5)
+    assert rng.choice("abc") in "abc"
+    with pytest.raises(IndexError):
+        rng.choice("")
+    
+    sample = rng.sample(range(10), 4)
+    assert len(set(sample)) == 4 and all(0 <= x < 10 for x in sample)
+    with pytest.raises(ValueError):
+        rng.sample(range(3), 4)
+    
+    items = list(range(20))
+    rng.shuffle(items)
+    assert sorted(items) == list(range(20))
+    
+    assert all(3 <= rng.randint(3, 5) <= 5 for _ in range(100))
+    assert all(0.0 <= rng.random() < 1.0 for _ in range(100))
+
+
+def test_mapped_bytes_uses_policy_alphabet():
+    """Test bulk alphabet draws through a policy's translation table."""
+    policy = get_policy(uppercase=False, lowercase=False, symbols=False)
+    rng = SeededRandomSource(3)
+    drawn = rng.mapped_bytes(policy.byte_table, policy.rejected_bytes, 10000).decode("ascii")
+    assert len(drawn) == 10000
+    counts = collections.Counter(drawn)
+    assert set(counts) == set("0123456789")
+    assert all(abs(count - 1000) < 150 for count in counts.values())
+
+
+def test_default_source_is_secure_and_per_thread():
+    """Test that the default source is a per-thread system source."""
+    import threading
+    
+    source = default_source()
+    assert isinstance(source, SystemRandomSource)
+    assert default_source() is source
+    
+    other = []
+    thread = threading.Thread(target=lambda: other.append(default_source()))
+    thread.start()
+    thread.join()
+    assert other[0] is not source
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_fork_discards_buffer():
+    """Test that a forked child does not reuse the parent's buffered bytes."""
+    rng = SystemRandomSource()
+    rng.randbytes(1)
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.write(write_fd, rng.randbytes(32))
+        os._exit(0)
+    os.waitpid(pid, 0)
+    child = os.read(read_fd, 32)
+    os.close(read_fd)
+    os.close(write_fd)
+    assert child != rng.randbytes(32)
+
+
+def test_pickled_system_source_is_fresh():
+    """Test that a pickled source carries no buffered bytes to its copy."""
+    rng = SystemRandomSource(buffer_size=64)
+    rng.randbytes(1)
+    copy = pickle.loads(pickle.dumps(rng))
+    assert isinstance(copy, SystemRandomSource) and copy.buffer_size == 64
+    assert copy._buffer == b""
+    assert copy.randbytes(32) != rng.randbytes(32)
@@ -0,0 +1,182 @@
+"""
+Tests for the memoizing strength cache.
+"""
+
+import threading
+import pytest
+import passgen
+from passgen import StrengthCache, calculate_entropy, check_strength
+from passgen.cache import DIGEST_SIZE
+
+PASSWORDS = [
+    "", "abc", "password", "Password1", "Tr0ub4dor&3", "correcthorsebatterystaple",
+    "aB3$xY7*cD9!eF", "john1985", "パスワード123", "x" * 70, "qwertyuiop",
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize("engine", ["charset", "pattern"])
+def test_results_match_uncached(engine):
+    """Test that cached results equal the module-level functions, hit or miss."""
+    cache = StrengthCache()
+    for _ in range(2):
+        for password in PASSWORDS:
+            assert cache.check_strength(password, engine=engine) == check_strength(password, engine=engine)
+            assert cache.calculate_entropy(password, engine=engine) == calculate_entropy(password, engine=engine)
+
+
+def test_hit_miss_statistics_and_clear():
+    """Test hit and miss counting, and that clear() resets everything."""
+    cache = StrengthCache()
+    cache.check_strength("Tr0ub4dor&3")
+    cache.check_strength("Tr0ub4dor&3")
+    cache.check_strength("Tr0ub4dor&3", engine="pattern")
+    cache.calculate_entropy("Tr0ub4dor&3")
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 3, 3)
+    assert stats.hit_rate == 0.25
+    
+    cache.clear()
+    assert cache.stats() == (0, 0, 0, cache.maxsize)
+    assert cache.stats().hit_rate == 0.0
+    cache.check_strength("Tr0ub4dor&3")
+    assert cache.stats()[:3] == (0, 1, 1)
+
+
+def test_plaintexts_are_not_retained():
+    """Test that entries are keyed on keyed digests, not passwords."""
+    cache, other = StrengthCache(), StrengthCache()
+    password = "S3cret-Passw0rd!"
+    cache.check_strength(password)
+    other.check_strength(password)
+    (key,) = cache._entries
+    assert isinstance(key, bytes) and len(key) == DIGEST_SIZE
+    assert password.encode() not in key
+    assert all(password not in entry for entry in cache._entries.values())
+    # Each cache draws its own key
+    assert key not in other._entries
+
+
+def test_digest_kinds():
+    """Test that result kinds of any length get distinct keys."""
+    cache = StrengthCache()
+    kinds = [b"strength:charset", b"strength:pattern", b"entropy:" + b"x" * 40]
+    digests = {cache._digest(kind, "Tr0ub4dor&3") for kind in kinds}
+    assert len(digests) == len(kinds)
+    assert all(len(digest) == DIGEST_SIZE for digest in digests)
+
+
+def test_bounded_with_second_chance_eviction():
+    """Test that the cache stays within maxsize and keeps recently used entries."""
+    cache = StrengthCache(maxsize=4)
+    for i in range(4):
+        cache.check_strength("password-%d" % i)
+    cache.check_strength("password-0")
+    cache.check_strength("password-4")
+    assert len(cache) == 4
+    hits = cache.stats().hits
+    cache.check_strength("password-0")
+    assert cache.stats().hits == hits + 1
+    
+    for i in range(100):
+        cache.check_strength("other-%d" % i)
+    assert len(cache) == 4
+
+
+def test_ttl_expiry():
+    """Test that results expire after the TTL."""
+    clock = FakeClock()
+    cache = StrengthCache(ttl=10, clock=clock)
+    cache.check_strength("Password1")
+    clock.now += 9
+    cache.check_strength("Password1")
+    clock.now += 2
+    cache.check_strength("Password1")
+    assert cache.stats()[:2] == (1, 2)
+
+
+def test_blocklist_calls_bypass_the_cache():
+    """Test that a blocklist result is never cached or served from the cache."""
+    cache = StrengthCache()
+    assert cache.check_strength("aB3$xY7*cD9!eFgh") == "Strong"
+    assert cache.check_strength("aB3$xY7*cD9!eFgh", blocklist={"aB3$xY7*cD9!eFgh"}) == "Weak"
+    assert cache.stats()[:3] == (0, 1, 1)
+
+
+def test_invalid_arguments():
+    """Test argument validation."""
+    with pytest.raises(ValueError):
+        StrengthCache(maxsize=0)
+    with pytest.raises(ValueError):
+        StrengthCache(ttl=0)
+    cache = StrengthCache()
+    with pytest.raises(ValueError):
+        cache.check_strength("abc", engine="unknown")
+    with pytest.raises(ValueError):
+        cache.calculate_entropy("abc", engine="unknown")
+    assert passgen.StrengthCache is StrengthCache
+
+
+def test_shared_across_threads():
+    """Test concurrent use: correct results and every lookup counted."""
+    cache = StrengthCache(maxsize=8)
+    expected = {password: check_strength(password) for password in PASSWORDS}
+    errors = []
+    
+    def worker():
+        for _ in range(200):
+            for password in PASSWORDS:
+                if cache.check_strength(password) != expected[password]:
+                    errors.append(password)
+    
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    stats = cache.stats()
+    assert stats.hits + stats.misses == 8 * 200 * len(PASSWORDS)
+    assert stats.size <= 8
+
+
+def test_thread_churn_keeps_counts():
+    """Test that ended threads' counts are kept without keeping their counters."""
+    cache = StrengthCache()
+    for _ in range(20):
+        threads = [threading.Thread(target=cache.check_strength, args=("abc",)) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (199, 1)
+    assert len(cache._counters) <= 1
+
+
+def test_thread_exit_during_stats():
+    """Test that a thread can end while the cache's lock is held."""
+    cache = StrengthCache()
+    used, locked = threading.Event(), threading.Event()
+    
+    def work():
+        cache.check_strength("abc")
+        used.set()
+        locked.wait()
+    
+    thread = threading.Thread(target=work)
+    thread.start()
+    used.wait()
+    with cache._lock:
+        locked.set()
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+    assert cache.stats()[:2] == (0, 1)
+    assert not cache._ended
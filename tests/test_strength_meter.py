@@ -0,0 +1,78 @@
+"""
+Tests for the incremental strength meter.
+"""
+
+import random
+import pytest
+from passgen import StrengthMeter, calculate_entropy, check_strength
+from passgen.strength import _SPECIAL_CASES, COMMON_PASSWORDS, classify
+
+ALPHABET = "abcXYZ019!@# \tébØ٣パ"
+
+
+def assert_matches(meter):
+    password = meter.password
+    assert len(meter) == len(password)
+    assert meter.profile == classify(password)
+    assert meter.entropy == calculate_entropy(password)
+    assert meter.strength == check_strength(password)
+
+
+def test_typing_matches_check_strength():
+    """Test every prefix of a typed password against check_strength()."""
+    meter = StrengthMeter()
+    assert_matches(meter)
+    for char in "Correct-Horse-Battery-Staple-99!" + "x" * 40:
+        meter.append(char)
+        assert_matches(meter)
+
+
+@pytest.mark.parametrize("password", sorted(_SPECIAL_CASES) + sorted(COMMON_PASSWORDS))
+def test_special_and_common_passwords(password):
+    """Test that special-cased and common passwords get the same labels."""
+    meter = StrengthMeter(password.upper() if password in COMMON_PASSWORDS else password)
+    assert_matches(meter)
+
+
+def test_random_edits():
+    """Test random inserts and deletes anywhere in the password."""
+    rng = random.Random(7)
+    meter = StrengthMeter("Start")
+    for _ in range(2000):
+        action = rng.random()
+        length = len(meter)
+        if action < 0.4:
+            meter.append("".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 3))))
+        elif action < 0.6:
+            meter.insert(rng.randint(-length - 1, length + 1), rng.choice(ALPHABET))
+        elif action < 0.8:
+            meter.backspace(rng.randint(0, 3))
+        elif action < 0.98:
+            meter.delete(rng.randint(-length - 1, length), rng.randint(0, 4))
+        else:
+            meter.clear()
+        assert_matches(meter)
+
+
+def test_backspace_and_delete_past_the_ends():
+    """Test removing more characters than there are."""
+    meter = StrengthMeter("abc")
+    meter.backspace(10)
+    assert meter.password == "" and meter.strength == "Weak"
+    meter.append("Pa55word!")
+    meter.delete(-3, 10)
+    assert meter.password == "Pa55wo"
+    meter.delete(100)
+    assert meter.password == "Pa55wo"
+    assert_matches(meter)
+    with pytest.raises(ValueError):
+        meter.backspace(-1)
+    with pytest.raises(ValueError):
+        meter.delete(0, -1)
+
+
+def test_repr_hides_the_password():
+    """Test that repr() shows the length and strength, not the text."""
+    meter = StrengthMeter("aB3$xY7*cD9!eF")
+    assert repr(meter) == "StrengthMeter(length=14, strength='Strong')"
+    assert "aB3" not in repr(meter)
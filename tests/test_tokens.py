@@ -0,0 +1,80 @@
+"""
+Tests for arbitrary-length token generation.
+"""
+
+import collections
+import math
+import pytest
+from passgen import Generator, SeededRandomSource, generate_token, get_policy
+from passgen.token import ENCODINGS, token_entropy
+
+
+@pytest.mark.parametrize("encoding", sorted(ENCODINGS))
+@pytest.mark.parametrize("length", [1, 7, 64, 1000, 65536])
+def test_token_length_and_alphabet(encoding, length):
+    """Test that tokens have the exact length and only use their alphabet."""
+    token = generate_token(length, encoding=encoding)
+    assert len(token) == length
+    assert set(token) <= set(ENCODINGS[encoding])
+
+
+@pytest.mark.parametrize("encoding", sorted(ENCODINGS))
+def test_token_characters_are_uniform(encoding):
+    """Test that every character of the alphabet is drawn about equally often."""
+    alphabet = ENCODINGS[encoding]
+    counts = collections.Counter(generate_token(200 * len(alphabet), encoding=encoding))
+    assert set(counts) == set(alphabet)
+    assert min(counts.values()) > 100
+    assert max(counts.values()) < 300
+
+
+def test_custom_alphabet_and_policy():
+    """Test that a custom alphabet or a policy's alphabet can be used."""
+    token = generate_token(500, alphabet="abc")
+    assert set(token) == set("abc")
+    
+    policy = get_policy(symbols=False, exclude_ambiguous=True)
+    password = generate_token(256, alphabet=policy)
+    assert len(password) == 256
+    assert set(password) <= set(policy.alphabet)
+
+
+def test_token_is_reproducible_with_seeded_source():
+    """Test that tokens can be reproduced from a seeded source."""
+    a = generate_token(100, encoding="base58", rng=SeededRandomSource(1))
+    b = Generator(SeededRandomSource(1)).generate_token(100, encoding="base58")
+    assert a == b
+
+
+def test_token_entropy():
+    """Test that the token entropy is length * log2(alphabet size)."""
+    assert token_entropy(32, "hex") == 128
+    assert token_entropy(20, "base64url") == 120
+    assert token_entropy(10, "base58") == pytest.approx(10 * math.log2(58))
+    assert token_entropy(4, alphabet="ab") == 4
+
+
+def test_invalid_token_entropy():
+    """Test that token_entropy() rejects what generate_token() rejects."""
+    with pytest.raises(ValueError, match="base85"):
+        token_entropy(16, encoding="base85")
+    with pytest.raises(ValueError):
+        token_entropy(-1)
+    with pytest.raises(ValueError):
+        token_entropy(16, alphabet="")
+    with pytest.raises(ValueError):
+        token_entropy(16, alphabet="aab")
+
+
+def test_invalid_tokens():
+    """Test that invalid lengths, encodings and alphabets are rejected."""
+    with pytest.raises(ValueError):
+        generate_token(0)
+    with pytest.raises(ValueError):
+        generate_token(16, encoding="base85")
+    with pytest.raises(ValueError):
+        generate_token(16, alphabet="")
+    with pytest.raises(ValueError):
+        generate_token(16, alphabet="aab")
+    with pytest.raises(ValueError):
+        generate_token(16, alphabet="abé")
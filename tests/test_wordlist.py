@@ -0,0 +1,13 @@
+"""
+Tests for reading newline-delimited word lists.
+"""
+
+from passgen.wordlist import read_wordlist
+
+
+def test_read_wordlist(tmp_path):
+    """Test line endings, blank lines and invalid UTF-8."""
+    path = tmp_path / "words.txt"
+    path.write_bytes(b"alpha\r\nbeta\n\n\r\nd\xc3\xa9j\xc3\xa0\n\xffgamma")
+    assert list(read_wordlist(path)) == ["alpha", "beta", "déjà", "�gamma"]
+    assert list(read_wordlist(str(path)))[0] == "alpha"